@@ -0,0 +1,3 @@
+"""
+Performance Benchmarks for the Football Data Library.
+"""
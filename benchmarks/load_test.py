@@ -0,0 +1,311 @@
+"""
+Concurrent Load Test of the Repositories against a file backed SQLite or a PostgreSQL Database.
+
+Run a read heavy mix from 8 threads for 30 seconds against a SQLite file:
+
+    python -m benchmarks.load_test --workers 8 --duration 30 \\
+        --mix get_statistics=6 get_schedules=3 get_players=1 save_all=1
+
+Run the same mix from 4 processes against a local PostgreSQL database with a pool of 2 per process:
+
+    python -m benchmarks.load_test --url postgresql+psycopg://localhost/football \\
+        --executor process --workers 4 --pool-size 2
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, func, select, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from football_data.generator import LeagueDataGenerator
+from football_data.models import Base, Player, Schedule, Statistic
+from football_data.repositories import (PlayerRepository, ScheduleRepository,
+                                        StatisticRepository)
+
+OPERATIONS = ['get_statistics', 'get_schedules', 'get_players', 'save_all']
+
+DEFAULT_MIX = {'get_statistics': 6, 'get_schedules': 3, 'get_players': 1, 'save_all': 1}
+
+
+@dataclass
+class LoadConfig:
+    """
+    Settings of a Load Test run.
+    """
+
+    url: str
+    mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    workers: int = 4
+    executor: str = 'thread'
+    duration: float = 10.0
+    batch_size: int = 50
+    pool_size: int = 5
+    seed: int = 0
+
+
+@dataclass
+class DataRange:
+    """
+    Identifiers the readers and writers pick from.
+    """
+
+    schedule_ids: tuple[int, int]
+    team_ids: tuple[int, int]
+    years: tuple[int, int]
+    position_ids: tuple[int, int]
+
+
+@dataclass
+class WorkerResult:
+    """
+    Latencies and errors recorded by one worker.
+    """
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Returns the nearest rank percentile of the values.
+    :param values: Values
+    :param fraction: Percentile as a fraction, 0.95 for p95
+    :return: Percentile or 0 without values
+    """
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def create(config: LoadConfig) -> Engine:
+    """
+    Creates the Engine for a worker process.
+    :param config: Load Configuration
+    :return: Engine
+    """
+
+    if config.url.startswith('sqlite'):
+        return create_engine(config.url, pool_size=config.pool_size, max_overflow=0,
+                             connect_args={'check_same_thread': False})
+    return create_engine(config.url, pool_size=config.pool_size, max_overflow=0)
+
+
+def prepare(engine: Engine, seed: int = 0, **kwargs) -> DataRange:
+    """
+    Creates the tables and loads generated data when the database is empty.
+    :param engine: Engine
+    :param seed: Generator Seed
+    :keyword kwargs: League Data Generator settings used when loading data
+    :return: Data Range
+    """
+
+    Base.metadata.create_all(bind=engine)
+    maker = sessionmaker(bind=engine, expire_on_commit=False)
+    with maker() as session:
+        loaded = session.scalar(select(func.count(Schedule.id)))
+    if not loaded:
+        LeagueDataGenerator(seed=seed, **kwargs).load(maker)
+
+    with maker() as session:
+        schedules = session.execute(select(
+            func.min(Schedule.id), func.max(Schedule.id), func.min(Schedule.team_id),
+            func.max(Schedule.team_id), func.min(Schedule.year_value),
+            func.max(Schedule.year_value))).one()
+        positions = session.execute(select(func.min(Player.position_id),
+                                           func.max(Player.position_id))).one()
+    return DataRange(schedule_ids=(schedules[0], schedules[1]),
+                     team_ids=(schedules[2], schedules[3]), years=(schedules[4], schedules[5]),
+                     position_ids=(positions[0] or 0, positions[1] or 0))
+
+
+def operations(maker: sessionmaker, data: DataRange, rng: random.Random,
+               batch_size: int) -> dict[str, Callable[[], Any]]:
+    """
+    Returns the load test operations.
+    :param maker: Session Maker
+    :param data: Data Range
+    :param rng: Random Number Generator of the worker
+    :param batch_size: Statistics written per save_all
+    :return: Dictionary of operation name to operation
+    """
+
+    stats = StatisticRepository(maker)
+    schedules = ScheduleRepository(maker)
+    players = PlayerRepository(maker)
+
+    def save_all() -> None:
+        schedule_id = rng.randint(*data.schedule_ids)
+        stats.save_all([Statistic(statistic_code_id=rng.randint(1, 24), schedule_id=schedule_id,
+                                  value=float(rng.randint(0, 100)), category_id=1,
+                                  team_id=rng.randint(*data.team_ids))
+                        for _ in range(batch_size)])
+
+    return {
+        'get_statistics': lambda: stats.get_statistics(
+            schedule_id=rng.randint(*data.schedule_ids)),
+        'get_schedules': lambda: schedules.get_schedules(team_id=rng.randint(*data.team_ids),
+                                                         year=rng.randint(*data.years)),
+        'get_players': lambda: players.get_players(
+            position_id=rng.randint(*data.position_ids)),
+        'save_all': save_all
+    }
+
+
+def work(config: LoadConfig, data: DataRange, index: int,
+         engine: Engine | None = None) -> WorkerResult:
+    """
+    Runs randomly chosen operations of the mix until the duration has passed.
+    :param config: Load Configuration
+    :param data: Data Range
+    :param index: Worker Index, used to seed the worker
+    :param engine: Shared Engine of a thread pool, process workers create their own
+    :return: Worker Result
+    """
+
+    own_engine = engine is None
+    engine = engine or create(config)
+    rng = random.Random(config.seed * 1000 + index)  # nosec B311
+    available = operations(sessionmaker(bind=engine, expire_on_commit=False), data, rng,
+                           config.batch_size)
+    names = [name for name in config.mix if config.mix[name] > 0]
+    weights = [config.mix[name] for name in names]
+
+    result = WorkerResult(latencies={name: [] for name in names},
+                          errors={name: 0 for name in names})
+    deadline = time.perf_counter() + config.duration
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            available[name]()
+            result.latencies[name].append(time.perf_counter() - start)
+        except SQLAlchemyError:
+            result.errors[name] += 1
+
+    if own_engine:
+        engine.dispose()
+    return result
+
+
+def run(config: LoadConfig, **kwargs) -> dict[str, Any]:
+    """
+    Runs the load test and summarises the throughput and latency percentiles per operation.
+    :param config: Load Configuration
+    :keyword kwargs: League Data Generator settings used when the database is empty
+    :return: Load Test Results
+    """
+
+    unknown = set(config.mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f'Unknown operations {", ".join(sorted(unknown))}')
+
+    engine = create(config)
+    data = prepare(engine, config.seed, **kwargs)
+
+    executor: Executor
+    shared: Engine | None
+    if config.executor == 'process':
+        engine.dispose()
+        executor, shared = ProcessPoolExecutor(max_workers=config.workers), None
+    else:
+        executor, shared = ThreadPoolExecutor(max_workers=config.workers), engine
+
+    start = time.perf_counter()
+    with executor:
+        results = list(executor.map(work, [config] * config.workers, [data] * config.workers,
+                                    range(config.workers), [shared] * config.workers))
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    summary = {}
+    for name in config.mix:
+        latencies = [value for result in results for value in result.latencies.get(name, [])]
+        summary[name] = {
+            'count': len(latencies),
+            'errors': sum(result.errors.get(name, 0) for result in results),
+            'throughput': len(latencies) / elapsed,
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99)
+        }
+    return {
+        'config': {'executor': config.executor, 'workers': config.workers,
+                   'pool_size': config.pool_size, 'duration': config.duration,
+                   'batch_size': config.batch_size, 'mix': config.mix},
+        'elapsed': elapsed,
+        'operations': summary
+    }
+
+
+def parse_mix(items: list[str]) -> dict[str, int]:
+    """
+    Parses operation=weight items.
+    :param items: Mix Items
+    :return: Dictionary of operation name to weight
+    """
+
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition('=')
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Runs the load test from the command line.
+    :param arguments: Command Line Arguments
+    :return: Exit Code
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--url', help='Database URL, defaults to a temporary SQLite file')
+    parser.add_argument('--mix', nargs='+', default=[f'{name}={weight}' for name, weight
+                                                     in DEFAULT_MIX.items()])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--pool-size', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--seasons', type=int, default=1,
+                        help='Seasons of generated data loaded into an empty database')
+    parser.add_argument('--json', type=Path, help='Write the results as JSON')
+    args = parser.parse_args(arguments)
+
+    with tempfile.TemporaryDirectory() as temp:
+        config = LoadConfig(url=args.url or f'sqlite:///{Path(temp) / "load-test.db"}',
+                            mix=parse_mix(args.mix), workers=args.workers,
+                            executor=args.executor, duration=args.duration,
+                            batch_size=args.batch_size, pool_size=args.pool_size, seed=args.seed)
+        result = run(config, seasons=args.seasons)
+
+    print(f'{config.workers} {config.executor} workers, pool size {config.pool_size}, '
+          f'{result["elapsed"]:.1f} s')
+    print(f'  {"operation":<16} {"ops/s":>10} {"errors":>8} {"p50 ms":>10} {"p95 ms":>10} '
+          f'{"p99 ms":>10}')
+    for name, figures in result['operations'].items():
+        print(f'  {name:<16} {figures["throughput"]:10.1f} {figures["errors"]:8d} '
+              f'{figures["p50"] * 1000:10.2f} {figures["p95"] * 1000:10.2f} '
+              f'{figures["p99"] * 1000:10.2f}')
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
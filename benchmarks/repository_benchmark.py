@@ -0,0 +1,267 @@
+"""
+Benchmark Suite for the Repository hot paths against a file backed SQLite Database.
+
+Run the suite and store a baseline:
+
+    python -m benchmarks.repository_benchmark --sizes game week season --save baseline.json
+
+Compare a new run with the stored baseline, failing on regressions over 25%:
+
+    python -m benchmarks.repository_benchmark --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+import sqlalchemy
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from football_data.generator import LeagueDataGenerator
+from football_data.models import (Base, League, Player, Position, Schedule, Statistic,
+                                  StatisticCategory, StatisticCode, Team, TeamLeague, TeamStaff,
+                                  TypeCode)
+from football_data.repositories import (LeagueRepository, PlayerRepository,
+                                        PositionCodeRepository, ScheduleRepository,
+                                        StatisticCategoryRepository, StatisticCodeRepository,
+                                        StatisticRepository, TeamLeagueRepository,
+                                        TeamRepository, TeamStaffRepository, TypeCodeRepository)
+
+GAMES_PER_WEEK = 16
+WEEKS_PER_SEASON = 17
+FIRST_YEAR = 2000
+PLAYER_URL = 'https://football.example/players/1'
+TEAM_URL = 'https://football.example/teams/1'
+
+
+@dataclass
+class DataSize:
+    """
+    Amount of schedule data loaded for a benchmark run.
+    """
+
+    seasons: int
+    weeks: int
+    games: int
+
+    @property
+    def game_count(self) -> int:
+        """
+        Total number of games.
+        :return: Game Count
+        """
+        return self.seasons * self.weeks * self.games
+
+
+SIZES = {
+    'game': DataSize(seasons=1, weeks=1, games=1),
+    'week': DataSize(seasons=1, weeks=1, games=GAMES_PER_WEEK),
+    'season': DataSize(seasons=1, weeks=WEEKS_PER_SEASON, games=GAMES_PER_WEEK),
+    '10-seasons': DataSize(seasons=10, weeks=WEEKS_PER_SEASON, games=GAMES_PER_WEEK)
+}
+
+
+def populate(maker: sessionmaker, size: DataSize) -> None:
+    """
+    Loads reference data, rosters, schedules and statistics for the size.
+    :param maker: Session Maker
+    :param size: Data Size
+    :return: None
+    """
+
+    LeagueDataGenerator(seed=0, seasons=size.seasons, first_year=FIRST_YEAR, weeks=size.weeks,
+                        games_per_week=size.games).load(maker)
+
+
+def measure(operation: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """
+    Times an operation.
+    :param operation: Operation to time
+    :param repeat: Number of timed runs
+    :return: Dictionary of timing figures in seconds
+    """
+
+    operation()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return {'median': statistics.median(timings), 'min': min(timings), 'max': max(timings),
+            'repeat': repeat}
+
+
+def operations(maker: sessionmaker) -> dict[str, Callable[[], Any]]:
+    """
+    Returns the benchmarked repository operations.
+    :param maker: Session Maker
+    :return: Dictionary of operation name to operation
+    """
+
+    players = PlayerRepository(maker)
+    positions = PositionCodeRepository(maker)
+    schedules = ScheduleRepository(maker)
+    categories = StatisticCategoryRepository(maker)
+    stats = StatisticRepository(maker)
+    teams = TeamRepository(maker)
+    type_codes = TypeCodeRepository(maker)
+    staff = TeamStaffRepository(maker)
+    leagues = LeagueRepository(maker)
+    team_leagues = TeamLeagueRepository(maker)
+    codes = StatisticCodeRepository(maker)
+
+    schedule = Schedule(team_id=1, opponent_id=2, year_value=FIRST_YEAR, week_number=1,
+                        game_id=0, url='', type_id=1, is_home=True)
+    stat = Statistic(statistic_code_id=1, schedule_id=1, value=1.0, category_id=1, team_id=1)
+
+    return {
+        'save': lambda: stats.save(Statistic(statistic_code_id=1, schedule_id=0, value=1.0,
+                                             category_id=1, team_id=1)),
+        'save_all': lambda: stats.save_all([
+            Statistic(statistic_code_id=code, schedule_id=0, value=1.0, category_id=1,
+                      team_id=1) for code in range(100)]),
+        'player_exits': lambda: players.player_exits(Player(url=PLAYER_URL, name='')),
+        'position_code_exists': lambda: positions.position_code_exists(
+            Position(code='QB', description='')),
+        'schedule_exists': lambda: schedules.schedule_exists(schedule),
+        'statistic_category_exists': lambda: categories.statistic_category_exists(
+            StatisticCategory(code='PASS', description='')),
+        'statistic_exists': lambda: stats.statistic_exists(stat),
+        'team_exists': lambda: teams.team_exists(Team(url=TEAM_URL, code='T01', name='')),
+        'type_code_exists': lambda: type_codes.type_code_exists(
+            TypeCode(code='REG', description='')),
+        'team_staff_exists': lambda: staff.team_staff_exists(
+            TeamStaff(player_id=1, team_id=1, year_value=FIRST_YEAR)),
+        'league_exits': lambda: leagues.league_exits(League(code='AFC', description='')),
+        'team_league_exists': lambda: team_leagues.team_league_exists(
+            TeamLeague(team_id=1, league_id=1, year_value=FIRST_YEAR)),
+        'statistic_code_exists': lambda: codes.statistic_code_exists(
+            StatisticCode(code='PASSYDS', description='')),
+        'get_player': lambda: players.get_player(id=1),
+        'get_players': players.get_players,
+        'get_position_code': lambda: positions.get_position_code(code='QB'),
+        'get_position_codes': positions.get_position_codes,
+        'get_schedule': lambda: schedules.get_schedule(id=1),
+        'get_schedules': lambda: schedules.get_schedules(team_id=1, year=FIRST_YEAR),
+        'get_statistic_category': lambda: categories.get_statistic_category(code='PASS'),
+        'get_statistic_categories': categories.get_statistic_categories,
+        'get_statistic': lambda: stats.get_statistic(1),
+        'get_statistics': lambda: stats.get_statistics(schedule_id=1),
+        'get_statistics_by_team': lambda: stats.get_statistics(team_id=1),
+        'get_team': lambda: teams.get_team(code='T01'),
+        'get_teams': teams.get_teams,
+        'get_type_code': lambda: type_codes.get_type_code(code='REG'),
+        'get_type_codes': type_codes.get_type_codes,
+        'get_team_staff_entry': lambda: staff.get_team_staff_entry(1),
+        'get_team_staff_entries': lambda: staff.get_team_staff_entries(team_id=1),
+        'get_league': lambda: leagues.get_league(code='AFC'),
+        'get_leagues': leagues.get_leagues,
+        'get_team_league': lambda: team_leagues.get_team_league(1),
+        'get_team_leagues': lambda: team_leagues.get_team_leagues(team_id=1),
+        'get_statistic_code': lambda: codes.get_statistic_code(code='PASSYDS'),
+        'get_statistic_codes': codes.get_statistic_codes
+    }
+
+
+def run(sizes: list[str], repeat: int, directory: Path) -> dict[str, Any]:
+    """
+    Runs the benchmark suite for each data size.
+    :param sizes: Data Size names
+    :param repeat: Number of timed runs per operation
+    :param directory: Directory for the SQLite Database files
+    :return: Benchmark Results
+    """
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name in sizes:
+        engine = create_engine(f'sqlite:///{directory / f"benchmark-{name}.db"}')
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        maker = sessionmaker(bind=engine, expire_on_commit=False)
+        populate(maker, SIZES[name])
+        results[name] = {operation: measure(function, repeat)
+                         for operation, function in operations(maker).items()}
+        engine.dispose()
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any],
+            threshold: float) -> list[str]:
+    """
+    Compares the median timings of a run with a baseline.
+    :param baseline: Baseline Results
+    :param current: Current Results
+    :param threshold: Allowed relative slowdown, 0.25 allows 25%
+    :return: List of regression descriptions
+    """
+
+    regressions = []
+    for size, operations_result in current['results'].items():
+        for operation, timing in operations_result.items():
+            reference = baseline['results'].get(size, {}).get(operation)
+            if not reference or not reference['median']:
+                continue
+            change = timing['median'] / reference['median'] - 1
+            if change > threshold:
+                regressions.append(f'{size} {operation}: {reference["median"] * 1000:.3f} ms -> '
+                                   f'{timing["median"] * 1000:.3f} ms (+{change:.0%})')
+    return regressions
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Runs the benchmark suite from the command line.
+    :param arguments: Command Line Arguments
+    :return: Exit Code
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['game', 'week'])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--directory', type=Path, help='Directory for the database files')
+    parser.add_argument('--save', type=Path, help='Write the results as a JSON baseline')
+    parser.add_argument('--compare', type=Path, help='Compare the results with a baseline')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args(arguments)
+
+    with tempfile.TemporaryDirectory() as temp:
+        result = run(args.sizes, args.repeat, args.directory or Path(temp))
+
+    for size, timings in result['results'].items():
+        print(f'{size} ({SIZES[size].game_count} games)')
+        for operation, timing in timings.items():
+            print(f'  {operation:<28} {timing["median"] * 1000:10.3f} ms')
+
+    if args.save:
+        args.save.write_text(json.dumps(result, indent=2), encoding='utf-8')
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        regressions = compare(baseline, result, args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Microbenchmark of building repository statements per call against the prebuilt statements.
+
+    python -m benchmarks.statement_benchmark --iterations 20000
+"""
+
+import argparse
+import sys
+import time
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from football_data.models import Base, Player, Schedule, TeamStaff
+from football_data.repositories import exists_by, select_by
+
+Lookup = Callable[[Session], Any]
+
+
+def lookups() -> dict[str, tuple[Lookup, Lookup]]:
+    """
+    Returns the benchmarked lookups as a statement built per call and a prebuilt statement.
+    :return: Dictionary of lookup name to built and prebuilt lookup
+    """
+
+    schedule = {'team_id': 1, 'opponent_id': 2, 'year_value': 2020, 'week_number': 1,
+                'type_id': 1}
+    staff = {'team_id': 1, 'player_id': 1, 'year_value': 2020}
+
+    return {
+        'get_player': (
+            lambda session: session.scalars(select(Player).where(Player.id == 1)).first(),
+            lambda session: session.scalars(select_by(Player, 'id'), {'id': 1}).first()),
+        'schedule_exists': (
+            lambda session: session.scalars(select(Schedule).where(
+                *[getattr(Schedule, name) == value for name, value in schedule.items()])).first(),
+            lambda session: session.scalar(exists_by(Schedule, *schedule), schedule)),
+        'team_staff_exists': (
+            lambda session: session.scalars(select(TeamStaff).where(
+                *[getattr(TeamStaff, name) == value for name, value in staff.items()])).first(),
+            lambda session: session.scalar(exists_by(TeamStaff, *staff), staff))
+    }
+
+
+def time_lookup(maker: sessionmaker, lookup: Lookup, iterations: int) -> float:
+    """
+    Times a lookup.
+    :param maker: Session Maker
+    :param lookup: Lookup to time
+    :param iterations: Number of calls
+    :return: Seconds per call
+    """
+
+    with maker() as session:
+        lookup(session)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            lookup(session)
+        return (time.perf_counter() - start) / iterations
+
+
+def run(iterations: int) -> dict[str, dict[str, float]]:
+    """
+    Runs the lookups against an in memory SQLite Database.
+    :param iterations: Number of calls per lookup
+    :return: Dictionary of lookup name to seconds per call for the built and prebuilt statement
+    """
+
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    maker = sessionmaker(bind=engine, expire_on_commit=False)
+    with maker() as session:
+        session.add(Player(id=1, url='https://football.example/players/1', name='Player'))
+        session.commit()
+
+    results = {}
+    for name, (built, prebuilt) in lookups().items():
+        results[name] = {'built': time_lookup(maker, built, iterations),
+                         'prebuilt': time_lookup(maker, prebuilt, iterations)}
+    engine.dispose()
+    return results
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Runs the microbenchmark from the command line.
+    :param arguments: Command Line Arguments
+    :return: Exit Code
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args(arguments)
+
+    for name, timing in run(args.iterations).items():
+        print(f'{name:<20} built {timing["built"] * 1e6:8.1f} us   '
+              f'prebuilt {timing["prebuilt"] * 1e6:8.1f} us   '
+              f'{timing["built"] / timing["prebuilt"]:.2f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+In Memory Season Analytics on NumPy Arrays.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from football_data.models import Schedule, Statistic
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Integer coded dimensions, grouped and filtered by the id values of the column.
+DIMENSIONS = {
+    'player': 'player_id',
+    'team': 'team_id',
+    'code': 'statistic_code_id',
+    'category': 'category_id',
+    'week': 'week_number'
+}
+
+AGGREGATES = ('sum', 'count', 'mean', 'min', 'max')
+
+# Seconds before the last loaded change that refresh reads again, for rows committed late.
+REFRESH_OVERLAP = 60.0
+
+
+class _Coding:
+    """
+    Dense integer codes for the id values of a dimension, stable across refreshes.
+    """
+
+    def __init__(self):
+        self.ids: list[int] = []
+        self.codes: dict[int, int] = {}
+
+    def encode(self, values: Any) -> Any:
+        """
+        Returns the codes of id values, assigning codes to new values. Negative values are
+        missing and coded -1.
+        :param values: Array of id values
+        :return: Array of Codes
+        """
+        uniques, inverse = np.unique(values, return_inverse=True)
+        mapped = np.empty(len(uniques), dtype=np.int32)
+        for index, value in enumerate(uniques.tolist()):
+            if value < 0:
+                mapped[index] = -1
+                continue
+            if value not in self.codes:
+                self.codes[value] = len(self.ids)
+                self.ids.append(value)
+            mapped[index] = self.codes[value]
+        return mapped[inverse]
+
+    def lookup(self, values: Iterable[int]) -> Any:
+        """
+        Returns the codes of the known id values.
+        :param values: Id values
+        :return: Array of Codes
+        """
+        return np.array([self.codes[value] for value in values if value in self.codes],
+                        dtype=np.int32)
+
+
+class SeasonAnalytics:
+    """
+    Loads the statistics of a season once into contiguous NumPy arrays and answers filters,
+    group-bys and per-player time series in memory with vectorized operations. Players, teams,
+    statistic codes, categories and weeks are integer coded. The team of a statistic is the team
+    of its schedule entry. refresh() loads the statistics inserted or updated since the last load
+    by their updated at time, such as a new week or corrected values.
+    """
+
+    year: int
+    values: Any
+    ids: Any
+    watermark: datetime | None
+
+    def __init__(self, maker: sessionmaker, year: int):
+        """
+        Creates a new instance of the Season Analytics and loads the season.
+        :param maker: SQL Alchemy Session Maker
+        :param year: Season Year
+        """
+
+        if np is None:
+            raise ImportError('SeasonAnalytics requires numpy, install '
+                              'batch-football-data[analytics]')
+        self.maker = maker
+        self.year = int(year)
+        self.values = np.empty(0, dtype=np.float64)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.watermark = None
+        self._codings = {name: _Coding() for name in DIMENSIONS}
+        self._codes = {name: np.empty(0, dtype=np.int32) for name in DIMENSIONS}
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def refresh(self, weeks: Iterable[int] | None = None) -> int:
+        """
+        Loads the statistics of the season inserted or updated since the last load, replacing the
+        loaded copies of updated statistics. The rows are read from the highest updated at time
+        loaded, less REFRESH_OVERLAP seconds so rows committed after later stamped rows are still
+        read. Deleted statistics are only dropped when their weeks are reloaded.
+        :param weeks: Week Numbers to reload completely instead, dropping deleted statistics
+        :return: Number of added, changed and dropped statistics
+        """
+
+        # The season of the schedule, statistics stored without a year are still loaded.
+        criteria = [Schedule.year_value == self.year]
+        stale = np.zeros(len(self.ids), dtype=bool)
+        if weeks is not None:
+            weeks = sorted({int(week) for week in weeks})
+            criteria.append(Schedule.week_number.in_(weeks))
+            stale = np.isin(self._codes['week'], self._codings['week'].lookup(weeks))
+        elif self.watermark is not None:
+            criteria.append(Statistic.updated_at >= self.watermark - timedelta(
+                seconds=REFRESH_OVERLAP))
+
+        ids, values, codes = self._load(criteria)
+        replaced = np.isin(self.ids, ids)
+        changes = self._changed(ids, values, codes) + int((stale & ~replaced).sum())
+
+        keep = ~(stale | replaced)
+        merged = np.concatenate([self.ids[keep], ids])
+        order = np.argsort(merged, kind='stable')
+        self.ids = merged[order]
+        self.values = np.concatenate([self.values[keep], values])[order]
+        for name in DIMENSIONS:
+            self._codes[name] = np.concatenate([self._codes[name][keep], codes[name]])[order]
+        return changes
+
+    def mask(self, **kwargs) -> Any:
+        """
+        Returns the boolean mask of the statistics matching the filters. Each filter accepts an
+        id value or a list of id values.
+        :keyword player_id: Player ID Values
+        :keyword team_id: Team ID Values
+        :keyword statistic_code_id: Statistic Code ID Values
+        :keyword category_id: Category ID Values
+        :keyword week_number: Week Numbers
+        :keyword min_week: First Week Number
+        :keyword max_week: Last Week Number
+        :return: Boolean Array
+        """
+
+        mask = np.ones(len(self.values), dtype=bool)
+        for name, column in DIMENSIONS.items():
+            if column in kwargs:
+                wanted = kwargs[column]
+                wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+                mask &= np.isin(self._codes[name], self._codings[name].lookup(wanted))
+        if 'min_week' in kwargs or 'max_week' in kwargs:
+            weeks = np.array(self._codings['week'].ids, dtype=np.int64)[self._codes['week']]
+            if 'min_week' in kwargs:
+                mask &= weeks >= int(kwargs['min_week'])
+            if 'max_week' in kwargs:
+                mask &= weeks <= int(kwargs['max_week'])
+        return mask
+
+    def select(self, **kwargs) -> dict[str, Any]:
+        """
+        Returns the matching statistics as arrays of id values by column.
+        :keyword: Filters, see mask
+        :return: Dictionary of column name to Array
+        """
+
+        mask = self.mask(**kwargs)
+        result = {'id': self.ids[mask], 'value': self.values[mask]}
+        for name, column in DIMENSIONS.items():
+            # The code -1 of missing values indexes the trailing -1.
+            ids = np.array(self._codings[name].ids + [-1], dtype=np.int64)
+            result[column] = ids[self._codes[name][mask]]
+        return result
+
+    def total(self, **kwargs) -> float:
+        """
+        Returns the sum of the values of the matching statistics.
+        :keyword: Filters, see mask
+        :return: Sum
+        """
+        return float(self.values[self.mask(**kwargs)].sum())
+
+    def group_by(self, by: str, aggregate: str = 'sum', **kwargs) -> dict[int, float]:
+        """
+        Aggregates the values of the matching statistics by a dimension.
+        :param by: Dimension, one of player, team, code, category or week
+        :param aggregate: One of sum, count, mean, min or max
+        :keyword: Filters, see mask
+        :return: Dictionary of id value to aggregate, for the groups with statistics
+        """
+
+        if by not in DIMENSIONS:
+            raise ValueError(f'Unknown dimension {by}')
+        if aggregate not in AGGREGATES:
+            raise ValueError(f'Unknown aggregate {aggregate}')
+
+        mask = self.mask(**kwargs) & (self._codes[by] >= 0)
+        codes = self._codes[by][mask]
+        values = self.values[mask]
+        size = len(self._codings[by].ids)
+        counts = np.bincount(codes, minlength=size)
+        if aggregate in ('sum', 'mean'):
+            result = np.bincount(codes, weights=values, minlength=size)
+            if aggregate == 'mean':
+                result = np.divide(result, counts, out=np.zeros(size), where=counts > 0)
+        elif aggregate == 'count':
+            result = counts.astype(np.float64)
+        else:
+            result = np.full(size, np.inf if aggregate == 'min' else -np.inf)
+            (np.minimum if aggregate == 'min' else np.maximum).at(result, codes, values)
+
+        present = np.flatnonzero(counts)
+        ids = self._codings[by].ids
+        return {ids[code]: float(result[code]) for code in present.tolist()}
+
+    def time_series(self, player_id: int, **kwargs) -> tuple[Any, Any]:
+        """
+        Returns the weekly sums of the values of a player.
+        :param player_id: Player ID Value
+        :keyword: Filters, see mask
+        :return: Array of Week Numbers and Array of Values
+        """
+
+        weekly = self.group_by('week', player_id=player_id, **kwargs)
+        weeks = np.array(sorted(weekly), dtype=np.int64)
+        return weeks, np.array([weekly[week] for week in weeks.tolist()], dtype=np.float64)
+
+    def _load(self, criteria: list[Any]) -> tuple[Any, Any, dict[str, Any]]:
+        statement = select(
+            Statistic.id, Statistic.value, Statistic.player_id, Schedule.team_id,
+            Statistic.statistic_code_id, Statistic.category_id, Schedule.week_number,
+            Statistic.updated_at
+        ).join(Schedule, Schedule.id == Statistic.schedule_id).where(*criteria).order_by(
+            Statistic.id)
+
+        with self.maker() as session:
+            rows = session.execute(statement).all()
+        count = len(rows)
+        columns = list(zip(*rows)) or [()] * 8
+        if rows:
+            self.watermark = max(self.watermark or datetime.min, *columns[7])
+        codes = {}
+        for name, column in zip(DIMENSIONS, columns[2:7]):
+            raw = np.fromiter((-1 if value is None else value for value in column), np.int64,
+                              count)
+            codes[name] = self._codings[name].encode(raw)
+        return (np.fromiter(columns[0], np.int64, count),
+                np.fromiter(columns[1], np.float64, count), codes)
+
+    def _changed(self, ids: Any, values: Any, codes: dict[str, Any]) -> int:
+        if not self.ids.size:
+            return len(ids)
+        positions = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        same = (self.ids[positions] == ids) & (self.values[positions] == values)
+        for name, column in codes.items():
+            same &= self._codes[name][positions] == column
+        return int((~same).sum())
@@ -0,0 +1,489 @@
+"""
+Bloom Filter Pre-check for Natural Key Existence.
+"""
+
+import hashlib
+import json
+import math
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from football_data.models import Base, Player, Statistic
+from football_data.repositories import PlayerRepository, StatisticRepository, StatisticDelta
+
+_HEADER = struct.Struct('>4sBQBQ')
+_MAGIC = b'FDBF'
+_VERSION = 1
+
+# Rows read per round trip while building the filters.
+BUILD_BATCH_SIZE = 10000
+
+# Seconds between the checks of the tables for rows written by other processes.
+REFRESH_INTERVAL = 300.0
+
+# Row count, highest id and latest updated at time of the players and statistics tables.
+Version = dict[str, list[Any]]
+
+
+class BloomFilter:
+    """
+    Probabilistic set answering that a key is definitely absent or possibly present.
+    """
+
+    size: int
+    hashes: int
+    count: int
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Creates a new instance of the Bloom Filter sized for a number of keys.
+        :param capacity: Expected number of keys
+        :param error_rate: False positive rate at the capacity
+        """
+
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> None:
+        """
+        Adds a key.
+        :param key: Key
+        :return: None
+        """
+        for index in self._indexes(key):
+            self._bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key))
+
+    @property
+    def false_positive_rate(self) -> float:
+        """
+        Estimated false positive rate from the share of bits set.
+        :return: Rate between 0 and 1
+        """
+        filled = sum(bin(byte).count('1') for byte in self._bits) / self.size
+        return filled ** self.hashes
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the filter.
+        :return: Bytes
+        """
+        return _HEADER.pack(_MAGIC, _VERSION, self.size, self.hashes, self.count) + self._bits
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        """
+        Deserializes a filter.
+        :param data: Bytes written by to_bytes
+        :return: Bloom Filter
+        """
+
+        magic, version, size, hashes, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or len(data) != _HEADER.size + (size + 7) // 8:
+            raise ValueError('Not a Bloom Filter')
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hashes, bloom.count = size, hashes, count
+        bloom._bits = bytearray(data[_HEADER.size:])  # pylint: disable=protected-access
+        return bloom
+
+    def _indexes(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = struct.unpack('>QQ', digest)
+        for number in range(self.hashes):
+            yield (first + number * second) % self.size
+
+
+@dataclass
+class FilterStatistics:
+    """
+    Outcome of the checks answered by a filter.
+    """
+
+    definite_negatives: int = 0
+    false_positives: int = 0
+    true_positives: int = 0
+
+    @property
+    def observed_false_positive_rate(self) -> float:
+        """
+        Share of the absent keys the filter reported as possibly present.
+        :return: Rate between 0 and 1
+        """
+        negatives = self.definite_negatives + self.false_positives
+        return self.false_positives / negatives if negatives else 0.0
+
+
+def player_keys(url: str) -> list[str]:
+    """
+    Returns the filter keys of a Player.
+    :param url: Player Url
+    :return: List of Keys
+    """
+    return [url]
+
+
+def statistic_keys(schedule_id: int, category_id: int, statistic_code_id: int,
+                   player_id: int | None, team_id: int | None) -> list[str]:
+    """
+    Returns the filter keys of a stored Statistic. statistic_exists only compares the player and
+    team when they are set on the checked statistic, so a key is added for each combination.
+    :return: List of Keys
+    """
+
+    optional = [(name, value) for name, value in (('p', player_id), ('t', team_id)) if value]
+    return [_statistic_key(schedule_id, category_id, statistic_code_id, dict(items))
+            for size in range(len(optional) + 1) for items in combinations(optional, size)]
+
+
+def statistic_key(stat: Statistic) -> str:
+    """
+    Returns the filter key checked for a Statistic.
+    :param stat: Statistic
+    :return: Key
+    """
+
+    optional = {name: value for name, value in (('p', stat.player_id), ('t', stat.team_id))
+                if value}
+    return _statistic_key(stat.schedule_id, stat.category_id, stat.statistic_code_id, optional)
+
+
+@dataclass
+class _Filters:
+    """
+    Filters with the version of the tables they were built from, replaced together.
+    """
+
+    players: BloomFilter
+    statistics: BloomFilter
+    version: Version | None
+    checked: float = field(default_factory=time.monotonic)
+
+
+class ExistenceFilter:
+    """
+    Bloom Filters built from the natural keys of the players and statistics tables, answering
+    player_exits and statistic_exists without a database round trip when a key is definitely
+    absent. Keys that may be present fall through to the exact check of the repository. Rows
+    saved through player_repository and statistic_repository are added to the filters. The
+    version of the tables is recorded with the filters and compared every max_age seconds, so
+    rows written by other processes cause a rebuild.
+    """
+
+    error_rate: float
+    max_age: float | None
+    stats: dict[str, FilterStatistics]
+
+    def __init__(self, maker: sessionmaker, error_rate: float = 0.01, headroom: float = 1.5,
+                 max_age: float | None = REFRESH_INTERVAL):
+        """
+        Creates a new instance of the Existence Filter. The filters are empty until built or
+        loaded, and until then the checks fall through to the repositories.
+        :param maker: SQL Alchemy Session Maker
+        :param error_rate: False positive rate of the filters at their capacity
+        :param headroom: Capacity relative to the keys in the tables, leaving room for new rows
+        :param max_age: Seconds between the checks for changed tables, None to only refresh
+        when called
+        """
+
+        self.maker = maker
+        self.error_rate = error_rate
+        self.headroom = headroom
+        self.max_age = max_age
+        self.player_repository = _FilteredPlayerRepository(maker, self)
+        self.statistic_repository = _FilteredStatisticRepository(maker, self)
+        self.stats = {'players': FilterStatistics(), 'statistics': FilterStatistics()}
+        self._filters = _Filters(BloomFilter(1, error_rate), BloomFilter(1, error_rate), None)
+        self._lock = threading.Lock()
+
+    @property
+    def players(self) -> BloomFilter:
+        """
+        Filter of the player keys.
+        :return: Bloom Filter
+        """
+        return self._filters.players
+
+    @property
+    def statistics(self) -> BloomFilter:
+        """
+        Filter of the statistic keys.
+        :return: Bloom Filter
+        """
+        return self._filters.statistics
+
+    @property
+    def version(self) -> Version | None:
+        """
+        Row count, highest id and latest updated at time of each table when the filters were
+        built, None before the first build.
+        :return: Dictionary of table name to version
+        """
+        return self._filters.version
+
+    def build(self) -> None:
+        """
+        Builds the filters from the keys in the database and records the version of the tables.
+        :return: None
+        """
+
+        with self.maker() as session:
+            version = _version(session)
+            players = BloomFilter(int(version[Player.__tablename__][0] * self.headroom),
+                                  self.error_rate)
+            for row in _stream(session, select(Player.url)):
+                _add_all(players, player_keys(*row))
+
+            statistics = BloomFilter(int(version[Statistic.__tablename__][0] * 4 * self.headroom),
+                                     self.error_rate)
+            for row in _stream(session, select(
+                    Statistic.schedule_id, Statistic.category_id, Statistic.statistic_code_id,
+                    Statistic.player_id, Statistic.team_id)):
+                _add_all(statistics, statistic_keys(*row))
+
+        self._replace(players, statistics, version)
+
+    def refresh(self) -> bool:
+        """
+        Rebuilds the filters when the row count, highest id or latest updated at time of the
+        players or statistics table differs from the recorded version, such as after rows were
+        written by other processes. Writes through the repositories of the filter change the
+        version as well.
+        :return: True when the filters were rebuilt
+        """
+
+        with self.maker() as session:
+            version = _version(session)
+        with self._lock:
+            self._filters.checked = time.monotonic()
+            if version == self._filters.version:
+                return False
+        self.build()
+        return True
+
+    def add(self, models: Iterable[Any]) -> None:
+        """
+        Adds the keys of saved Players and Statistics to the filters.
+        :param models: Players or Statistics
+        :return: None
+        """
+        self.add_keys(self.keys(models))
+
+    def keys(self, models: Iterable[Any], schedule_id: int | None = None) -> dict[str, list[str]]:
+        """
+        Returns the filter keys of Players and Statistics.
+        :param models: Players or Statistics
+        :param schedule_id: Schedule ID Value of the Statistics, defaults to their own
+        :return: Dictionary of filter name to Keys
+        """
+
+        keys: dict[str, list[str]] = {'players': [], 'statistics': []}
+        for model in models:
+            if isinstance(model, Player):
+                keys['players'].extend(player_keys(model.url))
+            elif isinstance(model, Statistic):
+                keys['statistics'].extend(statistic_keys(
+                    schedule_id or model.schedule_id, model.category_id, model.statistic_code_id,
+                    model.player_id, model.team_id))
+        return keys
+
+    def add_keys(self, keys: dict[str, list[str]]) -> None:
+        """
+        Adds keys returned by keys to the filters.
+        :param keys: Dictionary of filter name to Keys
+        :return: None
+        """
+        with self._lock:
+            _add_all(self._filters.players, keys['players'])
+            _add_all(self._filters.statistics, keys['statistics'])
+
+    def player_exits(self, player: Player) -> bool:
+        """
+        Validates if a player exists, checking the database only when the filter may contain it.
+        :param player: Player
+        :return: Bool
+        """
+        self._refresh_if_due()
+        return self._check('players', player.url in self.players,
+                           lambda: self.player_repository.player_exits(player))
+
+    def statistic_exists(self, stat: Statistic) -> bool:
+        """
+        Checks if a statistic exists, checking the database only when the filter may contain it.
+        :param stat: Statistic
+        :return: Bool
+        """
+        self._refresh_if_due()
+        return self._check('statistics', statistic_key(stat) in self.statistics,
+                           lambda: self.statistic_repository.statistic_exists(stat))
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """
+        Returns the size, estimated false positive rate and the observed check outcomes of each
+        filter.
+        :return: Dictionary of filter name to figures
+        """
+
+        with self._lock:
+            return {name: {
+                'keys': bloom.count, 'bits': bloom.size, 'hashes': bloom.hashes,
+                'estimated_false_positive_rate': bloom.false_positive_rate,
+                'definite_negatives': self.stats[name].definite_negatives,
+                'false_positives': self.stats[name].false_positives,
+                'true_positives': self.stats[name].true_positives,
+                'observed_false_positive_rate': self.stats[name].observed_false_positive_rate
+            } for name, bloom in (('players', self._filters.players),
+                                  ('statistics', self._filters.statistics))}
+
+    def save(self, path: str | Path) -> None:
+        """
+        Writes the filters and the version of the tables they were built from to a file.
+        :param path: File Path
+        :return: None
+        """
+
+        with self._lock:
+            players = self._filters.players.to_bytes()
+            statistics = self._filters.statistics.to_bytes()
+            version = json.dumps(self._filters.version).encode()
+        Path(path).write_bytes(struct.pack('>QQ', len(players), len(statistics)) + players
+                               + statistics + version)
+
+    def load(self, path: str | Path) -> None:
+        """
+        Reads filters written by save. Rows written after the save are seen once refresh finds
+        the version of the tables changed.
+        :param path: File Path
+        :return: None
+        """
+
+        data = Path(path).read_bytes()
+        players_length, statistics_length = struct.unpack_from('>QQ', data)
+        start = 16 + players_length
+        players = BloomFilter.from_bytes(data[16:start])
+        statistics = BloomFilter.from_bytes(data[start:start + statistics_length])
+        self._replace(players, statistics, json.loads(data[start + statistics_length:]))
+
+    def _replace(self, players: BloomFilter, statistics: BloomFilter,
+                 version: Version | None) -> None:
+        with self._lock:
+            self._filters = _Filters(players, statistics, version)
+            self.stats = {'players': FilterStatistics(), 'statistics': FilterStatistics()}
+
+    def _refresh_if_due(self) -> None:
+        with self._lock:
+            if self.max_age is None or time.monotonic() - self._filters.checked < self.max_age:
+                return
+            # Other threads keep answering from the current filters during the check.
+            self._filters.checked = time.monotonic()
+        self.refresh()
+
+    def _check(self, name: str, possible: bool, exact: Any) -> bool:
+        # Before a build or load the filters hold no keys, so every check is exact.
+        if self._filters.version is None:
+            return exact()
+        if not possible:
+            with self._lock:
+                self.stats[name].definite_negatives += 1
+            return False
+
+        exists = exact()
+        with self._lock:
+            if exists:
+                self.stats[name].true_positives += 1
+            else:
+                self.stats[name].false_positives += 1
+        return exists
+
+
+class _FilteredPlayerRepository(PlayerRepository):
+    """
+    Player Repository adding the keys of saved Players to an Existence Filter.
+    """
+
+    def __init__(self, maker: sessionmaker, existence: ExistenceFilter):
+        super().__init__(maker)
+        self.existence = existence
+
+    def save(self, model: Base) -> None:
+        keys = self.existence.keys([model])
+        super().save(model)
+        self.existence.add_keys(keys)
+
+    def save_all(self, items: list[Base]) -> None:
+        keys = self.existence.keys(items)
+        super().save_all(items)
+        self.existence.add_keys(keys)
+
+
+class _FilteredStatisticRepository(StatisticRepository):
+    """
+    Statistic Repository adding the keys of saved Statistics to an Existence Filter.
+    """
+
+    def __init__(self, maker: sessionmaker, existence: ExistenceFilter):
+        super().__init__(maker)
+        self.existence = existence
+
+    def save(self, model: Base) -> None:
+        keys = self.existence.keys([model])
+        super().save(model)
+        self.existence.add_keys(keys)
+
+    def save_all(self, items: list[Base]) -> None:
+        keys = self.existence.keys(items)
+        super().save_all(items)
+        self.existence.add_keys(keys)
+
+    def sync_statistics(self, schedule_id: int, stats: Iterable[Statistic]) -> StatisticDelta:
+        stats = list(stats)
+        keys = self.existence.keys(stats, schedule_id)
+        delta = super().sync_statistics(schedule_id, stats)
+        self.existence.add_keys(keys)
+        return delta
+
+    def replace_statistics(self, schedule_id: int, stats: Iterable[Statistic]) -> StatisticDelta:
+        stats = list(stats)
+        keys = self.existence.keys(stats, schedule_id)
+        delta = super().replace_statistics(schedule_id, stats)
+        self.existence.add_keys(keys)
+        return delta
+
+
+def _version(session: Any) -> Version:
+    version = {}
+    for model in (Player, Statistic):
+        count, highest, changed = session.execute(select(
+            func.count(model.id), func.max(model.id), func.max(model.updated_at))).one()
+        version[model.__tablename__] = [count, highest or 0,
+                                        changed.isoformat() if changed else '']
+    return version
+
+
+def _statistic_key(schedule_id: int, category_id: int, statistic_code_id: int,
+                   optional: dict[str, int]) -> str:
+    parts = [str(schedule_id), str(category_id), str(statistic_code_id)]
+    parts.extend(f'{name}{value}' for name, value in sorted(optional.items()))
+    return ':'.join(parts)
+
+
+def _stream(session: Any, statement: Any) -> Iterator[Any]:
+    yield from session.execute(statement.execution_options(yield_per=BUILD_BATCH_SIZE))
+
+
+def _add_all(bloom: BloomFilter, keys: list[str]) -> None:
+    for key in keys:
+        bloom.add(key)
@@ -0,0 +1,230 @@
+"""
+Bulk Writes of the Statistics of Schedules without loading Statistic objects.
+"""
+
+import math
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any, Iterable, NamedTuple
+
+from sqlalchemy import select, delete, insert, update, bindparam, or_, Executable
+from sqlalchemy.orm import Session
+
+from football_data.models import Schedule, Statistic
+
+
+@dataclass
+class StatisticDelta:
+    """
+    Changes written when synchronizing the Statistics of a Schedule.
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+class StatisticValue(NamedTuple):
+    """
+    New value of a Statistic identified by its natural key.
+    """
+
+    schedule_id: int
+    statistic_code_id: int
+    category_id: int
+    player_id: int | None
+    team_id: int | None
+    value: float
+
+
+@dataclass
+class ValueUpdateResult:
+    """
+    Outcome of a bulk update of Statistic values.
+    """
+
+    matched: int = 0
+    unmatched: list[StatisticValue] = field(default_factory=list)
+
+
+def natural_key(stat: Any) -> tuple[int, int, int | None, int | None]:
+    """
+    Returns the key identifying a Statistic within its Schedule.
+    :param stat: Statistic or row with the key columns
+    :return: Statistic Code ID, Category ID, Player ID and Team ID
+    """
+    return stat.statistic_code_id, stat.category_id, stat.player_id or None, stat.team_id or None
+
+
+def schedule_years(session: Session, schedule_ids: Iterable[int]) -> dict[int, int]:
+    """
+    Returns the years of Schedules.
+    :param session: Session
+    :param schedule_ids: Schedule ID Values
+    :return: Dictionary of Schedule ID to Year Value, without unknown Schedules
+    """
+    return dict(session.execute(select(Schedule.id, Schedule.year_value).where(
+        Schedule.id.in_(schedule_ids))).tuples().all())
+
+
+def sync_schedule(session: Session, schedule_id: int, stats: Iterable[Statistic]) -> StatisticDelta:
+    """
+    Writes the differences between the stored Statistics of a Schedule and an incoming set in
+    the transaction of the session. The stored statistics are read once and matched by natural
+    key, then only the differences are written with bulk inserts, updates and deletes. The year
+    of the schedule narrows the read, which still includes statistics stored without a year.
+    :param session: Session with a begun transaction
+    :param schedule_id: Schedule ID Value
+    :param stats: Complete set of Statistics of the Schedule
+    :return: Statistic Delta
+    """
+
+    incoming = {natural_key(stat): stat for stat in stats}
+    delta = StatisticDelta()
+    year = schedule_years(session, [schedule_id]).get(schedule_id)
+    stored = session.execute(_stored_statistics(year is not None), {
+        'schedule_id': schedule_id, 'year_value': year}).all()
+
+    updates: list[dict[str, Any]] = []
+    deletes = []
+    for row in stored:
+        stat = incoming.pop(natural_key(row), None)
+        if stat is None:
+            deletes.append(row.id)
+        # REAL columns round values, so values within float precision are unchanged.
+        elif math.isclose(row.value, stat.value, rel_tol=1e-6):
+            delta.unchanged += 1
+        else:
+            updates.append(_value_row(row.id, stat.value, row.year_value))
+
+    if incoming:
+        session.execute(insert(Statistic.__table__), [
+            _insert_row(stat, schedule_id, year) for stat in incoming.values()])
+    _write_values(session, updates)
+    if deletes:
+        session.execute(delete(Statistic).where(Statistic.id.in_(deletes)))
+
+    delta.inserted, delta.updated, delta.deleted = len(incoming), len(updates), len(deletes)
+    return delta
+
+
+def replace_schedule(session: Session, schedule_id: int,
+                     stats: Iterable[Statistic]) -> StatisticDelta:
+    """
+    Replaces the Statistics of a Schedule in the transaction of the session, with a single
+    DELETE by the schedule id and a bulk insert. The year of the schedule narrows the DELETE,
+    which still removes statistics stored without a year.
+    :param session: Session with a begun transaction
+    :param schedule_id: Schedule ID Value
+    :param stats: Complete set of Statistics of the Schedule
+    :return: Statistic Delta with the deleted and inserted counts
+    """
+
+    year = schedule_years(session, [schedule_id]).get(schedule_id)
+    criteria = [Statistic.schedule_id == schedule_id]
+    if year is not None:
+        criteria.append(or_(Statistic.year_value == year, Statistic.year_value.is_(None)))
+    deleted = session.execute(delete(Statistic).where(*criteria)).rowcount
+    rows = [_insert_row(stat, schedule_id, year) for stat in stats]
+    if rows:
+        session.execute(insert(Statistic.__table__), rows)
+    return StatisticDelta(inserted=len(rows), deleted=deleted)
+
+
+def update_values(session: Session, values: list[StatisticValue],
+                  chunk_size: int) -> ValueUpdateResult:
+    """
+    Updates the values of Statistics by natural key in the transaction of the session. The ids
+    of the keys are read with one query per chunk of schedules and the values written with an
+    executemany UPDATE by id. The years of the schedules narrow the read, which still includes
+    statistics stored without a year, and each UPDATE carries the year of its stored row, so a
+    table partitioned by season only scans the partitions of those years.
+    :param session: Session with a begun transaction
+    :param values: Statistic Values
+    :param chunk_size: Maximum Schedule IDs per query
+    :return: Value Update Result with the matched count and the unmatched values
+    """
+
+    ids = _stored_ids(session, list(dict.fromkeys(item.schedule_id for item in values)),
+                      chunk_size)
+    result = ValueUpdateResult()
+    updates: list[dict[str, Any]] = []
+    for item in values:
+        matches = ids.get((item.schedule_id, *natural_key(item)), [])
+        updates.extend(_value_row(id_value, item.value, year) for id_value, year in matches)
+        if matches:
+            result.matched += 1
+        else:
+            result.unmatched.append(item)
+    _write_values(session, updates)
+    return result
+
+
+def _stored_ids(session: Session, schedule_ids: list[int],
+                chunk_size: int) -> dict[tuple, list[tuple[int, int | None]]]:
+    ids: dict[tuple, list[tuple[int, int | None]]] = {}
+    for start in range(0, len(schedule_ids), chunk_size):
+        chunk = schedule_ids[start:start + chunk_size]
+        years = schedule_years(session, chunk)
+        parameters = {'schedule_id': chunk, 'year_value': list(set(years.values()))}
+        by_year = len(years) == len(chunk)
+        for row in session.execute(_stored_keys(by_year), parameters):
+            ids.setdefault((row.schedule_id, *natural_key(row)), []).append(
+                (row.id, row.year_value))
+    return ids
+
+
+def _write_values(session: Session, rows: list[dict[str, Any]]) -> None:
+    # Rows of statistics with a year update by id and year, the others by id alone.
+    for by_year in (True, False):
+        batch = [row for row in rows if ('b_year' in row) == by_year]
+        if batch:
+            session.execute(_update_value(by_year), batch)
+
+
+@cache
+def _stored_statistics(by_year: bool) -> Executable:
+    statement = select(Statistic.id, Statistic.statistic_code_id, Statistic.category_id,
+                       Statistic.player_id, Statistic.team_id, Statistic.value,
+                       Statistic.year_value).where(
+        Statistic.schedule_id == bindparam('schedule_id'))
+    if by_year:
+        statement = statement.where(or_(Statistic.year_value == bindparam('year_value'),
+                                        Statistic.year_value.is_(None)))
+    return statement
+
+
+@cache
+def _stored_keys(by_year: bool) -> Executable:
+    statement = select(Statistic.id, Statistic.schedule_id, Statistic.statistic_code_id,
+                       Statistic.category_id, Statistic.player_id, Statistic.team_id,
+                       Statistic.year_value).where(
+        Statistic.schedule_id.in_(bindparam('schedule_id', expanding=True)))
+    if by_year:
+        statement = statement.where(or_(
+            Statistic.year_value.in_(bindparam('year_value', expanding=True)),
+            Statistic.year_value.is_(None)))
+    return statement
+
+
+@cache
+def _update_value(by_year: bool) -> Executable:
+    table = Statistic.__table__
+    statement = update(table).where(table.c.id == bindparam('b_id'))
+    if by_year:
+        statement = statement.where(table.c.year_value == bindparam('b_year'))
+    return statement.values(value=bindparam('b_value'))
+
+
+def _value_row(id_value: int, value: float, year: int | None) -> dict[str, Any]:
+    row = {'b_id': id_value, 'b_value': value}
+    if year is not None:
+        row['b_year'] = year
+    return row
+
+
+def _insert_row(stat: Statistic, schedule_id: int, year: int | None) -> dict[str, Any]:
+    return {'schedule_id': schedule_id, 'statistic_code_id': stat.statistic_code_id,
+            'category_id': stat.category_id, 'player_id': stat.player_id or None,
+            'team_id': stat.team_id or None, 'value': stat.value, 'year_value': year}
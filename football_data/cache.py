@@ -0,0 +1,401 @@
+"""
+Read-through Result Cache for Statistics by Schedule.
+"""
+
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Protocol
+
+from sqlalchemy.orm import sessionmaker
+
+from football_data.models import Base, Statistic
+from football_data.repositories import StatisticDelta, StatisticRepository, ValueUpdateResult
+
+# Filters of get_statistics that are part of the cache key next to the schedule id.
+CACHED_FILTERS = ('player_id', 'team_id', 'year')
+
+# Seconds after which a hit on the SQLite backend records the use of a value again, so most hits
+# do not write and eviction follows the recency of use only approximately.
+RECENCY_INTERVAL = 60.0
+
+# Values stored by a SQLite backend between the checks of the number of cached values.
+EVICTION_INTERVAL = 100
+
+
+class CacheBackend(Protocol):
+    """
+    Storage for cached results grouped by a namespace that is invalidated as a whole. Each
+    invalidation advances the generation of the namespace, and a value read from the database
+    before an invalidation is not stored when it is set with the generation seen before the read.
+    """
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        """
+        Returns a cached value.
+        :param namespace: Namespace
+        :param key: Key within the namespace
+        :return: Value or None when not cached
+        """
+
+    def set(self, namespace: str, key: str, value: Any, generation: int | None = None) -> None:
+        """
+        Stores a value.
+        :param namespace: Namespace
+        :param key: Key within the namespace
+        :param value: JSON serializable Value
+        :param generation: Generation the value was read in, the value is not stored when the
+        namespace was invalidated since
+        :return: None
+        """
+
+    def generation(self, namespace: str) -> int:
+        """
+        Returns the number of invalidations of a namespace.
+        :param namespace: Namespace
+        :return: Generation
+        """
+
+    def invalidate(self, namespace: str) -> None:
+        """
+        Removes all values of a namespace and advances its generation.
+        :param namespace: Namespace
+        :return: None
+        """
+
+
+class LRUCacheBackend:
+    """
+    In process Cache Backend evicting the least recently used values beyond its capacity.
+    """
+
+    capacity: int
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Creates a new instance of the LRU Cache Backend.
+        :param capacity: Maximum number of cached values
+        """
+        self.capacity = capacity
+        self._values: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._keys: dict[str, set[str]] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        """
+        Returns a cached value.
+        :param namespace: Namespace
+        :param key: Key within the namespace
+        :return: Value or None when not cached
+        """
+        with self._lock:
+            value = self._values.get((namespace, key))
+            if value is not None:
+                self._values.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: Any, generation: int | None = None) -> None:
+        """
+        Stores a value.
+        :param namespace: Namespace
+        :param key: Key within the namespace
+        :param value: Value
+        :param generation: Generation the value was read in, the value is not stored when the
+        namespace was invalidated since
+        :return: None
+        """
+        with self._lock:
+            if generation is not None and generation != self._generations.get(namespace, 0):
+                return
+            self._values[(namespace, key)] = value
+            self._values.move_to_end((namespace, key))
+            self._keys.setdefault(namespace, set()).add(key)
+            while len(self._values) > self.capacity:
+                (evicted, evicted_key), _ = self._values.popitem(last=False)
+                self._keys[evicted].discard(evicted_key)
+                if not self._keys[evicted]:
+                    del self._keys[evicted]
+
+    def generation(self, namespace: str) -> int:
+        """
+        Returns the number of invalidations of a namespace.
+        :param namespace: Namespace
+        :return: Generation
+        """
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def invalidate(self, namespace: str) -> None:
+        """
+        Removes all values of a namespace and advances its generation.
+        :param namespace: Namespace
+        :return: None
+        """
+        with self._lock:
+            for key in self._keys.pop(namespace, ()):
+                del self._values[(namespace, key)]
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class SQLiteCacheBackend:
+    """
+    Cache Backend in a local SQLite file shared by the worker processes of a host. Values are
+    stored as JSON and the least recently used values beyond the capacity are evicted, with the
+    use of a value recorded at most once per RECENCY_INTERVAL. The values are counted every
+    eviction_interval stores of an instance, so the cache may exceed its capacity by the values
+    stored in between.
+    """
+
+    path: Path
+    capacity: int
+    eviction_interval: int
+
+    def __init__(self, path: str | Path, capacity: int = 100000,
+                 eviction_interval: int = EVICTION_INTERVAL):
+        """
+        Creates a new instance of the SQLite Cache Backend.
+        :param path: Cache File Path
+        :param capacity: Maximum number of cached values
+        :param eviction_interval: Stores between the checks of the number of cached values
+        """
+
+        self.path = Path(path)
+        self.capacity = capacity
+        self.eviction_interval = eviction_interval
+        self._stores = itertools.count(1)
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS result_cache (namespace TEXT NOT NULL, '
+                               'key TEXT NOT NULL, value TEXT NOT NULL, used REAL NOT NULL, '
+                               'PRIMARY KEY (namespace, key))')
+            connection.execute('CREATE INDEX IF NOT EXISTS result_cache_used '
+                               'ON result_cache (used)')
+            connection.execute('CREATE TABLE IF NOT EXISTS result_generations (namespace TEXT '
+                               'NOT NULL PRIMARY KEY, generation INTEGER NOT NULL)')
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        """
+        Returns a cached value.
+        :param namespace: Namespace
+        :param key: Key within the namespace
+        :return: Value or None when not cached
+        """
+
+        with self._connection() as connection:
+            row = connection.execute('SELECT value, used FROM result_cache WHERE namespace = ? '
+                                     'AND key = ?', (namespace, key)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > RECENCY_INTERVAL:
+                connection.execute('UPDATE result_cache SET used = ? WHERE namespace = ? AND '
+                                   'key = ?', (now, namespace, key))
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, generation: int | None = None) -> None:
+        """
+        Stores a value.
+        :param namespace: Namespace
+        :param key: Key within the namespace
+        :param value: JSON serializable Value
+        :param generation: Generation the value was read in, the value is not stored when the
+        namespace was invalidated since
+        :return: None
+        """
+
+        with self._connection() as connection:
+            # The generation is compared in the INSERT, so an invalidation cannot interleave.
+            connection.execute(
+                'INSERT OR REPLACE INTO result_cache (namespace, key, value, used) '
+                'SELECT ?, ?, ?, ? WHERE ? IS NULL OR ? = COALESCE((SELECT generation FROM '
+                'result_generations WHERE namespace = ?), 0)',
+                (namespace, key, json.dumps(value), time.time(), generation, generation,
+                 namespace))
+            if next(self._stores) % self.eviction_interval == 0:
+                self._evict(connection)
+
+    def generation(self, namespace: str) -> int:
+        """
+        Returns the number of invalidations of a namespace.
+        :param namespace: Namespace
+        :return: Generation
+        """
+        row = self._connection().execute('SELECT generation FROM result_generations WHERE '
+                                         'namespace = ?', (namespace,)).fetchone()
+        return row[0] if row else 0
+
+    def invalidate(self, namespace: str) -> None:
+        """
+        Removes all values of a namespace and advances its generation.
+        :param namespace: Namespace
+        :return: None
+        """
+        with self._connection() as connection:
+            connection.execute('DELETE FROM result_cache WHERE namespace = ?', (namespace,))
+            connection.execute('INSERT INTO result_generations (namespace, generation) '
+                               'VALUES (?, 1) ON CONFLICT (namespace) DO UPDATE SET '
+                               'generation = generation + 1', (namespace,))
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (count,) = connection.execute('SELECT COUNT(*) FROM result_cache').fetchone()
+        if count > self.capacity:
+            # Ascending by use, so only the evicted entries of the index are read.
+            connection.execute('DELETE FROM result_cache WHERE rowid IN (SELECT rowid FROM '
+                               'result_cache ORDER BY used LIMIT ?)', (count - self.capacity,))
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            self._local.connection = connection
+        return connection
+
+
+class CachedStatisticRepository(StatisticRepository):
+    """
+    Statistic Repository serving get_statistics by schedule id from a read-through cache.
+    Statistics saved through the repository invalidate the cached results of their schedule,
+    writes made elsewhere are not seen until the entry is evicted.
+    """
+
+    backend: CacheBackend
+    hits: int
+    misses: int
+
+    def __init__(self, maker: sessionmaker, backend: CacheBackend | None = None, **kwargs):
+        """
+        Creates a new instance of the Cached Statistic Repository.
+        :param maker: SQL Alchemy Session Maker
+        :param backend: Cache Backend, defaults to an in process LRU cache
+        :keyword timeout: Default seconds a call may spend executing statements
+        :keyword row_limit: Default maximum number of rows a call may return
+        """
+
+        super().__init__(maker, **kwargs)
+        self.backend = backend if backend is not None else LRUCacheBackend()
+        self.hits = 0
+        self.misses = 0
+
+    def get_statistics(self, **kwargs) -> list[Statistic]:
+        """
+        Returns the Statistics from the cache when filtered by schedule, otherwise from the
+        Database.
+        :keyword: player_id Player ID Value
+        :keyword: schedule_id Schedule ID Value
+        :keyword: team_id Team ID Value
+        :keyword: year Year Value
+        :return: List of Statistics
+        """
+
+        if 'schedule_id' not in kwargs:
+            return super().get_statistics(**kwargs)
+
+        namespace = str(int(kwargs['schedule_id']))
+        key = json.dumps({name: int(kwargs[name]) for name in CACHED_FILTERS if name in kwargs},
+                         sort_keys=True)
+        rows = self.backend.get(namespace, key)
+        if rows is not None:
+            self.hits += 1
+            return [_statistic(row) for row in rows]
+
+        # Results read before a concurrent write invalidates the schedule are not cached.
+        self.misses += 1
+        generation = self.backend.generation(namespace)
+        stats = super().get_statistics(**kwargs)
+        self.backend.set(namespace, key, [_row(stat) for stat in stats], generation)
+        return stats
+
+    def save(self, model: Base) -> None:
+        """
+        Saves the model to the database and invalidates the cached results of its schedule.
+        :param model: Base Model Implementation
+        :return: None
+        """
+        try:
+            super().save(model)
+        finally:
+            self.invalidate([model])
+
+    def save_all(self, items: list[Base]) -> None:
+        """
+        Saves a collection of items to the database and invalidates the cached results of their
+        schedules.
+        :param items: Collection of Base Items.
+        :return: None
+        """
+        try:
+            super().save_all(items)
+        finally:
+            self.invalidate(items)
+
+    def sync_statistics(self, schedule_id: int, stats: Iterable[Statistic]) -> StatisticDelta:
+        """
+        Synchronizes the Statistics of a Schedule and invalidates its cached results.
+        :param schedule_id: Schedule ID Value
+        :param stats: Complete set of Statistics of the Schedule
+        :return: Statistic Delta
+        """
+        try:
+            return super().sync_statistics(schedule_id, stats)
+        finally:
+            self.invalidate([schedule_id])
+
+    def replace_statistics(self, schedule_id: int, stats: Iterable[Statistic]) -> StatisticDelta:
+        """
+        Replaces all Statistics of a Schedule and invalidates its cached results.
+        :param schedule_id: Schedule ID Value
+        :param stats: Complete set of Statistics of the Schedule
+        :return: Statistic Delta with the deleted and inserted counts
+        """
+        try:
+            return super().replace_statistics(schedule_id, stats)
+        finally:
+            self.invalidate([schedule_id])
+
+    def update_statistic_values(self, values: Iterable[tuple],
+                                chunk_size: int = 500) -> ValueUpdateResult:
+        """
+        Updates the values of Statistics by natural key and invalidates the cached results of
+        their schedules.
+        :param values: StatisticValue tuples
+        :param chunk_size: Maximum Schedule IDs per query
+        :return: Value Update Result
+        """
+        values = list(values)
+        try:
+            return super().update_statistic_values(values, chunk_size)
+        finally:
+            self.invalidate([int(item[0]) for item in values])
+
+    def invalidate(self, items: Iterable[Base | int]) -> None:
+        """
+        Invalidates the cached results of the schedules of statistics or of schedule ids.
+        :param items: Statistics or Schedule ID Values
+        :return: None
+        """
+
+        schedule_ids = {item if isinstance(item, int) else item.schedule_id for item in items
+                        if isinstance(item, (int, Statistic))}
+        for schedule_id in schedule_ids:
+            self.backend.invalidate(str(schedule_id))
+
+
+def _row(stat: Statistic) -> dict[str, Any]:
+    row = {column.key: getattr(stat, column.key) for column in Statistic.__table__.columns}
+    row['updated_at'] = row['updated_at'].isoformat() if row['updated_at'] else None
+    return row
+
+
+def _statistic(row: dict[str, Any]) -> Statistic:
+    updated_at = row['updated_at']
+    return Statistic(**{**row, 'updated_at': datetime.fromisoformat(updated_at)
+                        if updated_at else None})
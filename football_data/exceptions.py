@@ -0,0 +1,35 @@
+"""
+Football Data Exceptions.
+"""
+
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class BudgetExceededError(SQLAlchemyError):
+    """
+    Raised when a repository call exceeds its latency budget.
+    """
+
+
+class QueryTimeoutError(BudgetExceededError):
+    """
+    Raised when a repository call runs longer than its timeout.
+    """
+
+
+class RowLimitExceededError(BudgetExceededError):
+    """
+    Raised when a repository call returns more rows than its row limit.
+    """
+
+
+class NPlusOneError(SQLAlchemyError):
+    """
+    Raised when a single row lookup is repeated more often than the N+1 threshold.
+    """
+
+
+class NPlusOneWarning(UserWarning):
+    """
+    Issued when a single row lookup is repeated more often than the N+1 threshold.
+    """
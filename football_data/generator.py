@@ -0,0 +1,326 @@
+"""
+Synthetic League Data Generator for load testing and capacity planning.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import Session, sessionmaker
+
+from football_data.models import (Base, League, Player, Position, Schedule, Statistic,
+                                  StatisticCategory, StatisticCode, Team, TeamLeague, TeamStaff,
+                                  TypeCode)
+
+# Position code, description and number of players on a 53 man roster.
+POSITIONS = [
+    ('QB', 'Quarterback', 3), ('RB', 'Running Back', 4), ('WR', 'Wide Receiver', 6),
+    ('TE', 'Tight End', 3), ('OL', 'Offensive Line', 9), ('DL', 'Defensive Line', 9),
+    ('LB', 'Linebacker', 7), ('CB', 'Cornerback', 6), ('S', 'Safety', 4), ('K', 'Kicker', 1),
+    ('P', 'Punter', 1)
+]
+
+# Position code and the number of players at the position recording statistics in a game.
+PARTICIPANTS = {'QB': 1, 'RB': 2, 'WR': 4, 'TE': 2, 'DL': 4, 'LB': 3, 'CB': 3, 'S': 2, 'K': 1,
+                'P': 1}
+
+TYPE_CODES = [('PRE', 'Preseason'), ('REG', 'Regular Season'), ('POST', 'Post Season')]
+
+LEAGUES = [('AFC', 'American Football Conference'), ('NFC', 'National Football Conference')]
+
+CATEGORIES = [('PASS', 'Passing'), ('RUSH', 'Rushing'), ('REC', 'Receiving'),
+              ('DEF', 'Defense'), ('KICK', 'Kicking'), ('PUNT', 'Punting'), ('TEAM', 'Team')]
+
+# Statistic code, description, category code, mean and standard deviation per game.
+STATISTIC_CODES = [
+    ('PASSATT', 'Pass Attempts', 'PASS', 34.0, 7.0),
+    ('PASSCMP', 'Pass Completions', 'PASS', 22.0, 5.0),
+    ('PASSYDS', 'Passing Yards', 'PASS', 235.0, 70.0),
+    ('PASSTD', 'Passing Touchdowns', 'PASS', 1.5, 1.1),
+    ('PASSINT', 'Interceptions Thrown', 'PASS', 0.8, 0.8),
+    ('RUSHATT', 'Rushing Attempts', 'RUSH', 11.0, 6.0),
+    ('RUSHYDS', 'Rushing Yards', 'RUSH', 48.0, 32.0),
+    ('RUSHTD', 'Rushing Touchdowns', 'RUSH', 0.4, 0.6),
+    ('TGT', 'Targets', 'REC', 5.5, 3.0),
+    ('REC', 'Receptions', 'REC', 3.8, 2.4),
+    ('RECYDS', 'Receiving Yards', 'REC', 45.0, 32.0),
+    ('RECTD', 'Receiving Touchdowns', 'REC', 0.3, 0.5),
+    ('TKL', 'Tackles', 'DEF', 4.2, 2.8),
+    ('SACK', 'Sacks', 'DEF', 0.3, 0.5),
+    ('PD', 'Passes Defended', 'DEF', 0.5, 0.7),
+    ('FGA', 'Field Goal Attempts', 'KICK', 2.0, 1.1),
+    ('FGM', 'Field Goals Made', 'KICK', 1.7, 1.0),
+    ('XPM', 'Extra Points Made', 'KICK', 2.4, 1.3),
+    ('PUNTS', 'Punts', 'PUNT', 4.3, 1.6),
+    ('PUNTYDS', 'Punting Yards', 'PUNT', 195.0, 70.0),
+    ('TOTYDS', 'Total Yards', 'TEAM', 335.0, 70.0),
+    ('FD', 'First Downs', 'TEAM', 20.0, 4.5),
+    ('PEN', 'Penalties', 'TEAM', 6.0, 2.5),
+    ('TOP', 'Time of Possession', 'TEAM', 30.0, 4.0)
+]
+
+# Statistic categories recorded for each position.
+POSITION_CATEGORIES = {
+    'QB': ['PASS', 'RUSH'], 'RB': ['RUSH', 'REC'], 'WR': ['REC'], 'TE': ['REC'],
+    'DL': ['DEF'], 'LB': ['DEF'], 'CB': ['DEF'], 'S': ['DEF'], 'K': ['KICK'], 'P': ['PUNT']
+}
+
+
+@dataclass
+class GeneratedCounts:
+    """
+    Number of rows written per table by the generator.
+    """
+
+    rows: dict[str, int] = field(default_factory=dict)
+
+    def add(self, table: str, count: int) -> None:
+        """
+        Adds written rows for a table.
+        :param table: Table Name
+        :param count: Row Count
+        :return: None
+        """
+        self.rows[table] = self.rows.get(table, 0) + count
+
+
+class LeagueDataGenerator:
+    """
+    Generates production shaped league data: reference codes, leagues, teams, rosters, schedules
+    with paired home and away rows and per player statistics. The same seed always produces the
+    same data.
+    """
+
+    seed: int
+    seasons: int
+    first_year: int
+    teams: int
+    weeks: int
+    games_per_week: int
+    chunk_size: int
+    backdate: bool
+
+    def __init__(self, seed: int = 0, seasons: int = 1, **kwargs):
+        """
+        Creates a new instance of the League Data Generator.
+        :param seed: Random Seed
+        :param seasons: Number of seasons to generate
+        :keyword first_year: Year of the first season
+        :keyword teams: Number of teams, must be even
+        :keyword weeks: Number of weeks per season
+        :keyword games_per_week: Number of games per week, defaults to every team playing
+        :keyword chunk_size: Number of rows per insert statement
+        :keyword backdate: Stamp schedules and statistics with a date in their week instead of the
+        load time, so repeated loads produce the same rows. Backdated rows are behind the
+        watermarks of change feed consumers and are not seen by them
+        """
+
+        self.seed = seed
+        self.seasons = seasons
+        self.first_year = int(kwargs.get('first_year', 2020))
+        self.teams = int(kwargs.get('teams', 32))
+        self.weeks = int(kwargs.get('weeks', 17))
+        self.games_per_week = int(kwargs.get('games_per_week', self.teams // 2))
+        self.chunk_size = int(kwargs.get('chunk_size', 5000))
+        self.backdate = bool(kwargs.get('backdate', False))
+        if self.teams % 2 or self.games_per_week > self.teams // 2:
+            raise ValueError('Teams must be even and play at most one game per week')
+
+    def load(self, maker: sessionmaker) -> GeneratedCounts:
+        """
+        Streams the generated data into the database with bulk inserts, committing each season.
+        Identifiers continue after the highest identifier present in each table. On PostgreSQL the
+        id sequences are advanced past the written identifiers before each commit, so later
+        inserts assigning their id from the sequence do not collide with the generated rows.
+        :param maker: SQL Alchemy Session Maker
+        :return: Generated Counts
+        """
+
+        with maker() as session:
+            session.begin()
+            run = _Run(session, random.Random(self.seed), self.chunk_size)  # nosec B311
+            self._write_reference(run)
+            run.advance_sequences()
+            session.commit()
+
+            for year in range(self.first_year, self.first_year + self.seasons):
+                session.begin()
+                rosters = self._write_rosters(run, year)
+                for week in range(1, self.weeks + 1):
+                    self._write_week(run, rosters, year, week)
+                run.advance_sequences()
+                session.commit()
+        return run.counts
+
+    def _write_reference(self, run: '_Run') -> None:
+        for model, values, key in ((Position, POSITIONS, 'positions'),
+                                   (TypeCode, TYPE_CODES, 'type_codes'),
+                                   (League, LEAGUES, 'leagues'),
+                                   (StatisticCategory, CATEGORIES, 'categories')):
+            rows = [{'id': run.next_id(model), 'code': item[0], 'description': item[1]}
+                    for item in values]
+            run.write(model, rows)
+            run.reference[key] = {row['code']: row['id'] for row in rows}
+
+        codes = [{'id': run.next_id(StatisticCode), 'code': code, 'description': description,
+                  'grouping': category}
+                 for code, description, category, _, _ in STATISTIC_CODES]
+        run.write(StatisticCode, codes)
+        run.reference['codes'] = {
+            category: [(row['id'], run.reference['categories'][category], mean, deviation)
+                       for row, (_, _, item_category, mean, deviation) in
+                       zip(codes, STATISTIC_CODES) if item_category == category]
+            for category, _ in CATEGORIES}
+
+        teams = [{'id': run.next_id(Team), 'url': f'https://football.example/teams/{index}',
+                  'code': f'T{index:02d}', 'name': f'Team {index:02d}'}
+                 for index in range(1, self.teams + 1)]
+        run.write(Team, teams)
+        run.reference['teams'] = [row['id'] for row in teams]
+
+    @staticmethod
+    def _write_rosters(run: '_Run', year: int) -> dict[int, dict[str, list[int]]]:
+        leagues = list(run.reference['leagues'].values())
+        run.write(TeamLeague, [
+            {'id': run.next_id(TeamLeague), 'team_id': team_id, 'year_value': year,
+             'league_id': leagues[index % len(leagues)]}
+            for index, team_id in enumerate(run.reference['teams'])])
+
+        players = []
+        staff = []
+        rosters: dict[int, dict[str, list[int]]] = {}
+        for team_id in run.reference['teams']:
+            roster = rosters.setdefault(team_id, {})
+            for code, description, size in POSITIONS:
+                for _ in range(size):
+                    player_id = run.next_id(Player)
+                    players.append({
+                        'id': player_id, 'position_id': run.reference['positions'][code],
+                        'name': f'{description} {player_id}',
+                        'url': f'https://football.example/players/{player_id}'})
+                    staff.append({'id': run.next_id(TeamStaff), 'player_id': player_id,
+                                  'team_id': team_id, 'year_value': year})
+                    roster.setdefault(code, []).append(player_id)
+                run.rng.shuffle(roster[code])
+        run.write(Player, players)
+        run.write(TeamStaff, staff)
+        return rosters
+
+    def _write_week(self, run: '_Run', rosters: dict[int, dict[str, list[int]]], year: int,
+                    week: int) -> None:
+        schedules = []
+        stats: list[dict[str, Any]] = []
+        for game, (home, away) in enumerate(run.pairings(self.games_per_week)):
+            game_id = year * 100000 + week * 100 + game
+            for team_id, opponent_id, is_home in ((home, away, True), (away, home, False)):
+                schedule_id = run.next_id(Schedule)
+                schedules.append({
+                    'id': schedule_id, 'team_id': team_id, 'opponent_id': opponent_id,
+                    'year_value': year, 'week_number': week, 'game_id': game_id,
+                    'url': f'https://football.example/games/{game_id}',
+                    'type_id': run.reference['type_codes']['REG'], 'is_home': is_home})
+                stats.extend(run.game_statistics(rosters[team_id], schedule_id, year, team_id))
+        if self.backdate:
+            _stamp(schedules + stats, year, week)
+        run.write(Schedule, schedules)
+        run.write(Statistic, stats)
+
+
+class _Run:
+    """
+    State of a single load: session, random source, identifiers and reference values.
+    """
+
+    def __init__(self, session: Session, rng: random.Random, chunk_size: int):
+        self.session = session
+        self.rng = rng
+        self.chunk_size = chunk_size
+        self.counts = GeneratedCounts()
+        self.reference: dict[str, Any] = {}
+        self._ids: dict[type[Base], int] = {}
+
+    def next_id(self, model: Any) -> int:
+        """
+        Allocates the next identifier after the highest identifier present in the table.
+        :param model: Model Class
+        :return: Identifier
+        """
+        if model not in self._ids:
+            self._ids[model] = self.session.scalar(select(func.max(model.id))) or 0
+        self._ids[model] += 1
+        return self._ids[model]
+
+    def advance_sequences(self) -> None:
+        """
+        Moves the id sequence of each written table on PostgreSQL to at least the highest
+        allocated identifier. Sequences already further ahead are left there.
+        :return: None
+        """
+
+        if self.session.get_bind().dialect.name != 'postgresql':
+            return
+        for model, last_id in self._ids.items():
+            sequence = func.pg_get_serial_sequence(model.__tablename__, 'id')
+            self.session.execute(select(func.setval(sequence, func.greatest(
+                last_id, func.nextval(sequence)))))
+
+    def pairings(self, games: int) -> list[tuple[int, int]]:
+        """
+        Randomly pairs the teams into home and away games.
+        :param games: Number of games
+        :return: List of Home and Away Team IDs
+        """
+        teams = list(self.reference['teams'])
+        self.rng.shuffle(teams)
+        return list(zip(teams[0:2 * games:2], teams[1:2 * games:2]))
+
+    def write(self, model: type[Base], rows: list[dict[str, Any]]) -> None:
+        """
+        Bulk inserts the rows in chunks.
+        :param model: Model Class
+        :param rows: Rows to insert
+        :return: None
+        """
+        for start in range(0, len(rows), self.chunk_size):
+            self.session.execute(insert(model.__table__), rows[start:start + self.chunk_size])
+        self.counts.add(model.__tablename__, len(rows))
+
+    def game_statistics(self, roster: dict[str, list[int]], schedule_id: int, year: int,
+                        team_id: int) -> Iterator[dict[str, Any]]:
+        """
+        Generates the team and player statistics of a team in a game.
+        :param roster: Player IDs by Position Code
+        :param schedule_id: Schedule ID
+        :param year: Year of the Schedule
+        :param team_id: Team ID
+        :return: Statistic Rows
+        """
+
+        for code in self.reference['codes']['TEAM']:
+            yield self._statistic(schedule_id, code, 1.0, year_value=year, team_id=team_id)
+
+        for position, participants in PARTICIPANTS.items():
+            for depth, player_id in enumerate(roster[position][:participants]):
+                # Starters record the mean, reserves progressively less.
+                share = 1.0 / (depth + 1)
+                for category in POSITION_CATEGORIES[position]:
+                    for code in self.reference['codes'][category]:
+                        yield self._statistic(schedule_id, code, share, year_value=year,
+                                              player_id=player_id)
+
+    def _statistic(self, schedule_id: int, code: tuple[int, int, float, float], share: float,
+                   **columns: int) -> dict[str, Any]:
+        code_id, category_id, mean, deviation = code
+        value = max(0, round(self.rng.gauss(mean * share, deviation * share)))
+        return {'id': self.next_id(Statistic), 'schedule_id': schedule_id,
+                'statistic_code_id': code_id, 'category_id': category_id, 'value': float(value),
+                'player_id': columns.get('player_id'), 'team_id': columns.get('team_id'),
+                'year_value': columns['year_value']}
+
+
+def _stamp(rows: list[dict[str, Any]], year: int, week: int) -> None:
+    updated_at = datetime(year, 9, 1) + timedelta(weeks=week - 1)
+    for row in rows:
+        row['updated_at'] = updated_at
@@ -0,0 +1,350 @@
+"""
+Game Level Ingest for writing a complete game in a single transaction, and claims on games
+for concurrent ingest workers.
+"""
+
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Iterator
+
+from sqlalchemy import select, delete, func, insert, or_, Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from football_data.models import GameLock, Player, Schedule, Statistic, Team, TeamStaff, utcnow
+from football_data.repositories import BaseRepository, bound_engine
+
+
+@dataclass
+class GameTeam:
+    """
+    Team participating in a Game.
+    """
+
+    url: str
+    code: str
+    name: str
+
+
+@dataclass
+class GamePlayer:
+    """
+    Player appearing in a Game for a Team.
+    """
+
+    url: str
+    name: str
+    team_url: str
+    position_id: int | None = None
+
+
+@dataclass
+class GameStatistic:
+    """
+    Statistic recorded in a Game. Team Statistics omit the Player Url.
+    """
+
+    statistic_code_id: int
+    category_id: int
+    value: float
+    team_url: str
+    player_url: str | None = None
+
+
+@dataclass
+class GamePayload:
+    """
+    Structured content of a single Game.
+    """
+
+    game_id: int
+    year_value: int
+    week_number: int
+    type_id: int
+    url: str
+    home: GameTeam
+    away: GameTeam
+    players: list[GamePlayer] = field(default_factory=list)
+    statistics: list[GameStatistic] = field(default_factory=list)
+
+
+@dataclass
+class GameIngestResult:
+    """
+    Outcome of a Game Ingest.
+    """
+
+    home_schedule_id: int
+    away_schedule_id: int
+    teams_created: int = 0
+    players_created: int = 0
+    staff_created: int = 0
+    schedules_created: int = 0
+    statistics_created: int = 0
+
+
+class GameRepository(BaseRepository):
+    """
+    Repository for ingesting a complete Game.
+    """
+
+    def ingest_game(self, payload: GamePayload) -> GameIngestResult:
+        """
+        Writes a Game with its Teams, Players, Team Staff, Schedule entries and Statistics
+        in one transaction. Existing rows are resolved by natural key in bulk and reused.
+        :param payload: Game Payload
+        :return: Game Ingest Result
+        :raises ValueError: A Player or Statistic refers to a Team or Player not in the payload
+        """
+
+        self._validate(payload)
+        with self._session() as session:
+            session.begin()
+            teams, teams_created = self._resolve_teams(session, payload)
+            players, players_created = self._resolve_players(session, payload)
+            staff_created = self._resolve_staff(session, payload, teams, players)
+            schedules, schedules_created = self._resolve_schedules(session, payload, teams)
+            statistics_created = self._insert_statistics(session, payload, teams, players,
+                                                         schedules)
+            session.commit()
+
+        return GameIngestResult(
+            home_schedule_id=schedules[teams[payload.home.url]],
+            away_schedule_id=schedules[teams[payload.away.url]],
+            teams_created=teams_created,
+            players_created=players_created,
+            staff_created=staff_created,
+            schedules_created=schedules_created,
+            statistics_created=statistics_created)
+
+    @staticmethod
+    def _validate(payload: GamePayload) -> None:
+        team_urls = {payload.home.url, payload.away.url}
+        player_urls = {player.url for player in payload.players}
+        for player in payload.players:
+            if player.team_url not in team_urls:
+                raise ValueError(f'Player {player.url} of game {payload.game_id} plays for '
+                                 f'{player.team_url}, which is not a team of the game')
+        for item in payload.statistics:
+            if item.team_url not in team_urls:
+                raise ValueError(f'Statistic {item.statistic_code_id} of game {payload.game_id} '
+                                 f'refers to {item.team_url}, which is not a team of the game')
+            if item.player_url and item.player_url not in player_urls:
+                raise ValueError(f'Statistic {item.statistic_code_id} of game {payload.game_id} '
+                                 f'refers to player {item.player_url}, which is not in the '
+                                 f'players of the game')
+
+    @staticmethod
+    def _resolve_teams(session: Session, payload: GamePayload) -> tuple[dict[str, int], int]:
+        game_teams = {team.url: team for team in (payload.home, payload.away)}
+        existing = session.scalars(select(Team).where(Team.url.in_(game_teams))).all()
+        teams = {team.url: team for team in existing}
+
+        created = [Team(url=item.url, code=item.code, name=item.name)
+                   for url, item in game_teams.items() if url not in teams]
+        if created:
+            session.add_all(created)
+            session.flush()
+            teams.update({team.url: team for team in created})
+        return {url: team.id for url, team in teams.items()}, len(created)
+
+    @staticmethod
+    def _resolve_players(session: Session, payload: GamePayload) -> tuple[dict[str, int], int]:
+        game_players = {player.url: player for player in payload.players}
+        if not game_players:
+            return {}, 0
+
+        existing = session.execute(
+            select(Player.url, Player.id).where(Player.url.in_(game_players)))
+        players: dict[str, int] = dict(existing.tuples().all())
+
+        created = [Player(url=item.url, name=item.name, position_id=item.position_id)
+                   for url, item in game_players.items() if url not in players]
+        if created:
+            session.add_all(created)
+            session.flush()
+            players.update({player.url: player.id for player in created})
+        return players, len(created)
+
+    @staticmethod
+    def _resolve_staff(session: Session, payload: GamePayload, teams: dict[str, int],
+                       players: dict[str, int]) -> int:
+        entries = {(players[item.url], teams[item.team_url]) for item in payload.players}
+        if not entries:
+            return 0
+
+        existing = set(session.execute(
+            select(TeamStaff.player_id, TeamStaff.team_id).where(
+                TeamStaff.year_value == payload.year_value,
+                TeamStaff.player_id.in_({player_id for player_id, _ in entries}))).all())
+
+        created = [{'player_id': player_id, 'team_id': team_id, 'year_value': payload.year_value}
+                   for player_id, team_id in entries - existing]
+        if created:
+            session.execute(insert(TeamStaff.__table__), created)
+        return len(created)
+
+    @staticmethod
+    def _resolve_schedules(session: Session, payload: GamePayload,
+                           teams: dict[str, int]) -> tuple[dict[int, int], int]:
+        home_id = teams[payload.home.url]
+        away_id = teams[payload.away.url]
+
+        existing = session.execute(
+            select(Schedule.team_id, Schedule.id).where(
+                Schedule.game_id == payload.game_id,
+                Schedule.team_id.in_([home_id, away_id])))
+        schedules: dict[int, int] = dict(existing.tuples().all())
+
+        created = [Schedule(team_id=team_id, opponent_id=opponent_id,
+                            year_value=payload.year_value, week_number=payload.week_number,
+                            game_id=payload.game_id, url=payload.url, type_id=payload.type_id,
+                            is_home=is_home)
+                   for team_id, opponent_id, is_home in ((home_id, away_id, True),
+                                                         (away_id, home_id, False))
+                   if team_id not in schedules]
+        if created:
+            session.add_all(created)
+            session.flush()
+            schedules.update({schedule.team_id: schedule.id for schedule in created})
+        return schedules, len(created)
+
+    @staticmethod
+    def _insert_statistics(session: Session, payload: GamePayload, teams: dict[str, int],
+                           players: dict[str, int], schedules: dict[int, int]) -> int:
+        if not payload.statistics:
+            return 0
+
+        existing = set(session.execute(
+            select(Statistic.schedule_id, Statistic.statistic_code_id, Statistic.category_id,
+                   Statistic.player_id, Statistic.team_id).where(
+                or_(Statistic.year_value == payload.year_value, Statistic.year_value.is_(None)),
+                Statistic.schedule_id.in_(schedules.values()))).all())
+
+        rows = []
+        for item in payload.statistics:
+            player_id = players[item.player_url] if item.player_url else None
+            team_id = None if player_id else teams[item.team_url]
+            row = {
+                'schedule_id': schedules[teams[item.team_url]],
+                'statistic_code_id': item.statistic_code_id,
+                'category_id': item.category_id,
+                'player_id': player_id,
+                'team_id': team_id,
+                'year_value': payload.year_value,
+                'value': item.value
+            }
+            key = (row['schedule_id'], row['statistic_code_id'], row['category_id'], player_id,
+                   team_id)
+            if key not in existing:
+                existing.add(key)
+                rows.append(row)
+
+        if rows:
+            session.execute(insert(Statistic.__table__), rows)
+        return len(rows)
+
+
+class GameLockRepository(BaseRepository):
+    """
+    Repository for claiming a Game so only one worker ingests it at a time. PostgreSQL uses
+    session level advisory locks keyed on the Game ID, other databases use the Game Lock table.
+    """
+
+    owner: str | None
+    stale_after: float
+
+    def __init__(self, maker: sessionmaker, owner: str | None = None,
+                 stale_after: float = 3600.0):
+        """
+        Creates a new instance of the Game Lock Repository.
+        :param maker: SQL Alchemy Session Maker
+        :param owner: Name of the claiming worker, defaults to host, process and the thread
+            claiming the Game
+        :param stale_after: Seconds after which a Game Lock row is considered abandoned
+        """
+
+        super().__init__(maker)
+        self.owner = owner
+        self.stale_after = stale_after
+        self._connections: dict[int, Connection] = {}
+
+    @contextmanager
+    def claim_game(self, game_id: int, wait: bool = False,
+                   timeout: float = 30.0) -> Iterator[bool]:
+        """
+        Claims a Game for the duration of the context.
+        :param game_id: Game ID
+        :param wait: Wait for the current holder to release the claim
+        :param timeout: Maximum seconds to wait for the claim
+        :return: True when the claim was acquired, False when another worker holds it
+        """
+
+        engine = bound_engine(self.maker)
+        owner = self.owner or f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while not (claimed := self._acquire(engine, game_id, owner)) and wait \
+                and time.monotonic() < deadline:
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, 1.0)
+
+        try:
+            yield claimed
+        finally:
+            if claimed:
+                self._release(engine, game_id, owner)
+
+    def _acquire(self, engine: Engine, game_id: int, owner: str) -> bool:
+        if engine.dialect.name == 'postgresql':
+            return self._acquire_advisory(engine, game_id)
+
+        for _ in range(2):
+            try:
+                self.save(GameLock(game_id=game_id, owner=owner, claimed_at=utcnow()))
+                return True
+            except IntegrityError:
+                if not self._expire_stale(game_id):
+                    return False
+        return False
+
+    def _expire_stale(self, game_id: int) -> bool:
+        expiry = utcnow() - timedelta(seconds=self.stale_after)
+        with self._session() as session:
+            session.begin()
+            result = session.execute(delete(GameLock).where(GameLock.game_id == game_id,
+                                                            GameLock.claimed_at < expiry))
+            session.commit()
+            return result.rowcount > 0
+
+    def _release(self, engine: Engine, game_id: int, owner: str) -> None:
+        if engine.dialect.name == 'postgresql':
+            self._release_advisory(game_id)
+            return
+
+        with self._session() as session:
+            session.begin()
+            session.execute(delete(GameLock).where(GameLock.game_id == game_id,
+                                                   GameLock.owner == owner))
+            session.commit()
+
+    def _acquire_advisory(self, engine: Engine, game_id: int) -> bool:
+        connection = engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        claimed = connection.scalar(select(func.pg_try_advisory_lock(game_id)))
+        if claimed:
+            self._connections[game_id] = connection
+        else:
+            connection.close()
+        return bool(claimed)
+
+    def _release_advisory(self, game_id: int) -> None:
+        connection = self._connections.pop(game_id)
+        try:
+            connection.scalar(select(func.pg_advisory_unlock(game_id)))
+        finally:
+            connection.close()
@@ -0,0 +1,296 @@
+"""
+Opt-in Instrumentation of Repository Methods.
+"""
+
+import inspect
+import threading
+from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from functools import wraps
+from typing import Any, Callable, Generator, Iterator, Self
+
+from sqlalchemy import event, Engine
+from sqlalchemy.orm import Session
+
+from football_data.models import Base
+from football_data.repositories import BaseRepository, ChangeBatch, bound_engine
+
+# Repository method currently executing, as Repository.method.
+current_call: ContextVar[str | None] = ContextVar('current_call', default=None)
+
+METRIC_PREFIX = 'football_data_repository'
+
+_METRICS = [
+    ('calls', 'calls_total', 'counter', 'Repository method calls.'),
+    ('errors', 'errors_total', 'counter', 'Repository method calls raising an exception.'),
+    ('wall_time', 'seconds_total', 'counter', 'Wall time spent in repository methods.'),
+    ('statements', 'statements_total', 'counter', 'SQL statements executed by repository methods.'),
+    ('rows', 'rows_total', 'counter', 'Rows returned by repository methods.'),
+    ('sessions_opened', 'sessions_opened_total', 'counter',
+     'Sessions opened by repository methods.'),
+    ('sessions_closed', 'sessions_closed_total', 'counter',
+     'Sessions closed by repository methods.')
+]
+
+
+@dataclass
+class MethodMetrics:
+    """
+    Metrics for a single Repository Method.
+    """
+
+    calls: int = 0
+    errors: int = 0
+    wall_time: float = 0.0
+    statements: int = 0
+    rows: int = 0
+    sessions_opened: int = 0
+    sessions_closed: int = 0
+
+
+def count_rows(result: Any) -> int:
+    """
+    Counts the rows represented by the return value of a repository method.
+    :param result: Return Value
+    :return: Row Count
+    """
+
+    if isinstance(result, bool):
+        return int(result)
+    if isinstance(result, Base):
+        return 1
+    if isinstance(result, ChangeBatch):
+        return len(result.items)
+    if isinstance(result, dict):
+        return sum(count_rows(value) for value in result.values())
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 0
+
+
+def public_methods(repository: BaseRepository) -> list[str]:
+    """
+    Returns the names of the public methods of a repository.
+    :param repository: Repository
+    :return: List of Method Names
+    """
+
+    return [name for name, member in inspect.getmembers(type(repository), inspect.isfunction)
+            if not name.startswith('_')]
+
+
+class RepositoryInstrument(ABC):
+    """
+    Base class for instruments wrapping the public methods of repository instances.
+    """
+
+    def __init__(self):
+        """
+        Creates a new instance of the Repository Instrument.
+        """
+        self._lock = threading.Lock()
+        self._repositories: list[tuple[BaseRepository, list[str]]] = []
+
+    def instrument(self, *repositories: BaseRepository) -> None:
+        """
+        Starts instrumenting the repositories.
+        :param repositories: Repositories to instrument
+        :return: None
+        """
+
+        for repository in repositories:
+            names = public_methods(repository)
+            for name in names:
+                setattr(repository, name, self._wrap(repository, name, getattr(repository, name)))
+            self._repositories.append((repository, names + self._attach(repository)))
+
+    def uninstrument(self) -> None:
+        """
+        Stops instrumenting all instrumented repositories.
+        :return: None
+        """
+
+        for repository, names in self._repositories:
+            for name in names:
+                delattr(repository, name)
+        self._repositories = []
+        self._detach()
+
+    @contextmanager
+    def instrumented(self, *repositories: BaseRepository) -> Iterator[Self]:
+        """
+        Instruments the repositories within the context.
+        :param repositories: Repositories to instrument
+        :return: Repository Instrument
+        """
+
+        self.instrument(*repositories)
+        try:
+            yield self
+        finally:
+            self.uninstrument()
+
+    def _attach(self, _repository: BaseRepository) -> list[str]:
+        """
+        Sets up additional instrumentation for a repository.
+        :return: Names of further attributes set on the repository
+        """
+        return []
+
+    def _detach(self) -> None:
+        """
+        Removes the additional instrumentation.
+        :return: None
+        """
+
+    @abstractmethod
+    def _wrap(self, repository: BaseRepository, name: str,
+              method: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wraps a public method of a repository.
+        :param repository: Repository
+        :param name: Method Name
+        :param method: Bound Method
+        :return: Wrapped Method
+        """
+
+
+class RepositoryMetrics(RepositoryInstrument):
+    """
+    Collects call counts, wall time, statement counts, rows returned and session counts for
+    each method of the instrumented repositories. Methods returning generators, such as the
+    change feeds, are measured while the generator is consumed.
+    """
+
+    metrics: dict[str, MethodMetrics]
+
+    def __init__(self):
+        """
+        Creates a new instance of the Repository Metrics.
+        """
+        super().__init__()
+        self.metrics = {}
+        self._engines: list[Engine] = []
+
+    def reset(self) -> None:
+        """
+        Clears the collected metrics.
+        :return: None
+        """
+        with self._lock:
+            self.metrics = {}
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """
+        Returns a copy of the collected metrics keyed by Repository.method.
+        :return: Dictionary of Metrics
+        """
+        with self._lock:
+            return {key: asdict(value) for key, value in sorted(self.metrics.items())}
+
+    def to_prometheus(self) -> str:
+        """
+        Returns the collected metrics in the Prometheus text exposition format.
+        :return: Metrics Text
+        """
+
+        snapshot = self.snapshot()
+        lines = []
+        for field, suffix, kind, description in _METRICS:
+            name = f'{METRIC_PREFIX}_{suffix}'
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, values in snapshot.items():
+                repository, method = key.split('.', 1)
+                lines.append(f'{name}{{repository="{repository}",method="{method}"}} '
+                             f'{values[field]}')
+        return '\n'.join(lines) + '\n'
+
+    def _attach(self, repository: BaseRepository) -> list[str]:
+        engine = bound_engine(repository.maker)
+        if engine not in self._engines:
+            event.listen(engine, 'before_cursor_execute', self._count_statement)
+            self._engines.append(engine)
+        # pylint: disable=protected-access
+        setattr(repository, '_session', self._wrap_session(repository._session))
+        return ['_session']
+
+    def _detach(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._count_statement)
+        self._engines = []
+
+    def _record(self, key: str, **values: float) -> None:
+        with self._lock:
+            metrics = self.metrics.setdefault(key, MethodMetrics())
+            for name, value in values.items():
+                setattr(metrics, name, getattr(metrics, name) + value)
+
+    def _count_statement(self, *_args) -> None:
+        key = current_call.get()
+        if key:
+            self._record(key, statements=1)
+
+    def _wrap(self, repository: BaseRepository, name: str,
+              method: Callable[..., Any]) -> Callable[..., Any]:
+        key = f'{type(repository).__name__}.{name}'
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            token = current_call.set(key)
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                self._record(key, calls=1, errors=1, wall_time=time.perf_counter() - start)
+                raise
+            finally:
+                current_call.reset(token)
+            if inspect.isgenerator(result):
+                self._record(key, calls=1, wall_time=time.perf_counter() - start)
+                return self._consume(key, result)
+            self._record(key, calls=1, wall_time=time.perf_counter() - start,
+                         rows=count_rows(result))
+            return result
+
+        return wrapper
+
+    def _consume(self, key: str, generator: Generator) -> Iterator[Any]:
+        try:
+            while True:
+                # The call is current only while the generator runs, not while the caller does.
+                token = current_call.set(key)
+                start = time.perf_counter()
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    self._record(key, wall_time=time.perf_counter() - start)
+                    return
+                except Exception:
+                    self._record(key, errors=1, wall_time=time.perf_counter() - start)
+                    raise
+                finally:
+                    current_call.reset(token)
+                self._record(key, wall_time=time.perf_counter() - start, rows=count_rows(item))
+                yield item
+        finally:
+            generator.close()
+
+    def _wrap_session(self, open_session: Callable[[], Any]) -> Callable[[], Any]:
+
+        @contextmanager
+        def wrapper() -> Iterator[Session]:
+            key = current_call.get()
+            if key:
+                self._record(key, sessions_opened=1)
+            try:
+                with open_session() as session:
+                    yield session
+            finally:
+                if key:
+                    self._record(key, sessions_closed=1)
+
+        return wrapper
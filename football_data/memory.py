@@ -0,0 +1,177 @@
+"""
+Memory Footprint Reporting for Repository Calls.
+"""
+
+import threading
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, asdict
+from functools import wraps
+from typing import Any, Callable
+
+from football_data.instrumentation import RepositoryInstrument, count_rows
+from football_data.models import Base
+from football_data.repositories import BaseRepository
+
+
+@dataclass
+class CallMemory:
+    """
+    Memory figures for a single Repository Method.
+    """
+
+    calls: int = 0
+    rows: int = 0
+    peak: int = 0
+    max_peak: int = 0
+    retained: int = 0
+
+
+@dataclass
+class ModelMemory:
+    """
+    Retained memory of the rows returned for a Model.
+    """
+
+    rows: int = 0
+    retained: int = 0
+
+    @property
+    def bytes_per_row(self) -> float:
+        """
+        Average retained bytes per returned row.
+        :return: Bytes per Row
+        """
+        return self.retained / self.rows if self.rows else 0.0
+
+
+def count_models(result: Any) -> Counter:
+    """
+    Counts the models returned by a repository method by model name.
+    :param result: Return Value
+    :return: Counter of model name to rows
+    """
+
+    counts: Counter = Counter()
+    if isinstance(result, Base):
+        counts[type(result).__name__] += 1
+    elif isinstance(result, dict):
+        for value in result.values():
+            counts.update(count_models(value))
+    elif isinstance(result, (list, tuple)):
+        for item in result:
+            counts.update(count_models(item))
+    return counts
+
+
+class MemoryReport(RepositoryInstrument):
+    """
+    Records the peak and retained memory of each call to the instrumented repositories with
+    tracemalloc, and the retained bytes per returned row for each model. Peak memory is the
+    highest allocation during the call, retained memory is what is still allocated when the call
+    returns, mostly the returned result. Allocations are traced process wide, so calls should be
+    measured from a single thread.
+    """
+
+    methods: dict[str, CallMemory]
+    models: dict[str, ModelMemory]
+
+    def __init__(self):
+        """
+        Creates a new instance of the Memory Report.
+        """
+        super().__init__()
+        self.methods = {}
+        self.models = {}
+        self._local = threading.local()
+        self._started = False
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        """
+        Returns a copy of the recorded figures by Repository.method and by model.
+        :return: Dictionary of Figures
+        """
+
+        with self._lock:
+            return {
+                'methods': {key: asdict(value) for key, value in sorted(self.methods.items())},
+                'models': {key: {'rows': value.rows, 'retained': value.retained,
+                                 'bytes_per_row': value.bytes_per_row}
+                           for key, value in sorted(self.models.items())}
+            }
+
+    def format(self) -> str:
+        """
+        Returns the recorded figures as a text table.
+        :return: Report Text
+        """
+
+        snapshot = self.snapshot()
+        lines = [f'{"method":<48} {"calls":>6} {"rows":>8} {"max peak":>12} {"retained":>12}']
+        for key, values in snapshot['methods'].items():
+            lines.append(f'{key:<48} {values["calls"]:6d} {values["rows"]:8d} '
+                         f'{values["max_peak"]:12d} {values["retained"]:12d}')
+        lines.append('')
+        lines.append(f'{"model":<48} {"rows":>8} {"retained":>12} {"bytes/row":>12}')
+        for key, values in snapshot['models'].items():
+            lines.append(f'{key:<48} {values["rows"]:8d} {values["retained"]:12d} '
+                         f'{values["bytes_per_row"]:12.1f}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """
+        Clears the recorded figures.
+        :return: None
+        """
+        with self._lock:
+            self.methods = {}
+            self.models = {}
+
+    def _attach(self, _repository: BaseRepository) -> list[str]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        return []
+
+    def _detach(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def _record(self, key: str, result: Any, peak: int, retained: int) -> None:
+        rows = count_rows(result)
+        models = count_models(result)
+        total = sum(models.values())
+        with self._lock:
+            method = self.methods.setdefault(key, CallMemory())
+            method.calls += 1
+            method.rows += rows
+            method.peak += peak
+            method.max_peak = max(method.max_peak, peak)
+            method.retained += retained
+            for name, count in models.items():
+                model = self.models.setdefault(name, ModelMemory())
+                model.rows += count
+                model.retained += retained * count // total
+
+    def _wrap(self, repository: BaseRepository, name: str,
+              method: Callable[..., Any]) -> Callable[..., Any]:
+        key = f'{type(repository).__name__}.{name}'
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if getattr(self._local, 'active', False):
+                return method(*args, **kwargs)
+
+            self._local.active = True
+            try:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                result = method(*args, **kwargs)
+                after, peak = tracemalloc.get_traced_memory()
+            finally:
+                self._local.active = False
+            self._record(key, result, max(peak - before, 0), max(after - before, 0))
+            return result
+
+        return wrapper
@@ -2,10 +2,12 @@
 Football Data Models.
 """
 
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Optional
 
-from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass, Mapped, mapped_column
-from sqlalchemy.types import BigInteger, String, Integer, REAL
+from sqlalchemy import event, select
+from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass, Mapped, Session, mapped_column
+from sqlalchemy.types import BigInteger, String, Integer, REAL, DateTime
 
 
 class Base(MappedAsDataclass, DeclarativeBase):
@@ -14,6 +16,14 @@ class Base(MappedAsDataclass, DeclarativeBase):
     """
 
 
+def utcnow() -> datetime:
+    """
+    Returns the current time in UTC without a time zone, the value of the updated at columns.
+    :return: Datetime
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Player(Base):
     """
     Player Data Model Class
@@ -24,9 +34,12 @@ class Player(Base):
     url: Mapped[str] = mapped_column(String(255))
     name: Mapped[str] = mapped_column(String(500))
     position_id: Mapped[Optional[int]] = mapped_column(BigInteger, default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'),
                                               primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class Position(Base):
@@ -38,8 +51,11 @@ class Position(Base):
 
     code: Mapped[str] = mapped_column(String(5))
     description: Mapped[str] = mapped_column(String(50))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(Integer, primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class Schedule(Base):
@@ -57,9 +73,12 @@ class Schedule(Base):
     url: Mapped[str] = mapped_column(String(255))
     type_id: Mapped[int]
     is_home: Mapped[bool]
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'),
                                               primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class StatisticCategory(Base):
@@ -71,8 +90,11 @@ class StatisticCategory(Base):
 
     code: Mapped[str] = mapped_column(String(10))
     description: Mapped[str] = mapped_column(String(50))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(Integer, primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class StatisticCode(Base):
@@ -85,9 +107,12 @@ class StatisticCode(Base):
     code: Mapped[str] = mapped_column(String(15))
     description: Mapped[str] = mapped_column(String(100))
     grouping: Mapped[Optional[str]] = mapped_column(String(100), default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'),
                                               primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class Statistic(Base):
@@ -103,9 +128,13 @@ class Statistic(Base):
     category_id: Mapped[int]
     player_id: Mapped[Optional[int]] = mapped_column(BigInteger, default=None)
     team_id: Mapped[Optional[int]] = mapped_column(Integer, default=None)
+    year_value: Mapped[Optional[int]] = mapped_column(Integer, default=None)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'),
                                               primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class Team(Base):
@@ -118,8 +147,11 @@ class Team(Base):
     url: Mapped[str] = mapped_column(String(255))
     code: Mapped[str] = mapped_column(String(5))
     name: Mapped[str] = mapped_column(String(100))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(Integer, primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class TypeCode(Base):
@@ -131,8 +163,11 @@ class TypeCode(Base):
 
     code: Mapped[str] = mapped_column(String(10))
     description: Mapped[str] = mapped_column(String(50))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, insert_default=utcnow,
+                                                           onupdate=utcnow, nullable=False,
+                                                           index=True, default=None)
     id: Mapped[Optional[int]] = mapped_column(Integer, primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class TeamStaff(Base):
@@ -147,7 +182,7 @@ class TeamStaff(Base):
     year_value: Mapped[int] = mapped_column(Integer)
     id: Mapped[Optional[int]] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'),
                                               primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
 
 
 class League(Base):
@@ -159,7 +194,8 @@ class League(Base):
 
     code: Mapped[str] = mapped_column(String(10))
     description: Mapped[str] = mapped_column(String(100))
-    id: Mapped[Optional[int]] = mapped_column(Integer, primary_key=True, default=None)
+    id: Mapped[Optional[int]] = mapped_column(Integer, primary_key=True, nullable=False,
+                                              default=None)
 
 
 class TeamLeague(Base):
@@ -174,4 +210,41 @@ class TeamLeague(Base):
     year_value: Mapped[int] = mapped_column(Integer)
     id: Mapped[Optional[int]] = mapped_column(BigInteger().with_variant(Integer, 'sqlite'),
                                               primary_key=True, autoincrement=True,
-                                              default=None)
+                                              nullable=False, default=None)
+
+
+class GameLock(Base):
+    """
+    Data Model for a claim on a Game by an ingest worker.
+    """
+
+    __tablename__ = 'game_locks'
+
+    game_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    owner: Mapped[str] = mapped_column(String(255))
+    claimed_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+@event.listens_for(Session, 'before_flush')
+def _assign_statistic_years(session: Session, _context: Any, _instances: Any) -> None:
+    """
+    Sets the year of new Statistics without one from their Schedules before every flush, so all
+    ORM inserts, not only those of the StatisticRepository, carry the partition key.
+    :param session: Session being flushed
+    :return: None
+    """
+
+    missing = [item for item in session.new if isinstance(item, Statistic)
+               and item.year_value is None and item.schedule_id is not None]
+    if not missing:
+        return
+
+    years = {item.id: item.year_value for item in session.new
+             if isinstance(item, Schedule) and item.id is not None}
+    unknown = {item.schedule_id for item in missing} - set(years)
+    if unknown:
+        with session.no_autoflush:
+            years.update(session.execute(select(Schedule.id, Schedule.year_value).where(
+                Schedule.id.in_(unknown))).tuples().all())
+    for item in missing:
+        item.year_value = years.get(item.schedule_id)
@@ -0,0 +1,155 @@
+"""
+N+1 Query Detection for the Repository Engine.
+"""
+
+import contextlib
+import os
+import re
+import threading
+import traceback
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+import sqlalchemy
+from sqlalchemy import event, Connection, Engine
+from sqlalchemy.orm import sessionmaker
+
+import football_data
+from football_data.exceptions import NPlusOneError, NPlusOneWarning
+from football_data.instrumentation import current_call
+from football_data.repositories import bound_engine
+
+# Frames inside these directories are not reported as call sites.
+_LIBRARY_PATHS = (os.path.dirname(sqlalchemy.__file__), os.path.dirname(football_data.__file__),
+                  contextlib.__file__)
+
+_WHERE_CLAUSE = re.compile(r'\bWHERE\b', re.IGNORECASE)
+_IN_CLAUSE = re.compile(r'\bIN\s*\(', re.IGNORECASE)
+
+
+@dataclass
+class RepeatedQuery:
+    """
+    Single row lookup issued repeatedly within a detection scope.
+    """
+
+    statement: str
+    count: int = 0
+    calls: set[str] = field(default_factory=set)
+    call_sites: dict[str, int] = field(default_factory=dict)
+
+    def describe(self) -> str:
+        """
+        Describes the repeated query with its call sites.
+        :return: Description
+        """
+
+        calls = ', '.join(sorted(self.calls)) or 'unknown call'
+        sites = '\n'.join(f'  {site} ({count}x)' for site, count in self.call_sites.items())
+        return f'{self.count} executions of {calls}: {self.statement}\n{sites}'
+
+
+class NPlusOneDetector:
+    """
+    Watches the statements issued within a scope and flags single row lookups that are
+    repeated with the same SQL more often than a threshold, the shape of a loop calling
+    get_player(id=...) once per row instead of loading the rows in one query.
+    """
+
+    threshold: int
+    action: str
+    queries: dict[str, RepeatedQuery]
+
+    def __init__(self, threshold: int = 5, action: str = 'raise'):
+        """
+        Creates a new instance of the N+1 Detector.
+        :param threshold: Number of executions of the same lookup allowed within a scope
+        :param action: raise to raise an NPlusOneError, warn to issue an NPlusOneWarning
+        """
+
+        if action not in ('raise', 'warn'):
+            raise ValueError(f'Unknown action {action}')
+        self.threshold = threshold
+        self.action = action
+        self.queries = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def watch(self, *targets: Engine | sessionmaker) -> Iterator['NPlusOneDetector']:
+        """
+        Watches the statements of the Engines or Session Makers within the context and reports
+        the repeated lookups when the context exits.
+        :param targets: Engines or Session Makers
+        :return: N+1 Detector
+        """
+
+        engines = []
+        for target in targets:
+            engine = target if isinstance(target, Engine) else bound_engine(target)
+            if engine not in engines:
+                event.listen(engine, 'before_cursor_execute', self._record)
+                engines.append(engine)
+        self.reset()
+        try:
+            yield self
+        finally:
+            for engine in engines:
+                event.remove(engine, 'before_cursor_execute', self._record)
+        self.check()
+
+    def reset(self) -> None:
+        """
+        Clears the recorded statements.
+        :return: None
+        """
+        with self._lock:
+            self.queries = {}
+
+    def violations(self) -> list[RepeatedQuery]:
+        """
+        Returns the lookups repeated more often than the threshold.
+        :return: List of Repeated Queries
+        """
+        with self._lock:
+            return [query for query in self.queries.values() if query.count > self.threshold]
+
+    def check(self) -> None:
+        """
+        Raises or warns when lookups were repeated more often than the threshold.
+        :return: None
+        """
+
+        violations = self.violations()
+        if not violations:
+            return
+        message = 'Possible N+1 queries detected:\n' + '\n'.join(
+            query.describe() for query in violations)
+        if self.action == 'raise':
+            raise NPlusOneError(message)
+        warnings.warn(message, NPlusOneWarning, stacklevel=3)
+
+    def _record(self, _conn: Connection, _cursor: Any, statement: str, _parameters: Any,
+                _context: Any, executemany: bool) -> None:
+        if executemany or not _is_lookup(statement):
+            return
+        site = _call_site()
+        call = current_call.get()
+        with self._lock:
+            query = self.queries.setdefault(statement, RepeatedQuery(statement=statement))
+            query.count += 1
+            if call:
+                query.calls.add(call)
+            query.call_sites[site] = query.call_sites.get(site, 0) + 1
+
+
+def _is_lookup(statement: str) -> bool:
+    return (statement.lstrip().upper().startswith('SELECT')
+            and bool(_WHERE_CLAUSE.search(statement)) and not _IN_CLAUSE.search(statement))
+
+
+def _call_site() -> str:
+    for frame in reversed(traceback.extract_stack()):
+        if not frame.filename.startswith(_LIBRARY_PATHS):
+            return f'{frame.filename}:{frame.lineno} in {frame.name}'
+    return 'unknown'
@@ -0,0 +1,164 @@
+"""
+PostgreSQL Partitioning of the Statistics and Schedule Tables by Season.
+"""
+
+from sqlalchemy import inspect, text, update, Column, Engine, Index, MetaData, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.types import DateTime, Integer
+
+from football_data.models import Base, Schedule, Statistic, utcnow
+
+# Column holding the season of each partitioned table.
+PARTITION_KEY = 'year_value'
+
+PARTITIONED_MODELS: list[type[Base]] = [Schedule, Statistic]
+
+
+def partition_name(model: type[Base], year: int | None = None) -> str:
+    """
+    Returns the name of the partition of a season, or of the default partition.
+    :param model: Partitioned Model Class
+    :param year: Season Year, None for the default partition
+    :return: Table Name
+    """
+    suffix = 'default' if year is None else str(int(year))
+    return f'{model.__tablename__}_{suffix}'
+
+
+def partitioned_table_ddl(model: type[Base]) -> list[str]:
+    """
+    Returns the statements creating a table partitioned by range of the season and its indexes,
+    with a default partition for rows of seasons without their own partition. The partition key
+    is added to the primary key, as PostgreSQL requires for unique constraints on partitioned
+    tables. Indexes of the partitioned table are created on each partition.
+    :param model: Partitioned Model Class
+    :return: List of SQL Statements
+    """
+
+    source = model.__table__
+    columns = []
+    for column in source.columns:
+        key = column.name == PARTITION_KEY
+        columns.append(Column(column.name, column.type, primary_key=column.primary_key or key,
+                              nullable=not (column.primary_key or key) and column.nullable,
+                              autoincrement=column.primary_key and not key))
+    table = Table(source.name, MetaData(), *columns,
+                  postgresql_partition_by=f'RANGE ({PARTITION_KEY})')
+    indexes = [Index(index.name, *(table.c[column.name] for column in index.columns),
+                     unique=index.unique)
+               for index in sorted(source.indexes, key=lambda item: item.name)]
+    return [str(CreateTable(table).compile(dialect=postgresql.dialect())).strip(),
+            *(str(CreateIndex(index).compile(dialect=postgresql.dialect())) for index in indexes),
+            f'CREATE TABLE IF NOT EXISTS {partition_name(model)} '
+            f'PARTITION OF {source.name} DEFAULT']
+
+
+def partition_ddl(model: type[Base], year: int) -> str:
+    """
+    Returns the statement creating the partition of a season.
+    :param model: Partitioned Model Class
+    :param year: Season Year
+    :return: SQL Statement
+    """
+
+    year = int(year)
+    return (f'CREATE TABLE IF NOT EXISTS {partition_name(model, year)} PARTITION OF '
+            f'{model.__tablename__} FOR VALUES FROM ({year}) TO ({year + 1})')
+
+
+def create_partitioned_tables(engine: Engine, years: list[int] | None = None) -> None:
+    """
+    Creates the schedule and statistics tables partitioned by season with a partition for each
+    year. On other databases than PostgreSQL the tables are created without partitions.
+    :param engine: Engine
+    :param years: Season Years to create partitions for
+    :return: None
+    """
+
+    if engine.dialect.name != 'postgresql':
+        Base.metadata.create_all(bind=engine,
+                                 tables=[model.__table__ for model in PARTITIONED_MODELS])
+        return
+
+    existing = set(inspect(engine).get_table_names())
+    with engine.begin() as connection:
+        for model in PARTITIONED_MODELS:
+            if model.__tablename__ not in existing:
+                for statement in partitioned_table_ddl(model):
+                    connection.exec_driver_sql(statement)
+    create_partitions(engine, years or [])
+
+
+def create_partitions(engine: Engine, years: list[int]) -> list[str]:
+    """
+    Creates the missing partitions of seasons, for example before loading a new season. Does
+    nothing on other databases than PostgreSQL.
+    :param engine: Engine
+    :param years: Season Years
+    :return: Names of the created partitions
+    """
+
+    if engine.dialect.name != 'postgresql':
+        return []
+
+    existing = set(inspect(engine).get_table_names())
+    created = []
+    with engine.begin() as connection:
+        for model in PARTITIONED_MODELS:
+            for year in sorted(set(years)):
+                if partition_name(model, year) not in existing:
+                    connection.exec_driver_sql(partition_ddl(model, year))
+                    created.append(partition_name(model, year))
+    return created
+
+
+def add_statistic_year(engine: Engine) -> int:
+    """
+    Adds the year column to an existing statistics table when it is missing and sets it from the
+    schedule of the statistics that have none.
+    :param engine: Engine
+    :return: Number of updated statistics
+    """
+
+    table = Statistic.__tablename__
+    columns = {column['name'] for column in inspect(engine).get_columns(table)}
+    with engine.begin() as connection:
+        if PARTITION_KEY not in columns:
+            column_type = Integer().compile(dialect=engine.dialect)
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table} ADD COLUMN {PARTITION_KEY} {column_type}')
+        result = connection.execute(text(
+            f'UPDATE {table} SET {PARTITION_KEY} = (SELECT schedule.year_value FROM schedule '
+            f'WHERE schedule.id = {table}.schedule_id) WHERE {PARTITION_KEY} IS NULL'))  # nosec
+        return result.rowcount
+
+
+def add_updated_at(engine: Engine) -> int:
+    """
+    Adds the updated at column and its index to the existing tables of models that have one
+    when they are missing, and sets it to the current time on the rows that have none. On
+    PostgreSQL the column is then made NOT NULL, SQLite cannot change the column afterwards.
+    :param engine: Engine
+    :return: Number of updated rows
+    """
+
+    existing = set(inspect(engine).get_table_names())
+    tables = [table for table in Base.metadata.sorted_tables
+              if 'updated_at' in table.c and table.name in existing]
+    updated = 0
+    for table in tables:
+        columns = {column['name'] for column in inspect(engine).get_columns(table.name)}
+        with engine.begin() as connection:
+            if 'updated_at' not in columns:
+                column_type = DateTime().compile(dialect=engine.dialect)
+                connection.exec_driver_sql(
+                    f'ALTER TABLE {table.name} ADD COLUMN updated_at {column_type}')
+            updated += connection.execute(update(table).where(
+                table.c.updated_at.is_(None)).values(updated_at=utcnow())).rowcount
+            if engine.dialect.name == 'postgresql':
+                connection.exec_driver_sql(
+                    f'ALTER TABLE {table.name} ALTER COLUMN updated_at SET NOT NULL')
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+    return updated
@@ -0,0 +1,241 @@
+"""
+Profiling of Repository Calls combining cProfile with a SQL Trace.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from sqlalchemy import event, Connection, Engine
+from sqlalchemy.orm import sessionmaker
+
+from football_data.instrumentation import current_call
+from football_data.repositories import bound_engine
+
+# SQL Alchemy functions handing a statement to the DBAPI cursor. Their time is shown as SQL frames.
+_EXECUTE_FUNCTIONS = ('do_execute', 'do_executemany', 'do_execute_no_params')
+_ENGINE_DEFAULT = os.path.join('sqlalchemy', 'engine', 'default.py')
+# Event dispatch frames between the statement execution and the trace listener.
+_EVENT_FILES = (os.path.join('sqlalchemy', 'event', ''),
+                os.path.join('sqlalchemy', 'engine', 'events.py'), __file__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+FunctionKey = tuple[str, int, str]
+
+
+@dataclass
+class TracedQuery:
+    """
+    Statement executed while profiling.
+    """
+
+    statement: str
+    parameters: Any
+    offset: float
+    duration: float = 0.0
+    call: str | None = None
+    timestamp: datetime = field(default_factory=datetime.now)
+    stack: list[FunctionKey] = field(default_factory=list)
+
+
+class RepositoryProfiler:
+    """
+    Records a cProfile session and a timestamped SQL trace of the repository calls made in a
+    profiling context, so the time spent in Python can be told apart from the time spent in the
+    database. The result can be written as collapsed stacks for flamegraph tools, with the SQL
+    statements shown as synthetic frames.
+    """
+
+    queries: list[TracedQuery]
+    stats: pstats.Stats | None
+    duration: float
+
+    def __init__(self, statement_length: int = 80):
+        """
+        Creates a new instance of the Repository Profiler.
+        :param statement_length: Number of statement characters shown in a SQL frame
+        """
+
+        self.statement_length = statement_length
+        self.queries = []
+        self.stats = None
+        self.duration = 0.0
+        self._start = 0.0
+        self._thread = 0
+        self._open: dict[int, list[TracedQuery]] = {}
+
+    @contextmanager
+    def profile(self, *targets: Engine | sessionmaker) -> Iterator['RepositoryProfiler']:
+        """
+        Profiles the calls made within the context and traces the statements executed on the
+        Engines or the Engines of the Session Makers.
+        :param targets: Engines or Session Makers
+        :return: Repository Profiler
+        """
+
+        engines = []
+        for target in targets:
+            engine = target if isinstance(target, Engine) else bound_engine(target)
+            if engine not in engines:
+                event.listen(engine, 'before_cursor_execute', self._before_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_execute)
+                engines.append(engine)
+
+        self.queries = []
+        self._open = {}
+        self._thread = threading.get_ident()
+        profiler = cProfile.Profile()
+        self._start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield self
+        finally:
+            profiler.disable()
+            self.duration = time.perf_counter() - self._start
+            for engine in engines:
+                event.remove(engine, 'before_cursor_execute', self._before_execute)
+                event.remove(engine, 'after_cursor_execute', self._after_execute)
+            self.stats = pstats.Stats(profiler, stream=io.StringIO())
+
+    @property
+    def sql_time(self) -> float:
+        """
+        Seconds spent executing statements.
+        :return: Seconds
+        """
+        return sum(query.duration for query in self.queries)
+
+    @property
+    def python_time(self) -> float:
+        """
+        Seconds spent outside of statement execution.
+        :return: Seconds
+        """
+        return max(self.duration - self.sql_time, 0.0)
+
+    def report(self, sort: str = 'cumulative', limit: int = 30) -> str:
+        """
+        Returns the cProfile statistics with the SQL time summary as text.
+        :param sort: pstats sort key
+        :param limit: Number of functions shown
+        :return: Report Text
+        """
+
+        stream = io.StringIO()
+        stream.write(f'Total {self.duration:.3f}s, SQL {self.sql_time:.3f}s in '
+                     f'{len(self.queries)} statements, Python {self.python_time:.3f}s\n')
+        if self.stats:
+            self.stats.stream = stream  # type: ignore[attr-defined]
+            self.stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def collapsed(self) -> list[str]:
+        """
+        Returns the profile as collapsed stacks in microseconds, one frame;frame;... value line per
+        stack. Statement execution is replaced by a SQL frame below the Python frames issuing it.
+        :return: List of collapsed stack lines
+        """
+
+        samples: dict[str, float] = {}
+        if self.stats:
+            entries = self.stats.stats  # type: ignore[attr-defined]
+            callees: dict[FunctionKey, list[FunctionKey]] = {}
+            for function, (_, _, _, _, callers) in entries.items():
+                for caller in callers:
+                    callees.setdefault(caller, []).append(function)
+
+            for function, (_, _, _, total, callers) in entries.items():
+                if not callers:
+                    _expand(entries, callees, function, (), total, samples=samples)
+
+            for query in self.queries:
+                frames = [key for key in query.stack if key in entries]
+                path = [_frame(key) for key in frames] + [self._sql_frame(query.statement)]
+                _add(samples, path, query.duration)
+
+        return [f'{stack} {round(value)}' for stack, value in samples.items() if round(value)]
+
+    def write_collapsed(self, path: str | Path) -> None:
+        """
+        Writes the collapsed stacks to a file.
+        :param path: File Path
+        :return: None
+        """
+        Path(path).write_text('\n'.join(self.collapsed()) + '\n', encoding='utf-8')
+
+    def _sql_frame(self, statement: str) -> str:
+        text = _WHITESPACE.sub(' ', statement).strip()[:self.statement_length]
+        return 'SQL ' + text.replace(';', ',')
+
+    def _before_execute(self, conn: Connection, _cursor: Any, statement: str, parameters: Any,
+                        *_args) -> None:
+        if threading.get_ident() != self._thread:
+            return
+        query = TracedQuery(statement=statement, parameters=parameters,
+                            offset=time.perf_counter() - self._start, call=current_call.get(),
+                            stack=_stack())
+        self._open.setdefault(id(conn), []).append(query)
+
+    def _after_execute(self, conn: Connection, *_args) -> None:
+        started = self._open.get(id(conn))
+        if not started:
+            return
+        query = started.pop()
+        query.duration = time.perf_counter() - self._start - query.offset
+        self.queries.append(query)
+
+
+def _expand(entries: dict, callees: dict[FunctionKey, list[FunctionKey]], function: FunctionKey,
+            path: tuple[FunctionKey, ...], time_spent: float, *,
+            samples: dict[str, float]) -> None:
+    # Callee time is split by the share of the calls made along the path. Paths under a
+    # microsecond are dropped, they would be rounded away and keep the expansion small.
+    if function in path or _is_execute(function) or time_spent < 1e-6:
+        return
+    _, _, own, total, _ = entries[function]
+    share = time_spent / total if total else 0.0
+    path = path + (function,)
+    _add(samples, [_frame(key) for key in path], own * share)
+    for callee in callees.get(function, []):
+        callee_time = entries[callee][4][function][3]
+        _expand(entries, callees, callee, path, callee_time * share, samples=samples)
+
+
+def _stack() -> list[FunctionKey]:
+    frames = []
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None:
+        code = frame.f_code
+        if frames or not any(name in code.co_filename for name in _EVENT_FILES):
+            frames.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _is_execute(function: FunctionKey) -> bool:
+    return function[2] in _EXECUTE_FUNCTIONS and function[0].endswith(_ENGINE_DEFAULT)
+
+
+def _frame(function: FunctionKey) -> str:
+    filename, line, name = function
+    if filename == '~':
+        return name.replace(';', ',')
+    return f'{name} ({os.path.basename(filename)}:{line})'
+
+
+def _add(samples: dict[str, float], path: list[str], seconds: float) -> None:
+    if path and seconds > 0:
+        stack = ';'.join(path)
+        samples[stack] = samples.get(stack, 0.0) + seconds * 1_000_000
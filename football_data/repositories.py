@@ -2,14 +2,127 @@
 Data Model Repositories for saving to the Database.
 """
 
-from sqlalchemy import select
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.sql.expression import or_
-
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import cache, partial
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import select, event, func, bindparam, Connection, Engine, Executable
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from football_data.bulk import (StatisticDelta, StatisticValue, ValueUpdateResult,
+                                replace_schedule, sync_schedule, update_values)
+from football_data.exceptions import QueryTimeoutError, RowLimitExceededError
 from football_data.models import (Base, Player, TeamStaff, TeamLeague, Team, TypeCode,
                                   Position, StatisticCode,
                                   Statistic,
-                                  StatisticCategory, Schedule, League)
+                                  StatisticCategory, Schedule, League, utcnow)
+from football_data.statements import exists_by, select_by, select_changes, select_in
+
+# Number of SQLite virtual machine instructions between deadline checks.
+SQLITE_PROGRESS_STEPS = 1000
+
+# Statistic lookups narrowed to a year also match statistics stored without one.
+YEAR_HINT = ('year_value',)
+
+# Seconds the change feeds stay behind now, leaving open transactions stamped earlier to commit.
+# The updated_at stamps come from the clocks of the writing clients, so the order of the feeds
+# only holds while those clocks differ by less than the lag.
+CHANGE_FEED_LAG = 30.0
+
+_budget: ContextVar[tuple[float | None, int | None]] = ContextVar(
+    'budget', default=(None, None))
+
+
+@dataclass(frozen=True)
+class Watermark:
+    """
+    Position in a change feed, the updated at time and id of the last row read.
+    """
+
+    updated_at: datetime
+    id: int
+
+
+@dataclass
+class ChangeBatch:
+    """
+    Batch of changed rows and the watermark to resume the feed after them.
+    """
+
+    items: list
+    watermark: Watermark
+
+
+@dataclass
+class RosterEntry:
+    """
+    Player on the roster of a Team for a season, with the position of the player.
+    """
+
+    player: Player
+    team: Team
+    position: Position | None
+    year_value: int
+
+
+@contextmanager
+def budget(timeout: float | None = None, row_limit: int | None = None) -> Iterator[None]:
+    """
+    Applies a Latency Budget to the repository calls made within the context. Values given here
+    take precedence over the defaults of the repository.
+    :param timeout: Seconds a repository call may spend executing statements
+    :param row_limit: Maximum number of rows a repository call may return
+    :return: None
+    """
+
+    token = _budget.set((timeout, row_limit))
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+def bound_engine(maker: sessionmaker) -> Engine:
+    """
+    Returns the Engine a Session Maker is bound to.
+    :param maker: SQL Alchemy Session Maker
+    :return: Engine
+    """
+
+    with maker() as session:
+        bind = session.get_bind()
+    return bind if isinstance(bind, Engine) else bind.engine
+
+
+def _apply_timeout(deadline: float, _session: Session, _transaction: SessionTransaction,
+                   connection: Connection) -> None:
+    remaining = max(deadline - time.monotonic(), 0.001)
+    if connection.dialect.name == 'postgresql':
+        connection.execute(select(func.set_config('statement_timeout',
+                                                  str(int(remaining * 1000)), True)))
+    elif connection.dialect.name == 'sqlite':
+        proxy = connection.connection
+        proxy.driver_connection.set_progress_handler(
+            lambda: int(time.monotonic() > deadline), SQLITE_PROGRESS_STEPS)
+        proxy.info['progress_handler'] = True
+        if not event.contains(connection.engine.pool, 'checkin', _clear_progress_handler):
+            event.listen(connection.engine.pool, 'checkin', _clear_progress_handler)
+
+
+def _clear_progress_handler(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+    if record.info.pop('progress_handler', False) and dbapi_connection is not None:
+        dbapi_connection.set_progress_handler(None, 0)
+
+
+def _is_timeout(error: DBAPIError) -> bool:
+    code = getattr(error.orig, 'pgcode', None) or getattr(error.orig, 'sqlstate', None)
+    return code == '57014' or 'interrupted' in str(error.orig).lower()
 
 
 class BaseRepository:
@@ -18,14 +131,21 @@ class BaseRepository:
     """
 
     maker: sessionmaker
+    timeout: float | None
+    row_limit: int | None
 
-    def __init__(self, maker: sessionmaker):
+    def __init__(self, maker: sessionmaker, timeout: float | None = None,
+                 row_limit: int | None = None):
         """
         Creates a new instance of the Base Repository.
         :param maker: SQL Alchemy Session Maker
+        :param timeout: Default seconds a call may spend executing statements
+        :param row_limit: Default maximum number of rows a call may return
         """
 
         self.maker = maker
+        self.timeout = timeout
+        self.row_limit = row_limit
 
     def save(self, model: Base) -> None:
         """
@@ -33,13 +153,10 @@ class BaseRepository:
         :param model: Base Model Implementation
         :return: None
         """
-        session = self.maker()
-        try:
+        with self._session() as session:
             session.begin()
             session.add(model)
             session.commit()
-        finally:
-            session.close()
 
     def save_all(self, items: list[Base]) -> None:
         """
@@ -48,13 +165,91 @@ class BaseRepository:
         :return: None
         """
 
-        session = self.maker()
-        try:
+        with self._session() as session:
             session.begin()
             session.add_all(items)
             session.commit()
-        finally:
-            session.close()
+
+    def _changes(self, model: type[Base], since: Watermark | None, batch_size: int,
+                 lag: float) -> Iterator[ChangeBatch]:
+        """
+        Streams the rows of a model changed after a watermark in batches, each read in its own
+        session with a keyset query.
+        :param model: Model Class with an updated_at column
+        :param since: Watermark of the last row read, None to read from the start
+        :param batch_size: Maximum rows per batch
+        :param lag: Seconds before now that changes are read up to
+        :return: Change Batches
+        """
+
+        parameters: dict[str, Any] = {'until': utcnow() - timedelta(seconds=lag),
+                                      'batch_size': batch_size}
+        watermark = since
+        while True:
+            if watermark is not None:
+                parameters.update(updated_at=watermark.updated_at, id=watermark.id)
+            with self._session() as session:
+                items = self._all(session, select_changes(model, watermark is not None),
+                                  parameters=parameters)
+            if not items:
+                return
+            watermark = Watermark(items[-1].updated_at, items[-1].id)
+            yield ChangeBatch(items, watermark)
+            if len(items) < batch_size:
+                return
+
+    def _limits(self) -> tuple[float | None, int | None]:
+        timeout, row_limit = _budget.get()
+        return (self.timeout if timeout is None else timeout,
+                self.row_limit if row_limit is None else row_limit)
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """
+        Opens a Session with the statement timeout of the current budget applied.
+        :return: Session
+        """
+
+        timeout, _ = self._limits()
+        with self.maker() as session:
+            if timeout is None:
+                yield session
+                return
+
+            event.listen(session, 'after_begin',
+                         partial(_apply_timeout, time.monotonic() + timeout))
+            try:
+                yield session
+            except DBAPIError as error:
+                if _is_timeout(error):
+                    raise QueryTimeoutError(
+                        f'Repository call exceeded the timeout of {timeout} seconds') from error
+                raise
+
+    def _all(self, session: Session, statement: Executable, loaded: int = 0,
+             parameters: dict[str, Any] | None = None, *, scalars: bool = True) -> list:
+        """
+        Returns the rows of a statement, enforcing the row limit of the current budget.
+        :param session: Session
+        :param statement: Select Statement
+        :param loaded: Number of rows the call has already loaded
+        :param parameters: Bind Parameter Values
+        :param scalars: Return the first column of each row instead of the row tuples
+        :return: List of Models or Rows
+        """
+
+        _, row_limit = self._limits()
+        result = session.scalars(statement, parameters) if scalars else \
+            session.execute(statement, parameters).tuples()
+        if row_limit is None:
+            return list(result.all())
+
+        rows = list(result.fetchmany(row_limit - loaded + 1))
+        result.close()
+        if loaded + len(rows) > row_limit:
+            raise RowLimitExceededError(
+                f'Repository call returned more than the limit of {row_limit} rows')
+        return rows
 
 
 class PlayerRepository(BaseRepository):
@@ -69,9 +264,8 @@ class PlayerRepository(BaseRepository):
         :return: Bool
         """
 
-        with self.maker() as session:
-            result = session.scalars(select(Player).where(Player.url == player.url)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(Player, 'url'), {'url': player.url}) is not None
 
     def get_player(self, **kwargs) -> Player | None:
         """
@@ -81,15 +275,15 @@ class PlayerRepository(BaseRepository):
         :return: Player or None
         """
 
-        conditions = []
+        parameters = {}
         if 'url' in kwargs:
-            conditions = [(Player.url == kwargs['url'])]
+            parameters = {'url': kwargs['url']}
 
         if 'id' in kwargs:
-            conditions = [(Player.id == int(kwargs['id']))]
+            parameters = {'id': int(kwargs['id'])}
 
-        with self.maker() as session:
-            return session.scalars(select(Player).where(*conditions)).first()
+        with self._session() as session:
+            return session.scalars(select_by(Player, *parameters), parameters).first()
 
     def get_players(self, **kwargs) -> list[Player]:
         """
@@ -102,19 +296,16 @@ class PlayerRepository(BaseRepository):
         position_code = kwargs.get('position_code')
         position_id = kwargs.get('position_id', 0)
 
-        with self.maker() as session:
+        with self._session() as session:
             if position_code:
-                position = session.scalars(
-                    select(Position).where(Position.code == position_code)).first()
-                if position:
-                    position_id = position.id
+                position_id = session.scalar(exists_by(Position, 'code'),
+                                             {'code': position_code}) or position_id
 
             if position_id:
-                result = session.scalars(
-                    select(Player).where(Player.position_id == position_id)).all()
-                return result if result else []
+                return self._all(session, select_by(Player, 'position_id'),
+                                 parameters={'position_id': position_id})
 
-            return list(session.scalars(select(Player)).all())
+            return self._all(session, select_by(Player))
 
 
 class PositionCodeRepository(BaseRepository):
@@ -129,9 +320,8 @@ class PositionCodeRepository(BaseRepository):
         :return: Bool
         """
 
-        with self.maker() as session:
-            result = session.scalars(select(Position).where(Position.code == code.code)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(Position, 'code'), {'code': code.code}) is not None
 
     def get_position_code(self, **kwargs) -> Position | None:
         """
@@ -141,17 +331,17 @@ class PositionCodeRepository(BaseRepository):
         :return: Position Code
         """
 
-        conditions = []
+        parameters = {}
 
         if 'code' in kwargs:
-            conditions = [(Position.code == kwargs['code'])]
+            parameters = {'code': kwargs['code']}
 
         if 'id' in kwargs:
-            conditions = [(Position.id == int(kwargs['id']))]
+            parameters = {'id': int(kwargs['id'])}
 
-        if conditions:
-            with self.maker() as session:
-                return session.scalars(select(Position).where(*conditions)).first()
+        if parameters:
+            with self._session() as session:
+                return session.scalars(select_by(Position, *parameters), parameters).first()
         return None
 
     def get_position_codes(self) -> list[Position]:
@@ -160,8 +350,8 @@ class PositionCodeRepository(BaseRepository):
         :return: List of Position codes
         """
 
-        with self.maker() as session:
-            return list(session.scalars(select(Position)).all())
+        with self._session() as session:
+            return self._all(session, select_by(Position))
 
 
 class ScheduleRepository(BaseRepository):
@@ -176,14 +366,15 @@ class ScheduleRepository(BaseRepository):
         :return: Bool
         """
 
-        with self.maker() as session:
-            result = session.scalars(select(Schedule).where(
-                Schedule.team_id == schedule.team_id,
-                Schedule.opponent_id == schedule.opponent_id,
-                Schedule.year_value == schedule.year_value,
-                Schedule.week_number == schedule.week_number,
-                Schedule.type_id == schedule.type_id)).first()
-            return result is not None
+        with self._session() as session:
+            parameters = {
+                'team_id': schedule.team_id,
+                'opponent_id': schedule.opponent_id,
+                'year_value': schedule.year_value,
+                'week_number': schedule.week_number,
+                'type_id': schedule.type_id
+            }
+            return session.scalar(exists_by(Schedule, *parameters), parameters) is not None
 
     def get_schedule(self, **kwargs) -> Schedule | None:
         """
@@ -191,20 +382,23 @@ class ScheduleRepository(BaseRepository):
         :keyword id: Schedule ID Value.
         :keyword team id: Team ID
         :keyword game_id: Game ID
+        :keyword year: Year Value, lets a partitioned table skip the other seasons
         :return: Schedule
         """
 
-        conditions = []
+        parameters = {}
         if 'id' in kwargs:
-            conditions.append((Schedule.id == int(kwargs['id'])))
+            parameters = {'id': int(kwargs['id'])}
         else:
             if 'team_id' in kwargs and 'game_id' in kwargs:
-                conditions = [(Schedule.team_id == int(kwargs['team_id'])),
-                              (Schedule.game_id == int(kwargs['game_id']))]
-
-        if conditions:
-            with self.maker() as session:
-                return session.scalars(select(Schedule).where(*conditions)).first()
+                parameters = {'team_id': int(kwargs['team_id']),
+                              'game_id': int(kwargs['game_id'])}
+
+        if parameters:
+            if 'year' in kwargs:
+                parameters['year_value'] = int(kwargs['year'])
+            with self._session() as session:
+                return session.scalars(select_by(Schedule, *parameters), parameters).first()
         return None
 
     def get_schedules(self, **kwargs) -> list[Schedule]:
@@ -215,16 +409,29 @@ class ScheduleRepository(BaseRepository):
         :keyword week: Week Number
         :return: List of Schedules
         """
-        items = []
+        parameters = {}
         if 'team_id' in kwargs:
-            items.append((Schedule.team_id == int(kwargs['team_id'])))
+            parameters['team_id'] = int(kwargs['team_id'])
         if 'year' in kwargs:
-            items.append((Schedule.year_value == kwargs['year']))
+            parameters['year_value'] = kwargs['year']
         if 'week' in kwargs:
-            items.append((Schedule.week_number == kwargs['week']))
+            parameters['week_number'] = kwargs['week']
 
-        with self.maker() as session:
-            return list(session.scalars(select(Schedule).where(*items)))
+        with self._session() as session:
+            return self._all(session, select_by(Schedule, *parameters), parameters=parameters)
+
+    def get_schedule_changes(self, since: Watermark | None = None, batch_size: int = 1000,
+                             lag: float = CHANGE_FEED_LAG) -> Iterator[ChangeBatch]:
+        """
+        Streams the Schedules inserted or updated after a watermark in batches ordered by the
+        time of the change. Deleted Schedules are not reported.
+        :param since: Watermark of the last batch processed, None to read all Schedules
+        :param batch_size: Maximum Schedules per batch
+        :param lag: Seconds before now that changes are read up to, leaving time for
+        transactions stamped earlier to commit
+        :return: Change Batches
+        """
+        return self._changes(Schedule, since, batch_size, lag)
 
 
 class StatisticCategoryRepository(BaseRepository):
@@ -238,18 +445,17 @@ class StatisticCategoryRepository(BaseRepository):
         :param category: Statistic Category
         :return: bool
         """
-        with self.maker() as session:
-            result = session.scalars(
-                select(StatisticCategory).where(StatisticCategory.code == category.code)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(StatisticCategory, 'code'),
+                                  {'code': category.code}) is not None
 
     def get_statistic_categories(self) -> list[StatisticCategory]:
         """
         Retrieves the Statistic Category Codes.
         :return: List of Statistic Category codes
         """
-        with self.maker() as session:
-            return list(session.scalars(select(StatisticCategory)).all())
+        with self._session() as session:
+            return self._all(session, select_by(StatisticCategory))
 
     def get_statistic_category(self, **kwargs) -> StatisticCategory | None:
         """
@@ -258,22 +464,24 @@ class StatisticCategoryRepository(BaseRepository):
         :keyword code: Statistic Category Code
         :return: Statistic Category
         """
-        criteria = []
+        parameters = {}
         if 'code' in kwargs:
-            criteria = [(StatisticCategory.code == kwargs['code'])]
+            parameters = {'code': kwargs['code']}
         if 'id' in kwargs:
-            criteria = [(StatisticCategory.id == int(kwargs['id']))]
+            parameters = {'id': int(kwargs['id'])}
 
-        if criteria:
-            with self.maker() as session:
-                return session.scalars(
-                    select(StatisticCategory).where(or_(False, *criteria))).first()
+        if parameters:
+            with self._session() as session:
+                return session.scalars(select_by(StatisticCategory, *parameters),
+                                       parameters).first()
         return None
 
 
 class StatisticRepository(BaseRepository):
     """
-    Repository for working with Statistic Entries.
+    Repository for working with Statistic Entries. Lookups include the year of the statistics
+    when it is known, so a table partitioned by season only scans the partitions of that year.
+    Statistics stored without a year still match these lookups.
     """
 
     def statistic_exists(self, stat: Statistic) -> bool:
@@ -282,19 +490,22 @@ class StatisticRepository(BaseRepository):
         :param stat: Statistic.
         :return: Bool
         """
-        criteria = [
-            (Statistic.schedule_id == stat.schedule_id),
-            (Statistic.category_id == stat.category_id),
-            (Statistic.statistic_code_id == stat.category_id)]
+        parameters = {
+            'schedule_id': stat.schedule_id,
+            'category_id': stat.category_id,
+            'statistic_code_id': stat.statistic_code_id
+        }
 
         if stat.player_id:
-            criteria.append((Statistic.player_id == stat.player_id))
+            parameters['player_id'] = stat.player_id
         if stat.team_id:
-            criteria.append((Statistic.team_id == stat.team_id))
+            parameters['team_id'] = stat.team_id
+        if stat.year_value:
+            parameters['year_value'] = stat.year_value
 
-        with self.maker() as session:
-            result = session.scalars(select(Statistic).where(*criteria)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(Statistic, *parameters, hints=YEAR_HINT),
+                                  parameters) is not None
 
     def get_statistics(self, **kwargs) -> list[Statistic]:
         """
@@ -302,28 +513,138 @@ class StatisticRepository(BaseRepository):
         :keyword: player_id Player ID Value
         :keyword: schedule_id Schedule ID Value
         :keyword: team_id Team ID Value
+        :keyword: year Year Value
         :return: List of Statistics
         """
 
-        criteria = []
+        parameters = {}
         if 'player_id' in kwargs:
-            criteria.append((Statistic.player_id == int(kwargs['player_id'])))
+            parameters['player_id'] = int(kwargs['player_id'])
         if 'team_id' in kwargs:
-            criteria.append((Statistic.team_id == int(kwargs['team_id'])))
+            parameters['team_id'] = int(kwargs['team_id'])
         if 'schedule_id' in kwargs:
-            criteria.append((Statistic.schedule_id == int(kwargs['schedule_id'])))
-
-        with self.maker() as session:
-            return list(session.scalars(select(Statistic).where(*criteria)).all())
-
-    def get_statistic(self, id_value: int) -> Statistic | None:
+            parameters['schedule_id'] = int(kwargs['schedule_id'])
+        if 'year' in kwargs:
+            parameters['year_value'] = int(kwargs['year'])
+
+        with self._session() as session:
+            return self._all(session, select_by(Statistic, *parameters), parameters=parameters)
+
+    def get_statistics_by_schedule(self, schedules: Iterable[Schedule | int],
+                                   chunk_size: int = 500) -> dict[int, list[Statistic]]:
+        """
+        Returns the Statistics for a list of Schedules using batched IN queries. When only
+        Schedules are given their years are included in the queries.
+        :param schedules: Schedules or Schedule ID Values
+        :param chunk_size: Maximum Schedule IDs per query
+        :return: Dictionary of Schedule ID to List of Statistics
+        """
+
+        years: dict[int, int | None] = {}
+        for item in schedules:
+            if isinstance(item, Schedule):
+                years[item.id] = item.year_value
+            else:
+                years[int(item)] = None
+        schedule_ids = list(years)
+        result: dict[int, list[Statistic]] = {schedule_id: [] for schedule_id in schedule_ids}
+        names = ('schedule_id', 'year_value') if None not in years.values() else ('schedule_id',)
+
+        loaded = 0
+        with self._session() as session:
+            for start in range(0, len(schedule_ids), chunk_size):
+                chunk = schedule_ids[start:start + chunk_size]
+                parameters = {'schedule_id': chunk}
+                if 'year_value' in names:
+                    parameters['year_value'] = list({years[item] for item in chunk})
+                stats = self._all(session, select_in(Statistic, *names, hints=YEAR_HINT),
+                                  loaded, parameters)
+                loaded += len(stats)
+                for stat in stats:
+                    result[stat.schedule_id].append(stat)
+        return result
+
+    def get_statistic(self, id_value: int, year: int | None = None) -> Statistic | None:
         """
         Retrieves a statistic by the ID Value.
         :param id_value: Primary Key ID Value.
+        :param year: Year Value of the Statistic
         :return: Statistic or None
         """
-        with self.maker() as session:
-            return session.scalars(select(Statistic).where(Statistic.id == id_value)).first()
+
+        parameters = {'id': id_value}
+        if year is not None:
+            parameters['year_value'] = year
+        with self._session() as session:
+            return session.scalars(select_by(Statistic, *parameters, hints=YEAR_HINT),
+                                   parameters).first()
+
+    def get_statistic_changes(self, since: Watermark | None = None, batch_size: int = 1000,
+                              lag: float = CHANGE_FEED_LAG) -> Iterator[ChangeBatch]:
+        """
+        Streams the Statistics inserted or updated after a watermark in batches ordered by the
+        time of the change. Deleted Statistics are not reported, including those removed by
+        sync_statistics and replace_statistics, so consumers holding copies reconcile a Schedule
+        by reading its statistics again.
+        :param since: Watermark of the last batch processed, None to read all Statistics
+        :param batch_size: Maximum Statistics per batch
+        :param lag: Seconds before now that changes are read up to, leaving time for
+        transactions stamped earlier to commit
+        :return: Change Batches
+        """
+        return self._changes(Statistic, since, batch_size, lag)
+
+    def sync_statistics(self, schedule_id: int, stats: Iterable[Statistic]) -> StatisticDelta:
+        """
+        Synchronizes the Statistics of a Schedule with an incoming set in one transaction. The
+        stored statistics are read once and matched by statistic code, category, player and team,
+        then only the differences are written with bulk inserts, updates and deletes. Stored
+        statistics missing from the incoming set are deleted, unseen by the change feed.
+        :param schedule_id: Schedule ID Value
+        :param stats: Complete set of Statistics of the Schedule
+        :return: Statistic Delta
+        """
+
+        with self._session() as session:
+            session.begin()
+            delta = sync_schedule(session, schedule_id, stats)
+            session.commit()
+        return delta
+
+    def replace_statistics(self, schedule_id: int, stats: Iterable[Statistic]) -> StatisticDelta:
+        """
+        Replaces all Statistics of a Schedule in one transaction, with a single DELETE by the
+        schedule id and a bulk insert. Readers see the old or the new statistics once the
+        transaction commits, never a partial set. The change feed only sees the new ones.
+        :param schedule_id: Schedule ID Value
+        :param stats: Complete set of Statistics of the Schedule
+        :return: Statistic Delta with the deleted and inserted counts
+        """
+
+        with self._session() as session:
+            session.begin()
+            delta = replace_schedule(session, schedule_id, stats)
+            session.commit()
+        return delta
+
+    def update_statistic_values(self, values: Iterable[tuple],
+                                chunk_size: int = 500) -> ValueUpdateResult:
+        """
+        Updates the values of Statistics by natural key in one transaction. The ids of the keys
+        are read with one query per chunk of schedules and the values written with an
+        executemany UPDATE by id, so no Statistic objects are loaded.
+        :param values: StatisticValue tuples of schedule id, statistic code id, category id,
+        player id, team id and value
+        :param chunk_size: Maximum Schedule IDs per query
+        :return: Value Update Result with the matched count and the unmatched values
+        """
+
+        with self._session() as session:
+            session.begin()
+            result = update_values(session, [StatisticValue(*item) for item in values],
+                                   chunk_size)
+            session.commit()
+        return result
 
 
 class TeamRepository(BaseRepository):
@@ -337,22 +658,22 @@ class TeamRepository(BaseRepository):
         :param team: Team
         :return: Boolean
         """
-        criteria = [
-            (Team.code == team.code),
-            (Team.url == team.url)
-        ]
+        parameters = {
+            'code': team.code,
+            'url': team.url
+        }
 
-        with self.maker() as session:
-            result = session.scalars(select(Team).where(or_(False, *criteria))).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(Team, *parameters, any_of=True),
+                                  parameters) is not None
 
     def get_teams(self) -> list[Team]:
         """
         Returns a list of teams
         :return: List of Teams
         """
-        with self.maker() as session:
-            return list(session.scalars(select(Team)).all())
+        with self._session() as session:
+            return self._all(session, select_by(Team))
 
     def get_team(self, **kwargs) -> Team | None:
         """
@@ -364,20 +685,20 @@ class TeamRepository(BaseRepository):
         :return: Team or None
         """
 
-        criteria = []
+        parameters = {}
 
         if 'code' in kwargs:
-            criteria = [(Team.code == kwargs['code'])]
+            parameters = {'code': kwargs['code']}
         if 'url' in kwargs:
-            criteria = [(Team.url == kwargs['url'])]
+            parameters = {'url': kwargs['url']}
         if 'id' in kwargs:
-            criteria = [(Team.id == kwargs['id'])]
+            parameters = {'id': kwargs['id']}
         if 'name' in kwargs:
-            criteria = [(Team.name == kwargs['name'])]
+            parameters = {'name': kwargs['name']}
 
-        if criteria:
-            with self.maker() as session:
-                return session.scalars(select(Team).where(*criteria)).first()
+        if parameters:
+            with self._session() as session:
+                return session.scalars(select_by(Team, *parameters), parameters).first()
         return None
 
 
@@ -392,9 +713,8 @@ class TypeCodeRepository(BaseRepository):
         :param code: Type Code Value
         :return: boolean
         """
-        with self.maker() as session:
-            result = session.scalars(select(TypeCode).where(TypeCode.code == code.code)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(TypeCode, 'code'), {'code': code.code}) is not None
 
     def get_type_code(self, **kwargs) -> TypeCode | None:
         """
@@ -404,15 +724,15 @@ class TypeCodeRepository(BaseRepository):
         :return: Type Code or None
         """
 
-        criteria = []
+        parameters = {}
         if 'id' in kwargs:
-            criteria = [(TypeCode.id == kwargs['id'])]
+            parameters = {'id': kwargs['id']}
         if 'code' in kwargs:
-            criteria = [(TypeCode.code == kwargs['code'])]
+            parameters = {'code': kwargs['code']}
 
-        if criteria:
-            with self.maker() as session:
-                return session.scalars(select(TypeCode).where(or_(False, *criteria))).first()
+        if parameters:
+            with self._session() as session:
+                return session.scalars(select_by(TypeCode, *parameters), parameters).first()
         return None
 
     def get_type_codes(self) -> list[TypeCode]:
@@ -420,8 +740,8 @@ class TypeCodeRepository(BaseRepository):
         Retrieves the Type Codes from the system.
         :return: List of Type Codes
         """
-        with self.maker() as session:
-            return list(session.scalars(select(TypeCode)).all())
+        with self._session() as session:
+            return self._all(session, select_by(TypeCode))
 
 
 class TeamStaffRepository(BaseRepository):
@@ -435,34 +755,35 @@ class TeamStaffRepository(BaseRepository):
         :param staff: Team Staff Entry
         :return: Bool
         """
-        conditions = [
-            (TeamStaff.team_id == staff.team_id),
-            (TeamStaff.player_id == staff.player_id),
-            (TeamStaff.year_value == staff.year_value)
-        ]
-        with self.maker() as session:
-            result = session.scalars(select(TeamStaff).where(*conditions)).first()
-            return result is not None
+        parameters = {
+            'team_id': staff.team_id,
+            'player_id': staff.player_id,
+            'year_value': staff.year_value
+        }
+        with self._session() as session:
+            return session.scalar(exists_by(TeamStaff, *parameters), parameters) is not None
 
     def get_team_staff_entries(self, **kwargs) -> list[TeamStaff]:
         """
         Retrieves Team Staff Entries.
         :keyword team_id: Team ID
         :keyword player_id: Player id value
+        :keyword year: Year Value
         :return: List of TeamStaff items.
         """
 
-        conditions = []
+        parameters = {}
         if 'team_id' in kwargs:
-            conditions.append((TeamStaff.team_id == int(kwargs['team_id'])))
+            parameters['team_id'] = int(kwargs['team_id'])
 
         if 'player_id' in kwargs:
-            conditions.append((TeamStaff.player_id == int(kwargs['player_id'])))
+            parameters['player_id'] = int(kwargs['player_id'])
 
-        with self.maker() as session:
-            if conditions:
-                return list(session.scalars(select(TeamStaff).where(*conditions)).all())
-            return list(session.scalars(select(TeamStaff)).all())
+        if 'year' in kwargs:
+            parameters['year_value'] = int(kwargs['year'])
+
+        with self._session() as session:
+            return self._all(session, select_by(TeamStaff, *parameters), parameters=parameters)
 
     def get_team_staff_entry(self, id_value: int) -> TeamStaff | None:
         """
@@ -471,8 +792,50 @@ class TeamStaffRepository(BaseRepository):
         :return: Team Staff of None
         """
 
-        with self.maker() as session:
-            return session.scalars(select(TeamStaff).where(TeamStaff.id == id_value)).first()
+        with self._session() as session:
+            return session.scalars(select_by(TeamStaff, 'id'), {'id': id_value}).first()
+
+    def get_roster(self, team_id: int, year: int) -> list[RosterEntry]:
+        """
+        Retrieves the Players of a Team for a season with their position in one joined query.
+        :param team_id: Team ID
+        :param year: Year Value
+        :return: List of Roster Entries ordered by player id
+        """
+
+        parameters = {'team_id': int(team_id), 'year_value': int(year)}
+        with self._session() as session:
+            rows = self._all(session, _roster(True), parameters=parameters, scalars=False)
+        return [RosterEntry(player, team, position, year_value)
+                for year_value, player, team, position in rows]
+
+    def get_rosters(self, year: int) -> dict[int, list[RosterEntry]]:
+        """
+        Retrieves the rosters of all Teams for a season in one joined query.
+        :param year: Year Value
+        :return: Dictionary of Team ID to List of Roster Entries ordered by player id
+        """
+
+        with self._session() as session:
+            rows = self._all(session, _roster(False), parameters={'year_value': int(year)},
+                             scalars=False)
+        rosters: dict[int, list[RosterEntry]] = {}
+        for year_value, player, team, position in rows:
+            rosters.setdefault(team.id, []).append(RosterEntry(player, team, position,
+                                                               year_value))
+        return rosters
+
+
+@cache
+def _roster(by_team: bool) -> Executable:
+    statement = select(TeamStaff.year_value, Player, Team, Position).join(
+        Player, Player.id == TeamStaff.player_id).join(
+        Team, Team.id == TeamStaff.team_id).outerjoin(
+        Position, Position.id == Player.position_id).where(
+        TeamStaff.year_value == bindparam('year_value'))
+    if by_team:
+        statement = statement.where(TeamStaff.team_id == bindparam('team_id'))
+    return statement.order_by(TeamStaff.team_id, Player.id)
 
 
 class LeagueRepository(BaseRepository):
@@ -486,9 +849,8 @@ class LeagueRepository(BaseRepository):
         :param league: League
         :return: Bool
         """
-        with self.maker() as session:
-            result = session.scalars(select(League).where(League.code == league.code)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(League, 'code'), {'code': league.code}) is not None
 
     def get_league(self, **kwargs) -> League | None:
         """
@@ -498,16 +860,16 @@ class LeagueRepository(BaseRepository):
         :return: League or None
         """
 
-        conditions = []
+        parameters = {}
         if 'id' in kwargs:
-            conditions = [(League.id == int(kwargs['id']))]
+            parameters = {'id': int(kwargs['id'])}
 
         if 'code' in kwargs:
-            conditions = [(League.code == kwargs['code'])]
+            parameters = {'code': kwargs['code']}
 
-        if conditions:
-            with self.maker() as session:
-                return session.scalars(select(League).where(*conditions)).first()
+        if parameters:
+            with self._session() as session:
+                return session.scalars(select_by(League, *parameters), parameters).first()
         return None
 
     def get_leagues(self) -> list[League]:
@@ -516,8 +878,8 @@ class LeagueRepository(BaseRepository):
         :return: List of Leagues
         """
 
-        with self.maker() as session:
-            return list(session.scalars(select(League)).all())
+        with self._session() as session:
+            return self._all(session, select_by(League))
 
 
 class TeamLeagueRepository(BaseRepository):
@@ -532,15 +894,14 @@ class TeamLeagueRepository(BaseRepository):
         :return: bool
         """
 
-        conditions = [
-            (TeamLeague.team_id == team_league.team_id),
-            (TeamLeague.league_id == team_league.league_id),
-            (TeamLeague.year_value == team_league.year_value)
-        ]
+        parameters = {
+            'team_id': team_league.team_id,
+            'league_id': team_league.league_id,
+            'year_value': team_league.year_value
+        }
 
-        with self.maker() as session:
-            result = session.scalars(select(TeamLeague).where(*conditions)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(TeamLeague, *parameters), parameters) is not None
 
     def get_team_leagues(self, **kwargs) -> list[TeamLeague]:
         """
@@ -549,17 +910,15 @@ class TeamLeagueRepository(BaseRepository):
         :keyword league_id: League ID
         :return: List of Team League Entries
         """
-        conditions = []
+        parameters = {}
         if 'team_id' in kwargs:
-            conditions.append((TeamLeague.team_id == int(kwargs['team_id'])))
+            parameters['team_id'] = int(kwargs['team_id'])
 
         if 'league_id' in kwargs:
-            conditions.append((TeamLeague.league_id == int(kwargs['league_id'])))
+            parameters['league_id'] = int(kwargs['league_id'])
 
-        with self.maker() as session:
-            if conditions:
-                return list(session.scalars(select(TeamLeague).where(*conditions)).all())
-            return list(session.scalars(select(TeamLeague)).all())
+        with self._session() as session:
+            return self._all(session, select_by(TeamLeague, *parameters), parameters=parameters)
 
     def get_team_league(self, id_value: int) -> TeamLeague | None:
         """
@@ -567,8 +926,8 @@ class TeamLeagueRepository(BaseRepository):
         :param id_value: Primary ID Value
         :return: Team League or None
         """
-        with self.maker() as session:
-            return session.scalars(select(TeamLeague).where(TeamLeague.id == id_value)).first()
+        with self._session() as session:
+            return session.scalars(select_by(TeamLeague, 'id'), {'id': id_value}).first()
 
 
 class StatisticCodeRepository(BaseRepository):
@@ -582,10 +941,9 @@ class StatisticCodeRepository(BaseRepository):
         :param code: Statistic Code
         :return: bool
         """
-        with self.maker() as session:
-            result = session.scalars(
-                select(StatisticCode).where(StatisticCode.code == code.code)).first()
-            return result is not None
+        with self._session() as session:
+            return session.scalar(exists_by(StatisticCode, 'code'),
+                                  {'code': code.code}) is not None
 
     def get_statistic_code(self, **kwargs) -> StatisticCode | None:
         """
@@ -594,15 +952,15 @@ class StatisticCodeRepository(BaseRepository):
         :keyword code: Code Value
         :return: Statistic Code or Noe
         """
-        conditions = []
+        parameters = {}
         if 'id' in kwargs:
-            conditions = [(StatisticCode.id == int(kwargs['id']))]
+            parameters = {'id': int(kwargs['id'])}
         if 'code' in kwargs:
-            conditions = [(StatisticCode.code == kwargs['code'])]
+            parameters = {'code': kwargs['code']}
 
-        if conditions:
-            with self.maker() as session:
-                return session.scalars(select(StatisticCode).where(*conditions)).first()
+        if parameters:
+            with self._session() as session:
+                return session.scalars(select_by(StatisticCode, *parameters), parameters).first()
         return None
 
     def get_statistic_codes(self, **kwargs) -> list[StatisticCode]:
@@ -612,9 +970,8 @@ class StatisticCodeRepository(BaseRepository):
         :return: List of Statistic Codes
         """
 
+        parameters = {}
         if 'grouping' in kwargs:
-            stmt = select(StatisticCode).where((StatisticCode.grouping == kwargs['grouping']))
-        else:
-            stmt = select(StatisticCode)
-        with self.maker() as session:
-            return list(session.scalars(stmt).all())
+            parameters = {'grouping': kwargs['grouping']}
+        with self._session() as session:
+            return self._all(session, select_by(StatisticCode, *parameters), parameters=parameters)
@@ -0,0 +1,143 @@
+"""
+Slow Query Log with EXPLAIN capture for the Repository Engine.
+"""
+
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy import event, Connection, Engine
+from sqlalchemy.orm import sessionmaker
+
+from football_data.instrumentation import current_call
+from football_data.repositories import bound_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SlowQuery:
+    """
+    Statement that ran longer than the Slow Query Threshold.
+    """
+
+    statement: str
+    parameters: Any
+    duration: float
+    call: str | None = None
+    plan: list[str] = field(default_factory=list)
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+class SlowQueryLog:
+    """
+    Captures statements running longer than a threshold with their bound parameters, duration,
+    the repository method issuing them and the EXPLAIN output. Only a sample of the slow statements
+    is captured so the log is cheap enough to leave enabled.
+    """
+
+    threshold: float
+    sample_rate: float
+    explain: bool
+    analyze: bool
+    records: deque[SlowQuery]
+
+    def __init__(self, threshold: float = 0.5, **kwargs):
+        """
+        Creates a new instance of the Slow Query Log.
+        :param threshold: Duration in seconds above which a statement is slow
+        :keyword sample_rate: Fraction of the slow statements captured, between 0 and 1
+        :keyword explain: Capture the EXPLAIN output of slow SELECT statements
+        :keyword analyze: Use EXPLAIN ANALYZE on PostgreSQL, running the statement again
+        :keyword capacity: Number of slow queries retained in the records
+        :keyword sink: Callable receiving each Slow Query, defaults to the module logger
+        """
+
+        self.threshold = threshold
+        self.sample_rate = float(kwargs.get('sample_rate', 1.0))
+        self.explain = bool(kwargs.get('explain', True))
+        self.analyze = bool(kwargs.get('analyze', False))
+        self.records = deque(maxlen=int(kwargs.get('capacity', 100)))
+        self.sink: Callable[[SlowQuery], None] = kwargs.get('sink', _log)
+        self._engines: list[Engine] = []
+
+    def attach(self, target: Engine | sessionmaker) -> None:
+        """
+        Starts watching the statements of an Engine or the Engine of a Session Maker.
+        :param target: Engine or Session Maker
+        :return: None
+        """
+
+        engine = target if isinstance(target, Engine) else bound_engine(target)
+        if engine not in self._engines:
+            event.listen(engine, 'before_cursor_execute', self._before_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_execute)
+            self._engines.append(engine)
+
+    def detach(self) -> None:
+        """
+        Stops watching all attached Engines.
+        :return: None
+        """
+
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._before_execute)
+            event.remove(engine, 'after_cursor_execute', self._after_execute)
+        self._engines = []
+
+    @staticmethod
+    def _before_execute(conn: Connection, *_args) -> None:
+        conn.info.setdefault('slow_query_start', []).append(time.perf_counter())
+
+    def _after_execute(self, conn: Connection, _cursor: Any, statement: str, parameters: Any,
+                       _context: Any, executemany: bool) -> None:
+        starts = conn.info.get('slow_query_start')
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        if duration < self.threshold or random.random() >= self.sample_rate:  # nosec B311
+            return
+
+        record = SlowQuery(statement=statement, parameters=parameters, duration=duration,
+                           call=current_call.get())
+        if self.explain and not executemany and _is_select(statement):
+            record.plan = self._explain(conn, statement, parameters)
+        self.records.append(record)
+        self.sink(record)
+
+    def _explain(self, conn: Connection, statement: str, parameters: Any) -> list[str]:
+        postgres = conn.dialect.name == 'postgresql'
+        if postgres:
+            prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if self.analyze else 'EXPLAIN '
+        else:
+            prefix = 'EXPLAIN QUERY PLAN '
+
+        savepoint = postgres and conn.in_transaction()
+        cursor = conn.connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute('SAVEPOINT slow_query_explain')
+            cursor.execute(prefix + statement, parameters)  # nosec B608
+            plan = [str(row[-1]) for row in cursor.fetchall()]
+            if savepoint:
+                cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+            return plan
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            if savepoint:
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+            return [f'EXPLAIN failed: {error}']
+        finally:
+            cursor.close()
+
+
+def _is_select(statement: str) -> bool:
+    return statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+
+
+def _log(record: SlowQuery) -> None:
+    logger.warning('Slow query in %s took %.3f seconds', record.call or 'unknown call',
+                   record.duration, extra={'slow_query': asdict(record)})
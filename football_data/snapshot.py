@@ -0,0 +1,217 @@
+"""
+Local Snapshot of the Reference Tables for fast Worker Startup.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import (create_engine, func, insert, literal, null, select, union_all, Column,
+                        DateTime, Integer, MetaData, String, Table)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from football_data.models import (Base, Player, Position, StatisticCategory, StatisticCode, Team,
+                                  TypeCode)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Format of the snapshot file, snapshots written in another format are not trusted.
+SNAPSHOT_FORMAT = 2
+
+REFERENCE_MODELS: list[type[Base]] = [Team, Player, Position, TypeCode, StatisticCode,
+                                      StatisticCategory]
+
+_metadata = MetaData()
+
+_versions = Table('snapshot_versions', _metadata,
+                  Column('table_name', String, primary_key=True),
+                  Column('row_count', Integer, nullable=False),
+                  Column('max_id', Integer, nullable=False),
+                  Column('changed_at', String, nullable=False))
+
+Version = dict[str, tuple[int, int, str]]
+
+
+@dataclass
+class ReferenceData:
+    """
+    Reference rows loaded from a snapshot.
+    """
+
+    version: Version
+    rows: dict[str, list[Base]] = field(default_factory=dict)
+
+    def all(self, model: type[Base]) -> list:
+        """
+        Returns the rows of a model.
+        :param model: Model Class
+        :return: List of Models
+        """
+        return self.rows.get(model.__tablename__, [])
+
+    def index(self, model: type[Base], key: str = 'id') -> dict:
+        """
+        Returns the rows of a model keyed by a column.
+        :param model: Model Class
+        :param key: Column Name
+        :return: Dictionary of column value to Model
+        """
+        return {getattr(item, key): item for item in self.all(model)}
+
+
+def database_version(maker: sessionmaker, models: list[type[Base]] | None = None) -> Version:
+    """
+    Returns the version of the reference tables in the database as the row count, highest id and
+    latest updated at time of each table, read with a single statement. The count changes with
+    deletes, the updated at time with inserts and updates.
+    :param maker: Session Maker
+    :param models: Reference Models, defaults to the reference tables
+    :return: Dictionary of table name to row count, max id and max updated at in ISO format
+    """
+
+    with maker() as session:
+        return _version(session, models or REFERENCE_MODELS)
+
+
+class ReferenceSnapshot:
+    """
+    Writes the reference tables to a local SQLite file and loads them from it, so new workers do
+    not all read them from the primary database. A snapshot is only trusted while its version,
+    the row count, highest id and latest updated at time of each table, matches the database.
+    Workers refreshing an out of date snapshot take a lock on the snapshot file, so only one of
+    them reads the tables and the others load its snapshot.
+    """
+
+    path: Path
+    models: list[type[Base]]
+
+    def __init__(self, path: str | Path, models: list[type[Base]] | None = None):
+        """
+        Creates a new instance of the Reference Snapshot.
+        :param path: Snapshot File Path
+        :param models: Reference Models, defaults to the reference tables
+        """
+
+        self.path = Path(path)
+        self.models = models or REFERENCE_MODELS
+
+    def write(self, maker: sessionmaker) -> Version:
+        """
+        Writes the reference tables of the database to the snapshot file. The file is replaced
+        atomically so readers never see a partial snapshot.
+        :param maker: Session Maker of the database
+        :return: Version of the snapshot
+        """
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temp = tempfile.mkstemp(dir=self.path.parent, suffix='.snapshot')
+        os.close(descriptor)
+        engine = create_engine(f'sqlite:///{temp}')
+        try:
+            tables = [model.__table__ for model in self.models]
+            Base.metadata.create_all(bind=engine, tables=tables)
+            _metadata.create_all(bind=engine)
+            with maker() as source, engine.begin() as target:
+                if source.get_bind().dialect.name == 'postgresql':
+                    # Read the version and all tables from one consistent view.
+                    source.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+                version = _version(source, self.models)
+                for table in tables:
+                    rows = [dict(row) for row in source.execute(select(table)).mappings()]
+                    if rows:
+                        target.execute(insert(table), rows)
+                target.execute(insert(_versions), [
+                    {'table_name': name, 'row_count': count, 'max_id': max_id,
+                     'changed_at': changed_at}
+                    for name, (count, max_id, changed_at) in version.items()])
+                target.execute(insert(_versions), [
+                    {'table_name': '', 'row_count': SNAPSHOT_FORMAT, 'max_id': 0,
+                     'changed_at': ''}])
+        except BaseException:
+            engine.dispose()
+            os.unlink(temp)
+            raise
+        engine.dispose()
+        os.replace(temp, self.path)
+        return version
+
+    def read(self) -> ReferenceData | None:
+        """
+        Reads the snapshot file without checking it against the database.
+        :return: Reference Data or None when there is no readable snapshot
+        """
+
+        if not self.path.exists():
+            return None
+        engine = create_engine(f'sqlite:///{self.path}')
+        try:
+            with Session(bind=engine) as session:
+                stored = {row.table_name: (row.row_count, row.max_id, row.changed_at)
+                          for row in session.execute(select(_versions))}
+                if stored.pop('', (None, 0, ''))[0] != SNAPSHOT_FORMAT or \
+                        set(stored) != {model.__tablename__ for model in self.models}:
+                    return None
+                data = ReferenceData(version=stored)
+                for model in self.models:
+                    data.rows[model.__tablename__] = list(session.scalars(select(model)))
+                session.expunge_all()
+            return data
+        except SQLAlchemyError:
+            return None
+        finally:
+            engine.dispose()
+
+    def load(self, maker: sessionmaker, refresh: bool = True) -> ReferenceData | None:
+        """
+        Loads the snapshot when its version matches the database. A refresh holds the lock of the
+        snapshot file and checks the snapshot again once it has the lock, so workers waiting for
+        another worker's refresh load that snapshot instead of writing their own.
+        :param maker: Session Maker of the database
+        :param refresh: Write a new snapshot when the file is missing or out of date
+        :return: Reference Data or None when the snapshot is out of date and not refreshed
+        """
+
+        data = self.read()
+        if data and data.version == database_version(maker, self.models):
+            return data
+        if not refresh:
+            return None
+        with self._locked():
+            data = self.read()
+            if not data or data.version != database_version(maker, self.models):
+                self.write(maker)
+                data = self.read()
+        return data
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # Without fcntl, on Windows, refreshes are not serialized between processes.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + '.lock'), 'a', encoding='utf-8') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _version(session: Session, models: list[type[Base]]) -> Version:
+    statement = union_all(*[
+        select(literal(model.__tablename__).label('table_name'),
+               func.count(model.id).label('row_count'),
+               func.coalesce(func.max(model.id), 0).label('max_id'),
+               func.max(model.updated_at).label('changed_at') if hasattr(model, 'updated_at')
+               else null().cast(DateTime).label('changed_at'))
+        for model in models])
+    return {row.table_name: (row.row_count, row.max_id,
+                             row.changed_at.isoformat() if row.changed_at else '')
+            for row in session.execute(statement)}
@@ -0,0 +1,91 @@
+"""
+Prebuilt Statements shared by the Repositories.
+"""
+
+from functools import cache
+from typing import Any
+
+from sqlalchemy import select, bindparam, Select
+from sqlalchemy.sql.expression import and_, or_
+
+from football_data.models import Base
+
+
+@cache
+def select_by(model: type[Base], *names: str, any_of: bool = False,
+              hints: tuple[str, ...] = ()) -> Select:
+    """
+    Returns a prebuilt select of the model where each named column equals the bind parameter of
+    the same name. The statement is built once per combination and reused, so repeated calls skip
+    statement construction and its compiled form is found in the engine cache without generating
+    a new cache key.
+    :param model: Model Class
+    :param names: Column Names
+    :param any_of: Match any of the columns instead of all of them
+    :param hints: Column Names that also match NULL, narrowing the scan without excluding rows
+    that have no value
+    :return: Select Statement
+    """
+
+    if not names:
+        return select(model)
+    criteria = [_criterion(model, name, hints) for name in names]
+    return select(model).where(or_(*criteria) if any_of else and_(*criteria))
+
+
+@cache
+def exists_by(model: type[Base], *names: str, any_of: bool = False,
+              hints: tuple[str, ...] = ()) -> Select:
+    """
+    Returns a prebuilt select of the first matching id, see select_by.
+    :param model: Model Class
+    :param names: Column Names
+    :param any_of: Match any of the columns instead of all of them
+    :param hints: Column Names that also match NULL
+    :return: Select Statement
+    """
+
+    return select_by(model, *names, any_of=any_of, hints=hints).with_only_columns(
+        model.id).limit(1)
+
+
+@cache
+def select_in(model: type[Base], *names: str, hints: tuple[str, ...] = ()) -> Select:
+    """
+    Returns a prebuilt select of the model where each named column is in the expanding bind
+    parameter of the same name.
+    :param model: Model Class
+    :param names: Column Names
+    :param hints: Column Names that also match NULL
+    :return: Select Statement
+    """
+
+    return select(model).where(*[_criterion(model, name, hints, expanding=True)
+                                 for name in names])
+
+
+@cache
+def select_changes(model: type[Base], after: bool = False) -> Select:
+    """
+    Returns a prebuilt keyset select of the rows of the model updated up to the until parameter,
+    ordered by updated at and id and limited to batch_size rows. After a watermark only the rows
+    following its updated_at and id parameters are selected.
+    :param model: Model Class with an updated_at column
+    :param after: Select the rows after a watermark
+    :return: Select Statement
+    """
+
+    statement = select(model).where(model.updated_at <= bindparam('until'))
+    if after:
+        statement = statement.where(or_(
+            model.updated_at > bindparam('updated_at'),
+            and_(model.updated_at == bindparam('updated_at'), model.id > bindparam('id'))))
+    return statement.order_by(model.updated_at, model.id).limit(bindparam('batch_size'))
+
+
+def _criterion(model: type[Base], name: str, hints: tuple[str, ...],
+               expanding: bool = False) -> Any:
+    column = getattr(model, name)
+    parameter = bindparam(name, expanding=expanding)
+    criterion = column.in_(parameter) if expanding else column == parameter
+    return or_(criterion, column.is_(None)) if name in hints else criterion
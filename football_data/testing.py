@@ -0,0 +1,108 @@
+"""
+Test Fixture Databases built once from a Template and cloned per Test.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import create_engine, Engine, MetaData
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from football_data.models import Base
+
+
+@contextmanager
+def rolled_back(engine: Engine) -> Iterator[sessionmaker]:
+    """
+    Yields a Session Maker bound to a connection inside an outer transaction that is rolled back
+    when the context exits. Commits made by the repositories only release savepoints, so a shared
+    database such as PostgreSQL is left unchanged by the test.
+    :param engine: Engine of the shared database
+    :return: Session Maker
+    """
+
+    connection = engine.connect()
+    driver = connection.connection.driver_connection
+    sqlite = connection.dialect.name == 'sqlite'
+    if sqlite:
+        # pysqlite commits on SAVEPOINT, so the transaction is begun on the driver connection.
+        isolation_level = driver.isolation_level
+        driver.isolation_level = None
+    transaction = connection.begin()
+    if sqlite:
+        connection.exec_driver_sql('BEGIN')
+    try:
+        yield sessionmaker(bind=connection, expire_on_commit=False,
+                           join_transaction_mode='create_savepoint')
+    finally:
+        transaction.rollback()
+        if sqlite:
+            driver.isolation_level = isolation_level
+        connection.close()
+
+
+class TemplateDatabase:
+    """
+    In memory SQLite Database holding the schema and optional seed data, built once and copied
+    for each test with the SQLite backup API instead of running the DDL again.
+    """
+
+    metadata: MetaData
+
+    def __init__(self, metadata: MetaData = Base.metadata,
+                 seed: Callable[[sessionmaker], Any] | None = None):
+        """
+        Creates a new instance of the Template Database. The template is built on first use.
+        :param metadata: Metadata of the tables to create
+        :param seed: Callable loading seed data through the Session Maker of the template
+        """
+
+        self.metadata = metadata
+        self.seed = seed
+        self._template: sqlite3.Connection | None = None
+        self._shared: Engine | None = None
+        self._lock = threading.RLock()
+
+    def clone(self) -> sessionmaker:
+        """
+        Returns a Session Maker for a new copy of the template.
+        :return: Session Maker
+        """
+
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self._build().backup(connection)
+        return sessionmaker(bind=_engine(connection), expire_on_commit=False)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sessionmaker]:
+        """
+        Yields a Session Maker for one shared copy of the template whose changes are rolled back
+        when the context exits.
+        :return: Session Maker
+        """
+
+        with self._lock:
+            if self._shared is None:
+                connection = sqlite3.connect(':memory:', check_same_thread=False)
+                self._build().backup(connection)
+                self._shared = _engine(connection)
+        with rolled_back(self._shared) as maker:
+            yield maker
+
+    def _build(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._template is None:
+                template = sqlite3.connect(':memory:', check_same_thread=False)
+                engine = _engine(template)
+                self.metadata.create_all(bind=engine)
+                if self.seed:
+                    self.seed(sessionmaker(bind=engine, expire_on_commit=False))
+                self._template = template
+            return self._template
+
+
+def _engine(connection: sqlite3.Connection) -> Engine:
+    return create_engine('sqlite://', creator=lambda: connection, poolclass=StaticPool)
@@ -0,0 +1,262 @@
+"""
+Resilient Bulk Writer for chunked, resumable saves.
+"""
+
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, asdict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Protocol
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker
+
+from football_data.models import Base
+
+# Serialization Failure and Deadlock Detected on PostgreSQL.
+TRANSIENT_SQLSTATES = frozenset({'40001', '40P01'})
+TRANSIENT_MESSAGES = ('database is locked', 'database table is locked', 'deadlock',
+                      'could not serialize')
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Determines if a Database error is transient and the work can be retried.
+    :param error: Exception raised by SQL Alchemy
+    :return: Bool
+    """
+
+    if not isinstance(error, DBAPIError):
+        return False
+    if error.connection_invalidated:
+        return True
+
+    code = getattr(error.orig, 'pgcode', None) or getattr(error.orig, 'sqlstate', None)
+    if code in TRANSIENT_SQLSTATES:
+        return True
+    message = str(error.orig).lower()
+    return any(item in message for item in TRANSIENT_MESSAGES)
+
+
+@dataclass
+class Checkpoint:
+    """
+    Progress of a Bulk Write.
+    """
+
+    committed: int = 0
+    chunks: int = 0
+    last_key: Any = None
+
+
+class CheckpointStore(Protocol):
+    """
+    Storage for Bulk Write Checkpoints.
+    """
+
+    def load(self, name: str) -> Checkpoint | None:
+        """
+        Loads the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :return: Checkpoint or None
+        """
+
+    def store(self, name: str, checkpoint: Checkpoint) -> None:
+        """
+        Stores the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :param checkpoint: Checkpoint
+        :return: None
+        """
+
+    def clear(self, name: str) -> None:
+        """
+        Removes the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :return: None
+        """
+
+
+class MemoryCheckpointStore:
+    """
+    Checkpoint Store held in memory for the life of the process.
+    """
+
+    checkpoints: dict[str, Checkpoint]
+
+    def __init__(self):
+        """
+        Creates a new instance of the Memory Checkpoint Store.
+        """
+        self.checkpoints = {}
+
+    def load(self, name: str) -> Checkpoint | None:
+        """
+        Loads the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :return: Checkpoint or None
+        """
+        return self.checkpoints.get(name)
+
+    def store(self, name: str, checkpoint: Checkpoint) -> None:
+        """
+        Stores the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :param checkpoint: Checkpoint
+        :return: None
+        """
+        self.checkpoints[name] = checkpoint
+
+    def clear(self, name: str) -> None:
+        """
+        Removes the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :return: None
+        """
+        self.checkpoints.pop(name, None)
+
+
+class FileCheckpointStore:
+    """
+    Checkpoint Store persisted to a JSON File so an interrupted process can resume.
+    """
+
+    path: Path
+
+    def __init__(self, path: str | Path):
+        """
+        Creates a new instance of the File Checkpoint Store.
+        :param path: Path to the JSON Checkpoint File
+        """
+        self.path = Path(path)
+
+    def _read(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        with self.path.open('r', encoding='utf-8') as handle:
+            return json.load(handle)
+
+    def _write(self, content: dict[str, dict]) -> None:
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with temp_path.open('w', encoding='utf-8') as handle:
+            json.dump(content, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+
+    def load(self, name: str) -> Checkpoint | None:
+        """
+        Loads the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :return: Checkpoint or None
+        """
+        content = self._read().get(name)
+        return Checkpoint(**content) if content else None
+
+    def store(self, name: str, checkpoint: Checkpoint) -> None:
+        """
+        Stores the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :param checkpoint: Checkpoint
+        :return: None
+        """
+        content = self._read()
+        content[name] = asdict(checkpoint)
+        self._write(content)
+
+    def clear(self, name: str) -> None:
+        """
+        Removes the Checkpoint for a Bulk Write.
+        :param name: Bulk Write Name
+        :return: None
+        """
+        content = self._read()
+        if content.pop(name, None) is not None:
+            self._write(content)
+
+
+def _primary_key(item: Base) -> Any:
+    return getattr(item, 'id', None)
+
+
+class BulkWriter:
+    """
+    Saves large collections of items in committed chunks, retrying transient errors and
+    recording a checkpoint after each chunk.
+    """
+
+    maker: sessionmaker
+    chunk_size: int
+    max_retries: int
+    backoff: float
+    max_backoff: float
+    store: CheckpointStore
+    key: Callable[[Base], Any]
+
+    def __init__(self, maker: sessionmaker, **kwargs):
+        """
+        Creates a new instance of the Bulk Writer.
+        :param maker: SQL Alchemy Session Maker
+        :keyword chunk_size: Number of items committed per transaction
+        :keyword max_retries: Number of retries for a chunk on a transient error
+        :keyword backoff: Base delay in seconds between retries
+        :keyword max_backoff: Maximum delay in seconds between retries
+        :keyword store: Checkpoint Store, defaults to an in memory store
+        :keyword key: Callable returning the checkpoint key of an item, defaults to the id
+        """
+
+        self.maker = maker
+        self.chunk_size = int(kwargs.get('chunk_size', 500))
+        self.max_retries = int(kwargs.get('max_retries', 5))
+        self.backoff = float(kwargs.get('backoff', 0.1))
+        self.max_backoff = float(kwargs.get('max_backoff', 5.0))
+        self.store = kwargs.get('store') or MemoryCheckpointStore()
+        self.key = kwargs.get('key', _primary_key)
+        self._sleep: Callable[[float], None] = kwargs.get('sleep', time.sleep)
+
+    def write(self, name: str, items: Iterable[Base]) -> Checkpoint:
+        """
+        Writes the items in chunks, resuming after the last committed chunk of a previous run
+        with the same name. Items must be supplied in the same order on every run.
+        :param name: Bulk Write Name used for the checkpoint
+        :param items: Items to save
+        :return: Final Checkpoint
+        """
+
+        checkpoint = self.store.load(name) or Checkpoint()
+        iterator = islice(items, checkpoint.committed, None)
+
+        while chunk := list(islice(iterator, self.chunk_size)):
+            last_key = self._commit(chunk)
+            checkpoint = Checkpoint(committed=checkpoint.committed + len(chunk),
+                                    chunks=checkpoint.chunks + 1, last_key=last_key)
+            self.store.store(name, checkpoint)
+        return checkpoint
+
+    def _commit(self, chunk: list[Base]) -> Any:
+        attempt = 0
+        while True:
+            session = self.maker()
+            try:
+                session.begin()
+                session.add_all(chunk)
+                # Read before the commit expires the items of a default Session Maker.
+                session.flush()
+                last_key = self.key(chunk[-1])
+                session.commit()
+                return last_key
+            except DBAPIError as error:
+                session.rollback()
+                if attempt >= self.max_retries or not is_transient(error):
+                    raise
+                self._sleep(self._delay(attempt))
+                attempt += 1
+            finally:
+                session.close()
+
+    def _delay(self, attempt: int) -> float:
+        ceiling = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return random.uniform(0, ceiling)  # nosec B311
@@ -0,0 +1,148 @@
+"""
+Tests for the Season Analytics.
+"""
+
+import pytest
+from assertpy import assert_that
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from football_data.models import Schedule, Statistic
+from football_data.repositories import ScheduleRepository, StatisticRepository
+from football_data.testing import TemplateDatabase
+
+pytest.importorskip('numpy')
+
+# pylint: disable=wrong-import-position
+from football_data.analytics import SeasonAnalytics  # noqa: E402
+
+TEMPLATE = TemplateDatabase()
+
+
+def _schedule(schedule_id: int, team_id: int, year: int, week: int) -> Schedule:
+    return Schedule(id=schedule_id, team_id=team_id, opponent_id=3 - team_id, year_value=year,
+                    week_number=week, game_id=year * 100 + week, url='www.google.com',
+                    type_id=1, is_home=team_id == 1)
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates a database with two weeks of 2020 and one week of 2019.
+    :return: Session Maker
+    """
+    maker = TEMPLATE.clone()
+    ScheduleRepository(maker).save_all([
+        _schedule(1, 1, 2020, 1), _schedule(2, 2, 2020, 1), _schedule(3, 1, 2020, 2),
+        _schedule(4, 1, 2019, 1)])
+    StatisticRepository(maker).save_all([
+        Statistic(statistic_code_id=1, schedule_id=1, value=100, category_id=1, player_id=10),
+        Statistic(statistic_code_id=2, schedule_id=1, value=2, category_id=1, player_id=10),
+        Statistic(statistic_code_id=1, schedule_id=1, value=50, category_id=1, player_id=11),
+        Statistic(statistic_code_id=1, schedule_id=2, value=70, category_id=1, player_id=20),
+        Statistic(statistic_code_id=5, schedule_id=2, value=300, category_id=2, team_id=2),
+        Statistic(statistic_code_id=1, schedule_id=3, value=80, category_id=1, player_id=10),
+        Statistic(statistic_code_id=1, schedule_id=4, value=999, category_id=1, player_id=10)])
+    return maker
+
+
+def test_load_season():
+    """
+    Tests only the statistics of the season are loaded.
+    """
+    analytics = SeasonAnalytics(create_maker(), 2020)
+
+    assert_that(analytics).is_length(6)
+    assert_that(analytics.total()).is_equal_to(602.0)
+
+
+def test_load_statistics_without_year():
+    """
+    Tests statistics stored without a year are loaded by the season of their schedule.
+    """
+    maker = create_maker()
+    with maker() as session:
+        session.execute(insert(Statistic.__table__), [
+            {'statistic_code_id': 1, 'schedule_id': 3, 'value': 8, 'category_id': 1,
+             'player_id': 11, 'year_value': None}])
+        session.commit()
+
+    analytics = SeasonAnalytics(maker, 2020)
+
+    assert_that(analytics).is_length(7)
+    assert_that(analytics.total(player_id=11)).is_equal_to(58.0)
+
+
+def test_filters():
+    """
+    Tests filters by id values and week ranges.
+    """
+    analytics = SeasonAnalytics(create_maker(), 2020)
+
+    assert_that(analytics.total(statistic_code_id=1, team_id=1)).is_equal_to(230.0)
+    assert_that(analytics.total(player_id=[10, 20], min_week=2)).is_equal_to(80.0)
+    assert_that(analytics.total(player_id=99)).is_equal_to(0.0)
+    selected = analytics.select(category_id=2)
+    assert_that(selected['team_id'].tolist()).is_equal_to([2])
+    assert_that(selected['player_id'].tolist()).is_equal_to([-1])
+
+
+def test_group_by():
+    """
+    Tests aggregations by dimension.
+    """
+    analytics = SeasonAnalytics(create_maker(), 2020)
+
+    assert_that(analytics.group_by('player', statistic_code_id=1)).is_equal_to(
+        {10: 180.0, 11: 50.0, 20: 70.0})
+    assert_that(analytics.group_by('team', 'count')).is_equal_to({1: 4.0, 2: 2.0})
+    assert_that(analytics.group_by('week', 'mean', statistic_code_id=1)).is_equal_to(
+        {1: 220 / 3, 2: 80.0})
+    assert_that(analytics.group_by('code', 'max', team_id=1)).is_equal_to({1: 100.0, 2: 2.0})
+    assert_that(analytics.group_by).raises(ValueError).when_called_with('season')
+
+
+def test_time_series_and_refresh():
+    """
+    Tests the weekly values of a player include a week added after the load.
+    """
+    maker = create_maker()
+    analytics = SeasonAnalytics(maker, 2020)
+    ScheduleRepository(maker).save(_schedule(5, 1, 2020, 3))
+    StatisticRepository(maker).save(
+        Statistic(statistic_code_id=1, schedule_id=5, value=40, category_id=1, player_id=10))
+
+    assert_that(analytics.refresh()).is_equal_to(1)
+    assert_that(analytics.refresh()).is_equal_to(0)
+    weeks, values = analytics.time_series(10, statistic_code_id=1)
+    assert_that(weeks.tolist()).is_equal_to([1, 2, 3])
+    assert_that(values.tolist()).is_equal_to([100.0, 80.0, 40.0])
+
+
+def test_refresh_updated_values():
+    """
+    Tests refresh replaces the loaded copy of a statistic updated after the load.
+    """
+    maker = create_maker()
+    analytics = SeasonAnalytics(maker, 2020)
+    result = StatisticRepository(maker).update_statistic_values([(1, 1, 1, 10, None, 120)])
+    assert_that(result).has_matched(1)
+
+    assert_that(analytics.refresh()).is_equal_to(1)
+    assert_that(analytics).is_length(6)
+    assert_that(analytics.total(player_id=10, week_number=1, statistic_code_id=1)) \
+        .is_equal_to(120.0)
+    assert_that(analytics.select()['id'].tolist()).is_sorted()
+
+
+def test_refresh_weeks_drops_deleted():
+    """
+    Tests reloading a week drops the statistics deleted after the load.
+    """
+    maker = create_maker()
+    analytics = SeasonAnalytics(maker, 2020)
+    StatisticRepository(maker).replace_statistics(3, [])
+
+    assert_that(analytics.refresh()).is_equal_to(0)
+    assert_that(analytics.refresh(weeks=[2])).is_equal_to(1)
+    assert_that(analytics).is_length(5)
+    assert_that(analytics.group_by('week')).is_equal_to({1: 522.0})
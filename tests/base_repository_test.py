@@ -3,15 +3,35 @@ Tests for the Base Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, select, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
-from football_data.models import Player, TeamStaff, TeamLeague, Team, TypeCode, Position, \
-    StatisticCode, \
-    Statistic, \
-    StatisticCategory, Schedule, League
-from football_data.repositories import BaseRepository
+from football_data.models import Player, Team, TypeCode
+from football_data.exceptions import QueryTimeoutError, RowLimitExceededError
+from football_data.repositories import BaseRepository, PlayerRepository, budget, exists_by, \
+    select_by
+from football_data.testing import TemplateDatabase
+
+
+class SlowRepository(BaseRepository):
+    """
+    Repository running a long statement.
+    """
+
+    def count(self, rows: int) -> int:
+        """
+        Counts the rows of a recursive sequence.
+        :param rows: Number of rows
+        :return: Count
+        """
+        with self._session() as session:
+            return session.scalar(text(
+                'WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq LIMIT :rows) '
+                'SELECT count(*) FROM seq'), {'rows': rows})
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
@@ -19,19 +39,7 @@ def create_maker() -> sessionmaker:
     Sets up the SQLite Database.
     :return: Session Maker.
     """
-    engine = create_engine('sqlite://')
-    Player.metadata.create_all(bind=engine)
-    TeamStaff.metadata.create_all(bind=engine)
-    TeamLeague.metadata.create_all(bind=engine)
-    Team.metadata.create_all(bind=engine)
-    TypeCode.metadata.create_all(bind=engine)
-    Position.metadata.create_all(bind=engine)
-    StatisticCode.metadata.create_all(bind=engine)
-    Statistic.metadata.create_all(bind=engine)
-    StatisticCategory.metadata.create_all(bind=engine)
-    Schedule.metadata.create_all(bind=engine)
-    League.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_save():
@@ -95,3 +103,69 @@ def test_save_all_exceptions():
     player = Player(id=1, url='www.google.com', name='Jim Smith')
 
     assert_that(repo.save_all).raises(SQLAlchemyError).when_called_with([player])
+
+
+def test_timeout_exceeded():
+    """
+    Tests a statement running past the timeout raises a timeout error.
+    """
+    maker = create_maker()
+    repo = SlowRepository(maker, timeout=0.05)
+
+    assert_that(repo.count).raises(QueryTimeoutError).when_called_with(100000000)
+
+
+def test_timeout_cleared_after_call():
+    """
+    Tests the timeout only applies to the call it was set for.
+    """
+    maker = create_maker()
+    repo = SlowRepository(maker)
+
+    with budget(timeout=0.05):
+        assert_that(repo.count).raises(QueryTimeoutError).when_called_with(100000000)
+        assert_that(repo.count(10)).is_equal_to(10)
+
+    assert_that(repo.count(200000)).is_equal_to(200000)
+
+
+def test_row_limit_exceeded():
+    """
+    Tests returning more rows than the row limit raises an error.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker, row_limit=2)
+    repo.save_all([Player(url='www.p1.com', name='Jim Smith'),
+                   Player(url='www.p2.com', name='Bob Jones'),
+                   Player(url='www.p3.com', name='Tom Brown')])
+
+    assert_that(repo.get_players).raises(RowLimitExceededError).when_called_with()
+    with budget(row_limit=3):
+        assert_that(repo.get_players()).is_length(3)
+
+
+def test_cached_statements():
+    """
+    Tests statements are built once per model and column combination.
+    """
+    assert_that(select_by(Player, 'id')).is_same_as(select_by(Player, 'id'))
+    assert_that(select_by(Player, 'id')).is_not_same_as(select_by(Player, 'url'))
+    assert_that(exists_by(Team, 'code', 'url', any_of=True)).is_same_as(
+        exists_by(Team, 'code', 'url', any_of=True))
+    assert_that(str(exists_by(Team, 'code', 'url', any_of=True))).contains(
+        'team.code = :code OR team.url = :url').contains('LIMIT')
+
+
+def test_cached_statements_parameters():
+    """
+    Tests a cached statement returns the rows for each set of parameters.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    repo.save_all([Player(id=1, url='www.one.com', name='One'),
+                   Player(id=2, url='www.two.com', name='Two')])
+
+    assert_that(repo.get_player(id=1)).has_name('One')
+    assert_that(repo.get_player(id=2)).has_name('Two')
+    assert_that(repo.get_player(url='www.two.com')).has_id(2)
+    assert_that(repo.get_player(id=3)).is_none()
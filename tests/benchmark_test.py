@@ -0,0 +1,100 @@
+"""
+Tests for the Repository Benchmark Suite.
+"""
+
+import json
+
+from assertpy import assert_that
+
+from benchmarks import load_test, statement_benchmark
+from benchmarks.repository_benchmark import compare, main, run
+
+
+def test_run(tmp_path):
+    """
+    Tests running the suite times every operation for each size.
+    """
+    result = run(['game'], 1, tmp_path)
+
+    assert_that(result).contains_key('meta', 'results')
+    assert_that(result['results']['game']).contains_key(
+        'save', 'save_all', 'statistic_exists', 'player_exits', 'get_statistics', 'get_players')
+    assert_that(result['results']['game']['get_statistics']).contains_key(
+        'median', 'min', 'max', 'repeat')
+
+
+def test_compare():
+    """
+    Tests regressions beyond the threshold are reported.
+    """
+    baseline = {'results': {'game': {'save': {'median': 0.010}, 'get_players': {'median': 0.010}}}}
+    current = {'results': {'game': {'save': {'median': 0.011}, 'get_players': {'median': 0.020}},
+                           'week': {'save': {'median': 0.5}}}}
+
+    result = compare(baseline, current, 0.25)
+
+    assert_that(result).is_length(1)
+    assert_that(result[0]).starts_with('game get_players')
+
+
+def test_main_save_and_compare(tmp_path):
+    """
+    Tests saving a baseline and comparing a run with it.
+    """
+    baseline = tmp_path / 'baseline.json'
+
+    assert_that(main(['--sizes', 'game', '--repeat', '1', '--save', str(baseline)])).is_zero()
+    assert_that(json.loads(baseline.read_text())['results']).contains_key('game')
+    assert_that(main(['--sizes', 'game', '--repeat', '1', '--compare', str(baseline),
+                      '--threshold', '1000'])).is_zero()
+
+
+def test_statement_benchmark():
+    """
+    Tests the statement microbenchmark times the built and prebuilt lookups.
+    """
+    result = statement_benchmark.run(2)
+
+    assert_that(result).contains_key('get_player', 'schedule_exists', 'team_staff_exists')
+    assert_that(result['get_player']).contains_key('built', 'prebuilt')
+
+
+def test_load_test_run(tmp_path):
+    """
+    Tests the load test reports throughput and percentiles for each operation in the mix.
+    """
+    config = load_test.LoadConfig(url=f'sqlite:///{tmp_path / "load.db"}', workers=2,
+                                  duration=0.2, batch_size=5,
+                                  mix={'get_statistics': 2, 'save_all': 1})
+
+    result = load_test.run(config, teams=2, weeks=1)
+
+    assert_that(result['operations']).contains_only('get_statistics', 'save_all')
+    figures = result['operations']['get_statistics']
+    assert_that(figures['count']).is_positive()
+    assert_that(figures['errors']).is_equal_to(0)
+    assert_that(figures['p50']).is_less_than_or_equal_to(figures['p95'])
+    assert_that(figures['p95']).is_less_than_or_equal_to(figures['p99'])
+
+
+def test_load_test_unknown_operation(tmp_path):
+    """
+    Tests operations outside of the load test are rejected.
+    """
+    config = load_test.LoadConfig(url=f'sqlite:///{tmp_path / "load.db"}', mix={'delete': 1})
+
+    assert_that(load_test.run).raises(ValueError).when_called_with(config)
+
+
+def test_percentile():
+    """
+    Tests the nearest rank percentiles.
+    """
+    values = [float(value) for value in range(1, 101)]
+
+    assert_that(load_test.percentile(values, 0.50)).is_equal_to(50.0)
+    assert_that(load_test.percentile(values, 0.99)).is_equal_to(99.0)
+    assert_that(load_test.percentile([3.0], 0.95)).is_equal_to(3.0)
+    assert_that(load_test.percentile([], 0.95)).is_equal_to(0.0)
+    assert_that(load_test.parse_mix(['get_players=3', 'save_all'])).is_equal_to(
+        {'get_players': 3, 'save_all': 1})
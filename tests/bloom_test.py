@@ -0,0 +1,185 @@
+"""
+Tests for the Bloom Filter Existence Pre-check.
+"""
+
+from assertpy import assert_that
+from sqlalchemy import event
+
+from football_data.bloom import BloomFilter, ExistenceFilter
+from football_data.models import Player, Statistic
+from football_data.repositories import PlayerRepository, StatisticRepository, bound_engine
+from football_data.testing import TemplateDatabase
+
+
+def _seed(maker) -> None:
+    PlayerRepository(maker).save_all([
+        Player(name='Player One', url='www.player.com/1'),
+        Player(name='Player Two', url='www.player.com/2')])
+    StatisticRepository(maker).save_all([
+        Statistic(statistic_code_id=1, schedule_id=1, value=20, category_id=1, team_id=1),
+        Statistic(statistic_code_id=1, schedule_id=1, value=10, category_id=1, player_id=5,
+                  team_id=1)])
+
+
+TEMPLATE = TemplateDatabase(seed=_seed)
+
+
+def create_filter() -> tuple[ExistenceFilter, list[str]]:
+    """
+    Creates a built Existence Filter and records the statements executed after the build.
+    :return: Existence Filter and executed statements
+    """
+    maker = TEMPLATE.clone()
+    existence = ExistenceFilter(maker)
+    existence.build()
+    statements = []
+    event.listen(bound_engine(maker), 'before_cursor_execute',
+                 lambda *args: statements.append(args[2]))
+    return existence, statements
+
+
+def test_bloom_filter_membership():
+    """
+    Tests added keys are always reported as possibly present.
+    """
+    bloom = BloomFilter(1000, 0.01)
+    for number in range(1000):
+        bloom.add(f'key-{number}')
+
+    assert_that([f'key-{number}' in bloom for number in range(1000)]).does_not_contain(False)
+    absent = sum(f'other-{number}' in bloom for number in range(10000))
+    assert_that(absent).is_less_than(300)
+    assert_that(bloom.false_positive_rate).is_between(0.001, 0.03)
+
+
+def test_bloom_filter_serialization():
+    """
+    Tests a filter is restored from its bytes and corrupt bytes are rejected.
+    """
+    bloom = BloomFilter(100)
+    bloom.add('www.player.com/1')
+
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+    assert_that(restored).has_size(bloom.size).has_hashes(bloom.hashes).has_count(1)
+    assert_that('www.player.com/1' in restored).is_true()
+    assert_that(BloomFilter.from_bytes).raises(ValueError).when_called_with(b'x' * 40)
+
+
+def test_player_exits_skips_database():
+    """
+    Tests definitely absent players are answered without a statement and others are checked.
+    """
+    existence, statements = create_filter()
+
+    assert_that(existence.player_exits(Player(name='New', url='www.player.com/3'))).is_false()
+    assert_that(statements).is_empty()
+    assert_that(existence.player_exits(Player(name='Player One', url='www.player.com/1'))).is_true()
+    assert_that(statements).is_length(1)
+    assert_that(existence.report()['players']).contains_entry(
+        {'definite_negatives': 1}, {'true_positives': 1}, {'keys': 2})
+
+
+def test_unbuilt_filter_checks_database():
+    """
+    Tests a filter that was neither built nor loaded never reports a stored player as absent.
+    """
+    existence = ExistenceFilter(TEMPLATE.clone(), max_age=None)
+
+    assert_that(existence.player_exits(Player(name='Player One', url='www.player.com/1'))).is_true()
+    assert_that(existence.player_exits(Player(name='New', url='www.player.com/3'))).is_false()
+    assert_that(existence.report()['players']).contains_entry(
+        {'definite_negatives': 0}, {'false_positives': 0})
+
+
+def test_statistic_exists_partial_keys():
+    """
+    Tests statistics without a player or team match stored statistics as the exact check does.
+    """
+    existence, _ = create_filter()
+
+    for stat, expected in [
+            (Statistic(statistic_code_id=1, schedule_id=1, value=0, category_id=1), True),
+            (Statistic(statistic_code_id=1, schedule_id=1, value=0, category_id=1, player_id=5),
+             True),
+            (Statistic(statistic_code_id=1, schedule_id=1, value=0, category_id=1, team_id=1),
+             True),
+            (Statistic(statistic_code_id=1, schedule_id=1, value=0, category_id=1, player_id=6),
+             False),
+            (Statistic(statistic_code_id=2, schedule_id=1, value=0, category_id=1), False)]:
+        assert_that(existence.statistic_exists(stat)).is_equal_to(expected)
+        assert_that(existence.statistic_repository.statistic_exists(stat)).is_equal_to(expected)
+
+
+def test_add_saved_models():
+    """
+    Tests models saved elsewhere fall through to the exact check once added to the filter.
+    """
+    existence, _ = create_filter()
+    player = Player(name='New', url='www.player.com/3')
+    PlayerRepository(existence.maker).save(player)
+
+    assert_that(existence.player_exits(player)).is_false()
+    existence.add([player])
+    assert_that(existence.player_exits(player)).is_true()
+
+
+def test_repository_saves_add_keys():
+    """
+    Tests models saved through the repositories of the filter are added without a rebuild.
+    """
+    existence, _ = create_filter()
+    player = Player(name='New', url='www.player.com/3')
+    existence.player_repository.save(player)
+    existence.statistic_repository.sync_statistics(2, [
+        Statistic(statistic_code_id=3, schedule_id=2, value=1, category_id=1, team_id=2)])
+
+    assert_that(existence.player_exits(player)).is_true()
+    assert_that(existence.statistic_exists(
+        Statistic(statistic_code_id=3, schedule_id=2, value=0, category_id=1))).is_true()
+
+
+def test_refresh_after_external_write():
+    """
+    Tests rows written by another process are seen once refresh finds the tables changed.
+    """
+    existence, _ = create_filter()
+    player = Player(name='New', url='www.player.com/3')
+    PlayerRepository(existence.maker).save(player)
+
+    assert_that(existence.player_exits(player)).is_false()
+    assert_that(existence.refresh()).is_true()
+    assert_that(existence.player_exits(player)).is_true()
+    assert_that(existence.refresh()).is_false()
+
+
+def test_refresh_when_due():
+    """
+    Tests checks refresh the filters once max_age seconds passed since the last check.
+    """
+    maker = TEMPLATE.clone()
+    existence = ExistenceFilter(maker, max_age=0)
+    existence.build()
+    player = Player(name='New', url='www.player.com/3')
+    PlayerRepository(maker).save(player)
+
+    assert_that(existence.player_exits(player)).is_true()
+
+
+def test_save_and_load(tmp_path):
+    """
+    Tests persisted filters answer like the built ones and reset the observed figures.
+    """
+    existence, _ = create_filter()
+    existence.player_exits(Player(name='New', url='www.player.com/3'))
+    existence.save(tmp_path / 'existence.bloom')
+
+    loaded = ExistenceFilter(existence.maker)
+    loaded.load(tmp_path / 'existence.bloom')
+
+    assert_that(loaded.player_exits(Player(name='Player Two', url='www.player.com/2'))).is_true()
+    assert_that(loaded.report()['statistics']).contains_entry(
+        {'keys': existence.statistics.count})
+    assert_that(loaded.report()['players']).contains_entry({'definite_negatives': 0})
+    assert_that(loaded.version).is_equal_to(existence.version)
+    assert_that(loaded.refresh()).is_false()
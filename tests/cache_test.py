@@ -0,0 +1,174 @@
+"""
+Tests for the Statistic Result Cache.
+"""
+
+from assertpy import assert_that
+from sqlalchemy import event
+
+from football_data.cache import CachedStatisticRepository, LRUCacheBackend, SQLiteCacheBackend
+from football_data.models import Statistic
+from football_data.repositories import bound_engine
+from football_data.testing import TemplateDatabase
+
+TEMPLATE = TemplateDatabase()
+
+
+def create_repository(backend=None) -> tuple[CachedStatisticRepository, list[str]]:
+    """
+    Creates a Cached Statistic Repository with two schedules of statistics and records the
+    statements it executes.
+    :param backend: Cache Backend
+    :return: Repository and executed statements
+    """
+    maker = TEMPLATE.clone()
+    repo = CachedStatisticRepository(maker, backend)
+    repo.save_all([
+        Statistic(statistic_code_id=1, schedule_id=1, value=20, category_id=1, team_id=1),
+        Statistic(statistic_code_id=1, schedule_id=1, value=10, category_id=1, player_id=5),
+        Statistic(statistic_code_id=1, schedule_id=2, value=30, category_id=1, team_id=2)])
+    statements = []
+    event.listen(bound_engine(maker), 'before_cursor_execute',
+                 lambda *args: statements.append(args[2]))
+    return repo, statements
+
+
+def test_get_statistics_read_through():
+    """
+    Tests repeated reads of a schedule are served from the cache.
+    """
+    repo, statements = create_repository()
+
+    first = repo.get_statistics(schedule_id=1)
+    second = repo.get_statistics(schedule_id=1)
+    team = repo.get_statistics(schedule_id=1, team_id=1)
+    repo.get_statistics(schedule_id=1, team_id=1)
+
+    assert_that(statements).is_length(2)
+    assert_that(second).is_equal_to(first).is_length(2)
+    assert_that(team).extracting('value').contains_only(20)
+    assert_that(repo).has_hits(2).has_misses(2)
+
+
+def test_get_statistics_without_schedule():
+    """
+    Tests reads without a schedule are not cached.
+    """
+    repo, statements = create_repository()
+
+    repo.get_statistics(team_id=1)
+    repo.get_statistics(team_id=1)
+
+    assert_that(statements).is_length(2)
+
+
+def test_save_invalidates_schedule():
+    """
+    Tests writing a statistic invalidates only the cached results of its schedule.
+    """
+    repo, statements = create_repository()
+    repo.get_statistics(schedule_id=1)
+    repo.get_statistics(schedule_id=2)
+
+    repo.save(Statistic(statistic_code_id=2, schedule_id=1, value=5, category_id=1, team_id=1))
+    statements.clear()
+
+    assert_that(repo.get_statistics(schedule_id=1)).is_length(3)
+    assert_that(repo.get_statistics(schedule_id=2)).is_length(1)
+    assert_that(statements).is_length(1)
+
+
+def test_lru_eviction():
+    """
+    Tests the least recently used values are evicted beyond the capacity.
+    """
+    backend = LRUCacheBackend(capacity=2)
+    backend.set('1', 'a', [1])
+    backend.set('2', 'a', [2])
+    backend.get('1', 'a')
+    backend.set('3', 'a', [3])
+
+    assert_that(len(backend)).is_equal_to(2)
+    assert_that(backend.get('2', 'a')).is_none()
+    assert_that(backend.get('1', 'a')).is_equal_to([1])
+
+
+def test_sqlite_backend(tmp_path):
+    """
+    Tests the SQLite backend is shared between instances and evicts beyond the capacity.
+    """
+    backend = SQLiteCacheBackend(tmp_path / 'cache.db', capacity=2, eviction_interval=1)
+    repo, statements = create_repository(backend)
+    other, _ = create_repository(SQLiteCacheBackend(tmp_path / 'cache.db', capacity=2))
+    repo.get_statistics(schedule_id=1)
+
+    assert_that(other.get_statistics(schedule_id=1)).extracting('value').contains_only(20, 10)
+    assert_that(other).has_hits(1)
+
+    backend.set('7', 'a', [7])
+    backend.set('8', 'a', [8])
+    assert_that(backend.get('1', '{}')).is_none()
+    backend.invalidate('8')
+    assert_that(backend.get('8', 'a')).is_none()
+    assert_that(backend.get('7', 'a')).is_equal_to([7])
+    assert_that(statements).is_length(1)
+
+
+def test_sqlite_backend_evicts_in_intervals(tmp_path):
+    """
+    Tests the SQLite backend only counts and evicts values every eviction interval.
+    """
+    backend = SQLiteCacheBackend(tmp_path / 'cache.db', capacity=1, eviction_interval=3)
+    backend.set('1', 'a', [1])
+    backend.set('2', 'a', [2])
+
+    assert_that(backend.get('1', 'a')).is_equal_to([1])
+    backend.set('3', 'a', [3])
+    assert_that([backend.get(namespace, 'a') for namespace in '123']).is_equal_to(
+        [None, None, [3]])
+
+
+def test_sync_statistics_invalidates():
+    """
+    Tests synchronizing a schedule invalidates its cached results.
+    """
+    repo, _ = create_repository()
+    repo.get_statistics(schedule_id=1)
+
+    repo.sync_statistics(1, [
+        Statistic(statistic_code_id=1, schedule_id=1, value=25, category_id=1, team_id=1)])
+
+    assert_that(repo.get_statistics(schedule_id=1)).extracting('value').contains_only(25.0)
+    assert_that(repo).has_misses(2)
+
+
+def test_invalidation_during_read(tmp_path):
+    """
+    Tests a result read while its schedule is invalidated is not cached, for both backends.
+    """
+    for backend in (LRUCacheBackend(), SQLiteCacheBackend(tmp_path / 'cache.db')):
+        repo, _ = create_repository(backend)
+        event.listen(bound_engine(repo.maker), 'before_cursor_execute',
+                     lambda *args, target=backend: target.invalidate('1'), once=True)
+
+        repo.get_statistics(schedule_id=1)
+        repo.get_statistics(schedule_id=1)
+        assert_that(repo).has_misses(2).has_hits(0)
+
+        repo.get_statistics(schedule_id=1)
+        assert_that(repo).has_hits(1)
+
+
+def test_lru_invalidate_keeps_other_namespaces():
+    """
+    Tests invalidating a namespace removes only its values.
+    """
+    backend = LRUCacheBackend()
+    backend.set('1', 'a', [1])
+    backend.set('1', 'b', [2])
+    backend.set('2', 'a', [3])
+    backend.invalidate('1')
+
+    assert_that(len(backend)).is_equal_to(1)
+    assert_that(backend.get('2', 'a')).is_equal_to([3])
+    backend.set('1', 'a', [4], generation=0)
+    assert_that(backend.get('1', 'a')).is_none()
@@ -0,0 +1,118 @@
+"""
+Tests for the Game Lock Repository.
+"""
+
+import threading
+from datetime import timedelta
+
+from assertpy import assert_that
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from football_data.ingest import GameLockRepository
+from football_data.models import GameLock, utcnow
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    return TEMPLATE.clone()
+
+
+def test_claim_game():
+    """
+    Tests claiming a game records the owner and releases it afterwards.
+    """
+    maker = create_maker()
+    repo = GameLockRepository(maker, owner='worker-1')
+
+    with repo.claim_game(665566) as claimed:
+        assert_that(claimed).is_true()
+        with maker() as session:
+            lock = session.scalars(select(GameLock)).first()
+        assert_that(lock).has_game_id(665566).has_owner('worker-1')
+
+    with maker() as session:
+        assert_that(session.scalars(select(GameLock)).first()).is_none()
+
+
+def test_claim_game_already_claimed():
+    """
+    Tests a second worker cannot claim a game that is claimed.
+    """
+    maker = create_maker()
+    first = GameLockRepository(maker, owner='worker-1')
+    second = GameLockRepository(maker, owner='worker-2')
+
+    with first.claim_game(665566) as first_claimed:
+        with second.claim_game(665566) as second_claimed:
+            assert_that(first_claimed).is_true()
+            assert_that(second_claimed).is_false()
+        with second.claim_game(665567) as other_claimed:
+            assert_that(other_claimed).is_true()
+
+    with second.claim_game(665566) as claimed:
+        assert_that(claimed).is_true()
+
+
+def test_claim_game_shared_between_threads():
+    """
+    Tests threads sharing a repository claim as separate owners, so a thread cannot release the
+    claim of another.
+    """
+    maker = create_maker()
+    repo = GameLockRepository(maker)
+    results = {}
+
+    def claim() -> None:
+        with repo.claim_game(665566) as claimed:
+            with maker() as session:
+                results['owner'] = session.scalars(select(GameLock.owner).where(
+                    GameLock.game_id == 665566)).one()
+            results['claimed'] = claimed
+            results['thread'] = threading.get_ident()
+
+    with repo.claim_game(665567) as claimed:
+        thread = threading.Thread(target=claim)
+        thread.start()
+        thread.join()
+        assert_that(claimed).is_true()
+        with maker() as session:
+            owners = session.scalars(select(GameLock.owner)).all()
+
+    assert_that(results['claimed']).is_true()
+    assert_that(results['owner']).ends_with(f':{results["thread"]}')
+    assert_that(owners).is_length(1)
+    assert_that(owners[0]).ends_with(f':{threading.get_ident()}')
+
+
+def test_claim_game_wait_timeout():
+    """
+    Tests waiting for a claim gives up after the timeout.
+    """
+    maker = create_maker()
+    first = GameLockRepository(maker, owner='worker-1')
+    second = GameLockRepository(maker, owner='worker-2')
+
+    with first.claim_game(665566):
+        with second.claim_game(665566, wait=True, timeout=0.05) as claimed:
+            assert_that(claimed).is_false()
+
+
+def test_claim_game_stale_lock():
+    """
+    Tests an abandoned claim is taken over after it goes stale.
+    """
+    maker = create_maker()
+    repo = GameLockRepository(maker, owner='worker-2', stale_after=60)
+    repo.save(GameLock(game_id=665566, owner='worker-1',
+                       claimed_at=utcnow() - timedelta(minutes=5)))
+
+    with repo.claim_game(665566) as claimed:
+        assert_that(claimed).is_true()
@@ -0,0 +1,163 @@
+"""
+Tests for the Game Repository.
+"""
+
+from assertpy import assert_that
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import sessionmaker
+
+from football_data.ingest import (GameRepository, GamePayload, GameTeam, GamePlayer,
+                                  GameStatistic)
+from football_data.models import Player, Schedule, Statistic, Team, TeamStaff
+from football_data.repositories import bound_engine
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    return TEMPLATE.clone()
+
+
+def create_payload() -> GamePayload:
+    """
+    Creates a Game Payload.
+    :return: Game Payload
+    """
+    home = GameTeam(url='www.home.com', code='HOM', name='Home')
+    away = GameTeam(url='www.away.com', code='AWY', name='Away')
+    return GamePayload(
+        game_id=665566, year_value=2020, week_number=3, type_id=1, url='www.game.com',
+        home=home, away=away,
+        players=[GamePlayer(url='www.p1.com', name='Jim Smith', team_url=home.url),
+                 GamePlayer(url='www.p2.com', name='Bob Jones', team_url=away.url,
+                            position_id=2)],
+        statistics=[GameStatistic(statistic_code_id=1, category_id=1, value=100,
+                                  team_url=home.url, player_url='www.p1.com'),
+                    GameStatistic(statistic_code_id=1, category_id=1, value=50,
+                                  team_url=away.url, player_url='www.p2.com'),
+                    GameStatistic(statistic_code_id=2, category_id=1, value=21,
+                                  team_url=home.url),
+                    GameStatistic(statistic_code_id=2, category_id=1, value=14,
+                                  team_url=away.url)])
+
+
+def test_ingest_game():
+    """
+    Tests ingesting a game creates all dependencies with foreign keys.
+    """
+    maker = create_maker()
+    repo = GameRepository(maker)
+
+    result = repo.ingest_game(create_payload())
+
+    assert_that(result).has_teams_created(2).has_players_created(2).has_staff_created(2) \
+        .has_schedules_created(2).has_statistics_created(4)
+
+    with maker() as session:
+        teams = {team.url: team.id for team in session.scalars(select(Team))}
+        players = {player.url: player.id for player in session.scalars(select(Player))}
+        schedules = list(session.scalars(select(Schedule)))
+        staff = list(session.scalars(select(TeamStaff)))
+        statistics = list(session.scalars(select(Statistic)))
+
+    assert_that(schedules).extracting('team_id', 'opponent_id', 'is_home', 'id').contains_only(
+        (teams['www.home.com'], teams['www.away.com'], True, result.home_schedule_id),
+        (teams['www.away.com'], teams['www.home.com'], False, result.away_schedule_id))
+    assert_that(staff).extracting('player_id', 'team_id', 'year_value').contains_only(
+        (players['www.p1.com'], teams['www.home.com'], 2020),
+        (players['www.p2.com'], teams['www.away.com'], 2020))
+    assert_that(statistics).extracting('schedule_id', 'player_id', 'team_id', 'value') \
+        .contains_only((result.home_schedule_id, players['www.p1.com'], None, 100),
+                       (result.away_schedule_id, players['www.p2.com'], None, 50),
+                       (result.home_schedule_id, None, teams['www.home.com'], 21),
+                       (result.away_schedule_id, None, teams['www.away.com'], 14))
+
+
+def test_ingest_game_reuses_existing_rows():
+    """
+    Tests ingesting a game twice reuses existing rows and creates nothing.
+    """
+    maker = create_maker()
+    repo = GameRepository(maker)
+    repo.save(Team(url='www.home.com', code='HOM', name='Home'))
+    first = repo.ingest_game(create_payload())
+
+    second = repo.ingest_game(create_payload())
+
+    assert_that(first).has_teams_created(1)
+    assert_that(second).has_teams_created(0).has_players_created(0).has_staff_created(0) \
+        .has_schedules_created(0).has_statistics_created(0) \
+        .has_home_schedule_id(first.home_schedule_id)
+    with maker() as session:
+        assert_that(list(session.scalars(select(Statistic)))).is_length(4)
+
+
+def test_ingest_game_existing_statistics_without_year():
+    """
+    Tests statistics stored before they had a year are found and not inserted again.
+    """
+    maker = create_maker()
+    repo = GameRepository(maker)
+    first = repo.ingest_game(create_payload())
+    with maker() as session:
+        session.execute(update(Statistic).values(year_value=None))
+        session.commit()
+
+    assert_that(repo.ingest_game(create_payload())).has_statistics_created(0)
+    with maker() as session:
+        assert_that(list(session.scalars(select(Statistic)))).extracting(
+            'schedule_id').contains(first.home_schedule_id).is_length(4)
+
+
+def test_ingest_game_validates_payload():
+    """
+    Tests a payload referring to a player or team outside the game is rejected before writing.
+    """
+    maker = create_maker()
+    repo = GameRepository(maker)
+    payload = create_payload()
+    payload.statistics.append(GameStatistic(statistic_code_id=3, category_id=1, value=1,
+                                            team_url='www.home.com', player_url='www.p3.com'))
+    other_team = create_payload()
+    other_team.players[0].team_url = 'www.other.com'
+
+    assert_that(repo.ingest_game).raises(ValueError).when_called_with(payload) \
+        .contains('www.p3.com')
+    assert_that(repo.ingest_game).raises(ValueError).when_called_with(other_team) \
+        .contains('www.other.com')
+    with maker() as session:
+        assert_that(list(session.scalars(select(Team)))).is_empty()
+
+
+def count_statements(payload: GamePayload) -> int:
+    """
+    Counts the statements issued to ingest a game.
+    :param payload: Game Payload
+    :return: Statement count
+    """
+    maker = create_maker()
+    statements = []
+    event.listen(bound_engine(maker), 'before_cursor_execute',
+                 lambda *args: statements.append(args[2]))
+    GameRepository(maker).ingest_game(payload)
+    return len(statements)
+
+
+def test_ingest_game_round_trips():
+    """
+    Tests the number of statements does not grow with the number of statistics.
+    """
+    payload = create_payload()
+    large_payload = create_payload()
+    large_payload.statistics = [
+        GameStatistic(statistic_code_id=code, category_id=1, value=code,
+                      team_url=item.team_url, player_url=item.player_url)
+        for code in range(100) for item in payload.statistics]
+
+    assert_that(count_statements(large_payload)).is_equal_to(count_statements(payload))
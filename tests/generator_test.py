@@ -0,0 +1,128 @@
+"""
+Tests for the League Data Generator.
+"""
+
+from datetime import datetime
+
+from assertpy import assert_that
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from football_data.generator import LeagueDataGenerator
+from football_data.models import Player, Schedule, Statistic, Team, TeamStaff, utcnow
+from football_data.repositories import StatisticRepository, Watermark
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    engine = create_engine('sqlite://')
+    Team.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def read_rows(maker: sessionmaker, model) -> list[tuple]:
+    """
+    Reads all rows of a table as tuples.
+    :param maker: Session Maker
+    :param model: Model Class
+    :return: List of Rows
+    """
+    with maker() as session:
+        return [tuple(row) for row in session.execute(
+            select(model.__table__).order_by(model.id))]
+
+
+def test_load_counts():
+    """
+    Tests the generated row counts follow the league shape.
+    """
+    maker = create_maker()
+
+    result = LeagueDataGenerator(seed=1, seasons=2, teams=4, weeks=3).load(maker)
+
+    assert_that(result.rows).contains_entry({'team': 4}, {'players': 2 * 4 * 53},
+                                            {'team_staff': 2 * 4 * 53},
+                                            {'schedule': 2 * 3 * 4})
+    assert_that(result.rows['statistics']).is_equal_to(len(read_rows(maker, Statistic)))
+
+
+def test_load_deterministic():
+    """
+    Tests the same seed produces the same data and a different seed different data.
+    """
+    first = create_maker()
+    second = create_maker()
+    third = create_maker()
+
+    LeagueDataGenerator(seed=7, teams=4, weeks=2, backdate=True).load(first)
+    LeagueDataGenerator(seed=7, teams=4, weeks=2, backdate=True).load(second)
+    LeagueDataGenerator(seed=8, teams=4, weeks=2, backdate=True).load(third)
+
+    assert_that(read_rows(first, Statistic)).is_equal_to(read_rows(second, Statistic))
+    assert_that(read_rows(first, Schedule)).is_equal_to(read_rows(second, Schedule))
+    assert_that(read_rows(first, Statistic)).is_not_equal_to(read_rows(third, Statistic))
+    assert_that({row[-2] for row in read_rows(first, Statistic)}).is_equal_to(
+        {datetime(2020, 9, 1), datetime(2020, 9, 8)})
+
+
+def test_load_stamps_load_time():
+    """
+    Tests loaded rows are stamped with the load time by default, so change feeds see them.
+    """
+    maker = create_maker()
+    start = utcnow()
+    LeagueDataGenerator(seed=7, teams=4, weeks=2).load(maker)
+
+    repo = StatisticRepository(maker)
+    assert_that(list(repo.get_statistic_changes(since=Watermark(start, 0), lag=0))).is_not_empty()
+
+
+def test_load_paired_schedules():
+    """
+    Tests every game has a home and an away schedule entry with mirrored teams.
+    """
+    maker = create_maker()
+    LeagueDataGenerator(seed=3, teams=6, weeks=4).load(maker)
+
+    with maker() as session:
+        schedules = list(session.scalars(select(Schedule)))
+        staff = {(item.player_id, item.team_id) for item in session.scalars(select(TeamStaff))}
+        stats = list(session.scalars(select(Statistic)))
+
+    games: dict[int, list[Schedule]] = {}
+    for schedule in schedules:
+        games.setdefault(schedule.game_id, []).append(schedule)
+    assert_that(games).is_length(3 * 4)
+    for home, away in games.values():
+        assert_that([home.is_home, away.is_home]).contains_only(True, False)
+        assert_that((home.team_id, home.opponent_id)).is_equal_to((away.opponent_id,
+                                                                   away.team_id))
+
+    teams = {schedule.id: schedule.team_id for schedule in schedules}
+    player_stats = [stat for stat in stats if stat.player_id]
+    assert_that(player_stats).is_not_empty()
+    for stat in player_stats:
+        assert_that(staff).contains((stat.player_id, teams[stat.schedule_id]))
+    assert_that([stat.value for stat in stats]).does_not_contain(-1.0)
+
+
+def test_load_continues_identifiers():
+    """
+    Tests a second load continues after the existing identifiers.
+    """
+    maker = create_maker()
+    LeagueDataGenerator(seed=1, teams=2, weeks=1).load(maker)
+    LeagueDataGenerator(seed=1, teams=2, weeks=1, first_year=2021).load(maker)
+
+    assert_that(read_rows(maker, Player)).is_length(2 * 2 * 53)
+    assert_that(read_rows(maker, Schedule)).is_length(4)
+
+
+def test_invalid_teams():
+    """
+    Tests an odd number of teams is rejected.
+    """
+    assert_that(LeagueDataGenerator).raises(ValueError).when_called_with(teams=3)
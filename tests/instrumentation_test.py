@@ -0,0 +1,138 @@
+"""
+Tests for the Repository Instrumentation.
+"""
+
+from assertpy import assert_that
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from football_data.instrumentation import RepositoryMetrics, count_rows
+from football_data.models import Player, Position, Schedule
+from football_data.repositories import (PlayerRepository, PositionCodeRepository,
+                                        ScheduleRepository)
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    engine = create_engine('sqlite://')
+    Player.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def test_instrument_repository():
+    """
+    Tests metrics are collected for each repository method.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    metrics = RepositoryMetrics()
+    metrics.instrument(repo)
+
+    repo.save_all([Player(url='www.p1.com', name='Jim Smith'),
+                   Player(url='www.p2.com', name='Bob Jones')])
+    repo.get_players()
+    repo.get_players()
+    repo.get_player(url='www.p3.com')
+
+    snapshot = metrics.snapshot()
+    assert_that(snapshot).contains_key('PlayerRepository.get_players',
+                                       'PlayerRepository.get_player',
+                                       'PlayerRepository.save_all')
+    assert_that(snapshot['PlayerRepository.get_players']).contains_entry(
+        {'calls': 2}, {'errors': 0}, {'statements': 2}, {'rows': 4}, {'sessions_opened': 2},
+        {'sessions_closed': 2})
+    assert_that(snapshot['PlayerRepository.get_player']).contains_entry({'rows': 0})
+    assert_that(snapshot['PlayerRepository.get_players']['wall_time']).is_greater_than(0)
+
+
+def test_instrument_errors():
+    """
+    Tests errors are counted.
+    """
+    engine = create_engine('sqlite://')
+    repo = PlayerRepository(sessionmaker(bind=engine))
+    metrics = RepositoryMetrics()
+
+    with metrics.instrumented(repo):
+        assert_that(repo.get_players).raises(Exception).when_called_with()
+
+    assert_that(metrics.snapshot()['PlayerRepository.get_players']).contains_entry(
+        {'calls': 1}, {'errors': 1}, {'statements': 1})
+
+
+def test_instrument_generator():
+    """
+    Tests statements and rows of a generator are recorded while it is consumed.
+    """
+    maker = create_maker()
+    repo = ScheduleRepository(maker)
+    repo.save_all([Schedule(team_id=1, opponent_id=2, year_value=2020, week_number=week,
+                            game_id=week, url='www.google.com', type_id=1, is_home=True)
+                   for week in range(1, 6)])
+    metrics = RepositoryMetrics()
+
+    key = 'ScheduleRepository.get_schedule_changes'
+
+    with metrics.instrumented(repo):
+        changes = repo.get_schedule_changes(batch_size=2, lag=0)
+        assert_that(metrics.snapshot()[key]).contains_entry(
+            {'calls': 1}, {'statements': 0}, {'rows': 0})
+        assert_that(list(changes)).is_length(3)
+
+    assert_that(metrics.snapshot()[key]).contains_entry(
+        {'calls': 1}, {'errors': 0}, {'statements': 3}, {'rows': 5}, {'sessions_opened': 3},
+        {'sessions_closed': 3})
+
+
+def test_uninstrument():
+    """
+    Tests no metrics are collected after the repository is uninstrumented.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    metrics = RepositoryMetrics()
+
+    with metrics.instrumented(repo):
+        repo.get_players()
+    repo.get_players()
+
+    assert_that(metrics.snapshot()['PlayerRepository.get_players']).contains_entry(
+        {'calls': 1}, {'statements': 1})
+    assert_that(repo.__dict__).does_not_contain_key('get_players', '_session')
+
+
+def test_to_prometheus():
+    """
+    Tests exporting the metrics in the Prometheus text format.
+    """
+    maker = create_maker()
+    repo = PositionCodeRepository(maker)
+    metrics = RepositoryMetrics()
+    metrics.instrument(repo)
+    repo.save(Position(code='QB', description='Quarterback'))
+    repo.get_position_codes()
+
+    result = metrics.to_prometheus()
+
+    assert_that(result).contains(
+        '# TYPE football_data_repository_calls_total counter',
+        'football_data_repository_calls_total{repository="PositionCodeRepository",'
+        'method="get_position_codes"} 1',
+        'football_data_repository_rows_total{repository="PositionCodeRepository",'
+        'method="get_position_codes"} 1',
+        'football_data_repository_statements_total{repository="PositionCodeRepository",'
+        'method="save"} 1')
+
+
+def test_count_rows():
+    """
+    Tests counting the rows of return values.
+    """
+    assert_that(count_rows([1, 2])).is_equal_to(2)
+    assert_that(count_rows({1: [1, 2], 2: [3]})).is_equal_to(3)
+    assert_that(count_rows(Position(code='QB', description='Quarterback'))).is_equal_to(1)
+    assert_that(count_rows(None)).is_equal_to(0)
+    assert_that(count_rows(True)).is_equal_to(1)
@@ -3,11 +3,14 @@ League Repository Tests.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import League
 from football_data.repositories import LeagueRepository
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
@@ -15,9 +18,7 @@ def create_maker() -> sessionmaker:
     Creates the Session Maker.
     :return: sessionmaker
     """
-    engine = create_engine('sqlite://')
-    League.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_league_exists():
@@ -0,0 +1,76 @@
+"""
+Tests for the Memory Report.
+"""
+
+import tracemalloc
+
+from assertpy import assert_that
+
+from football_data.memory import MemoryReport, count_models
+from football_data.models import Player, Statistic
+from football_data.repositories import PlayerRepository
+from football_data.testing import TemplateDatabase
+
+TEMPLATE = TemplateDatabase(seed=lambda maker: PlayerRepository(maker).save_all(
+    [Player(url=f'www.player{index}.com', name=f'Player {index}') for index in range(200)]))
+
+
+class RosterRepository(PlayerRepository):
+    """
+    Repository calling another public method.
+    """
+
+    def get_roster(self) -> list[Player]:
+        """
+        Returns all players.
+        :return: List of Players
+        """
+        return self.get_players()
+
+
+def test_memory_per_call():
+    """
+    Tests peak and retained memory are recorded per call and per model.
+    """
+    repo = PlayerRepository(TEMPLATE.clone())
+    report = MemoryReport()
+
+    with report.instrumented(repo):
+        players = repo.get_players()
+        repo.get_player(id=1)
+
+    snapshot = report.snapshot()
+    get_players = snapshot['methods']['PlayerRepository.get_players']
+    assert_that(get_players).has_calls(1).has_rows(200)
+    assert_that(get_players['retained']).is_greater_than(200 * 100)
+    assert_that(get_players['max_peak']).is_greater_than_or_equal_to(get_players['retained'])
+    assert_that(snapshot['models']['Player']['rows']).is_equal_to(201)
+    assert_that(snapshot['models']['Player']['bytes_per_row']).is_greater_than(100)
+    assert_that(report.format()).contains('PlayerRepository.get_players', 'bytes/row')
+    assert_that(players).is_length(200)
+    assert_that(tracemalloc.is_tracing()).is_false()
+    assert_that(vars(repo)).does_not_contain_key('get_players')
+
+
+def test_memory_nested_calls():
+    """
+    Tests only the outermost repository call is measured.
+    """
+    repo = RosterRepository(TEMPLATE.clone())
+    report = MemoryReport()
+
+    with report.instrumented(repo):
+        repo.get_roster()
+
+    assert_that(report.snapshot()['methods']).contains_only('RosterRepository.get_roster')
+
+
+def test_count_models():
+    """
+    Tests the returned models are counted by type.
+    """
+    result = {1: [Statistic(statistic_code_id=1, schedule_id=1, value=1, category_id=1)],
+              2: [Player(url='www.player.com', name='Player')]}
+
+    assert_that(count_models(result)).is_equal_to({'Statistic': 1, 'Player': 1})
+    assert_that(count_models(True)).is_empty()
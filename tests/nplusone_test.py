@@ -0,0 +1,87 @@
+"""
+Tests for the N+1 Detector.
+"""
+
+import warnings
+
+from assertpy import assert_that
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from football_data.exceptions import NPlusOneError, NPlusOneWarning
+from football_data.instrumentation import RepositoryMetrics
+from football_data.models import Player
+from football_data.nplusone import NPlusOneDetector
+from football_data.repositories import PlayerRepository, StatisticRepository
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    engine = create_engine('sqlite://')
+    Player.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def test_repeated_lookups_raise():
+    """
+    Tests looping over single row lookups raises with the call site.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    detector = NPlusOneDetector(threshold=3)
+
+    def load():
+        with detector.watch(maker):
+            for player_id in range(5):
+                repo.get_player(id=player_id)
+
+    assert_that(load).raises(NPlusOneError).when_called_with() \
+        .contains('5 executions').contains('nplusone_test.py').contains('in load')
+
+
+def test_lookups_under_threshold():
+    """
+    Tests lookups within the threshold and list queries are not reported.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    detector = NPlusOneDetector(threshold=3)
+
+    with detector.watch(maker):
+        for player_id in range(3):
+            repo.get_player(id=player_id)
+        for _ in range(5):
+            repo.get_players()
+        StatisticRepository(maker).get_statistics_by_schedule(list(range(5)), chunk_size=1)
+
+    assert_that(detector.violations()).is_empty()
+
+
+def test_repeated_lookups_warn():
+    """
+    Tests the warn action issues a warning naming the repository method.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    detector = NPlusOneDetector(threshold=1, action='warn')
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        with RepositoryMetrics().instrumented(repo), detector.watch(maker):
+            repo.get_player(id=1)
+            repo.get_player(id=2)
+
+    assert_that(caught).is_length(1)
+    assert_that(caught[0].category).is_equal_to(NPlusOneWarning)
+    assert_that(str(caught[0].message)).contains('PlayerRepository.get_player')
+    assert_that(detector.violations()[0].count).is_equal_to(2)
+
+
+def test_invalid_action():
+    """
+    Tests an unknown action is rejected.
+    """
+    assert_that(NPlusOneDetector).raises(ValueError).when_called_with(action='ignore')
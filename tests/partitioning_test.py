@@ -0,0 +1,95 @@
+"""
+Tests for the Season Partitioning Helpers.
+"""
+
+from assertpy import assert_that
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from football_data.models import Schedule, Statistic
+from football_data.partitioning import (add_statistic_year, add_updated_at,
+                                        create_partitioned_tables, create_partitions,
+                                        partition_ddl, partitioned_table_ddl)
+from football_data.repositories import ScheduleRepository, StatisticRepository
+
+
+def test_partitioned_table_ddl():
+    """
+    Tests the statistics table is partitioned by year with the year in the primary key.
+    """
+    create, index, default = partitioned_table_ddl(Statistic)
+
+    assert_that(create).starts_with('CREATE TABLE statistics (') \
+        .contains('year_value INTEGER NOT NULL', 'id BIGSERIAL NOT NULL',
+                  'PRIMARY KEY (id, year_value)') \
+        .ends_with('PARTITION BY RANGE (year_value)')
+    assert_that(index).is_equal_to(
+        'CREATE INDEX ix_statistics_updated_at ON statistics (updated_at)')
+    assert_that(default).is_equal_to(
+        'CREATE TABLE IF NOT EXISTS statistics_default PARTITION OF statistics DEFAULT')
+
+
+def test_partition_ddl():
+    """
+    Tests the partition of a season covers that year only.
+    """
+    assert_that(partition_ddl(Schedule, 2023)).is_equal_to(
+        'CREATE TABLE IF NOT EXISTS schedule_2023 PARTITION OF schedule '
+        'FOR VALUES FROM (2023) TO (2024)')
+
+
+def test_sqlite_without_partitions():
+    """
+    Tests SQLite gets plain tables and no partitions.
+    """
+    engine = create_engine('sqlite://')
+    create_partitioned_tables(engine, [2023])
+
+    assert_that(inspect(engine).get_table_names()).contains_only('schedule', 'statistics')
+    assert_that(create_partitions(engine, [2024])).is_empty()
+
+
+def test_add_statistic_year():
+    """
+    Tests the year column is added to an existing table and set from the schedules.
+    """
+    engine = create_engine('sqlite://')
+    Schedule.metadata.create_all(bind=engine, tables=[Schedule.__table__])
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE statistics (statistic_code_id BIGINT NOT NULL, schedule_id BIGINT NOT '
+            'NULL, value REAL NOT NULL, category_id INTEGER NOT NULL, player_id BIGINT, '
+            'team_id INTEGER, updated_at DATETIME NOT NULL, id INTEGER NOT NULL PRIMARY KEY)')
+        connection.exec_driver_sql(
+            "INSERT INTO schedule VALUES (1, 2, 2022, 1, 1, 'www.google.com', 1, 1, "
+            "'2022-09-01 00:00:00', 1)")
+        connection.exec_driver_sql(
+            "INSERT INTO statistics VALUES (1, 1, 20, 1, NULL, 1, '2022-09-01 00:00:00', 1)")
+
+    assert_that(add_statistic_year(engine)).is_equal_to(1)
+    assert_that(add_statistic_year(engine)).is_equal_to(0)
+    repo = StatisticRepository(sessionmaker(bind=engine, expire_on_commit=False))
+    assert_that(repo.get_statistics(year=2022)).extracting('id').contains_only(1)
+
+
+def test_add_updated_at():
+    """
+    Tests the updated at column and index are added to an existing table and set on its rows.
+    """
+    engine = create_engine('sqlite://')
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE schedule (team_id INTEGER NOT NULL, opponent_id INTEGER NOT NULL, '
+            'year_value INTEGER NOT NULL, week_number INTEGER NOT NULL, game_id BIGINT NOT NULL, '
+            'url VARCHAR(255) NOT NULL, type_id INTEGER NOT NULL, is_home BOOLEAN NOT NULL, '
+            'id INTEGER NOT NULL PRIMARY KEY)')
+        connection.exec_driver_sql(
+            "INSERT INTO schedule VALUES (1, 2, 2022, 1, 1, 'www.google.com', 1, 1, 1)")
+
+    assert_that(add_updated_at(engine)).is_equal_to(1)
+    assert_that(add_updated_at(engine)).is_equal_to(0)
+    assert_that(inspect(engine).get_indexes('schedule')).extracting('name').contains_only(
+        'ix_schedule_updated_at')
+    repo = ScheduleRepository(sessionmaker(bind=engine, expire_on_commit=False))
+    changes = list(repo.get_schedule_changes(lag=0))
+    assert_that(changes[0].items).extracting('id').contains_only(1)
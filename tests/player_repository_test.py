@@ -3,21 +3,21 @@ Tests for the Player Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import Player, Position
 from football_data.repositories import PlayerRepository
+from football_data.testing import TemplateDatabase
 
 
-def create_maker():
+TEMPLATE = TemplateDatabase()
+
+
+def create_maker() -> sessionmaker:
     """
     Creates the SQL Alchemy Session Maker.
     """
-
-    engine = create_engine('sqlite://')
-    Player.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_player_exists():
@@ -3,20 +3,21 @@ Repository Tests for Position Codes.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import Position
 from football_data.repositories import PositionCodeRepository
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
     """
     Creates the Session Maker.
     """
-    engine = create_engine('sqlite://')
-    Position.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_position_code_exists():
@@ -0,0 +1,91 @@
+"""
+Tests for the Repository Profiler.
+"""
+
+import threading
+
+from assertpy import assert_that
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from football_data.instrumentation import RepositoryMetrics
+from football_data.models import Player
+from football_data.profiling import RepositoryProfiler
+from football_data.repositories import PlayerRepository
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False},
+                           poolclass=StaticPool)
+    Player.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def test_profile_traces_statements():
+    """
+    Tests the statements are traced in order with the repository method.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    profiler = RepositoryProfiler()
+
+    with RepositoryMetrics().instrumented(repo), profiler.profile(maker):
+        repo.save(Player(url='www.player.com', name='Player'))
+        repo.get_player(url='www.player.com')
+
+    assert_that(profiler.queries).extracting('call').contains(
+        'PlayerRepository.save', 'PlayerRepository.get_player')
+    offsets = [query.offset for query in profiler.queries]
+    assert_that(offsets).is_equal_to(sorted(offsets))
+    assert_that(profiler.queries[-1].statement).starts_with('SELECT')
+    assert_that(profiler.queries[-1].parameters).is_equal_to(('www.player.com',))
+    assert_that(profiler.sql_time).is_less_than_or_equal_to(profiler.duration)
+    assert_that(profiler.report()).starts_with('Total').contains('2 statements', 'cumtime')
+
+
+def test_profile_collapsed_stacks(tmp_path):
+    """
+    Tests the collapsed stacks show the SQL frames below the repository method.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    profiler = RepositoryProfiler(statement_length=20)
+
+    with profiler.profile(maker):
+        repo.get_players()
+
+    lines = profiler.collapsed()
+    sql = [line for line in lines if ';SQL ' in line]
+    assert_that(sql).is_length(1)
+    assert_that(sql[0]).starts_with('get_players (repositories.py:') \
+        .contains(';_exec_single_context (base.py:').contains(';SQL SELECT players.url, ') \
+        .does_not_contain('do_execute', 'profiling.py')
+    for line in lines:
+        stack, value = line.rsplit(' ', 1)
+        assert_that(int(value)).is_positive()
+        assert_that(stack).does_not_contain('\n')
+
+    profiler.write_collapsed(tmp_path / 'profile.folded')
+    assert_that((tmp_path / 'profile.folded').read_text(encoding='utf-8').splitlines()) \
+        .is_equal_to(lines)
+
+
+def test_profile_ignores_other_threads():
+    """
+    Tests statements from other threads are not traced.
+    """
+    maker = create_maker()
+    repo = PlayerRepository(maker)
+    profiler = RepositoryProfiler()
+
+    with profiler.profile(maker):
+        thread = threading.Thread(target=repo.get_players)
+        thread.start()
+        thread.join()
+
+    assert_that(profiler.queries).is_empty()
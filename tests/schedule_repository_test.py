@@ -3,17 +3,22 @@ Tests for the Schedule Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import Schedule
 from football_data.repositories import ScheduleRepository
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
-    engine = create_engine('sqlite://')
-    Schedule.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    """
+    Creates a copy of the template database.
+    :return: sessionmaker
+    """
+    return TEMPLATE.clone()
 
 
 def test_schedule_exists():
@@ -254,3 +259,40 @@ def test_get_schedule_by_week():
 
     result = repo.get_schedules(week=4)
     assert_that(result).contains_only(schedule2, schedule3)
+
+
+def test_get_schedule_by_year():
+    """
+    Tests retrieving a Schedule with the year.
+    """
+    maker = create_maker()
+    schedule = Schedule(id=1, team_id=1, opponent_id=2, year_value=2020, week_number=3,
+                        game_id=665566,
+                        url='www.google.com', type_id=1, is_home=True)
+
+    repo = ScheduleRepository(maker)
+    repo.save(schedule)
+
+    assert_that(repo.get_schedule(id=1, year=2020)).is_equal_to(schedule)
+    assert_that(repo.get_schedule(team_id=1, game_id=665566, year=2021)).is_none()
+
+
+def test_get_schedule_changes():
+    """
+    Tests the change feed returns the schedules saved after the watermark.
+    """
+    maker = create_maker()
+    schedule = Schedule(id=1, team_id=1, opponent_id=2, year_value=2020, week_number=3,
+                        game_id=665566,
+                        url='www.google.com', type_id=1, is_home=True)
+    schedule2 = Schedule(id=2, team_id=2, opponent_id=1, year_value=2020, week_number=3,
+                         game_id=665566,
+                         url='www.google.com', type_id=1, is_home=False)
+
+    repo = ScheduleRepository(maker)
+    repo.save(schedule)
+    watermark = list(repo.get_schedule_changes(lag=0))[-1].watermark
+    repo.save(schedule2)
+
+    changes = list(repo.get_schedule_changes(since=watermark, lag=0))
+    assert_that(changes).extracting('items').is_equal_to([[schedule2]])
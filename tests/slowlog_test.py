@@ -0,0 +1,104 @@
+"""
+Tests for the Slow Query Log.
+"""
+
+import logging
+
+from assertpy import assert_that
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from football_data.instrumentation import RepositoryMetrics
+from football_data.models import Schedule
+from football_data.repositories import ScheduleRepository
+from football_data.slowlog import SlowQueryLog
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    engine = create_engine('sqlite://')
+    Schedule.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def test_slow_query_captured():
+    """
+    Tests a statement over the threshold is captured with its plan.
+    """
+    maker = create_maker()
+    repo = ScheduleRepository(maker)
+    log = SlowQueryLog(threshold=0, sink=lambda _: None)
+    log.attach(maker)
+
+    repo.get_schedules(team_id=1, year=2020)
+
+    assert_that(log.records).is_length(1)
+    record = log.records[0]
+    assert_that(record.statement).starts_with('SELECT')
+    assert_that(record.parameters).is_equal_to((1, 2020))
+    assert_that(record.duration).is_greater_than_or_equal_to(0)
+    assert_that(record.plan).is_not_empty()
+    assert_that(record.plan[0]).contains('schedule')
+
+
+def test_slow_query_records_repository_call():
+    """
+    Tests the repository method is recorded for instrumented repositories.
+    """
+    maker = create_maker()
+    repo = ScheduleRepository(maker)
+    log = SlowQueryLog(threshold=0, explain=False, sink=lambda _: None)
+    log.attach(maker)
+
+    with RepositoryMetrics().instrumented(repo):
+        repo.get_schedule(id=1)
+
+    assert_that(log.records).extracting('call', 'plan').contains_only(
+        ('ScheduleRepository.get_schedule', []))
+
+
+def test_fast_query_not_captured():
+    """
+    Tests statements under the threshold are not captured.
+    """
+    maker = create_maker()
+    log = SlowQueryLog(threshold=10)
+    log.attach(maker)
+
+    ScheduleRepository(maker).get_schedules()
+
+    assert_that(log.records).is_empty()
+
+
+def test_slow_query_sampling():
+    """
+    Tests slow statements outside of the sample are not captured.
+    """
+    maker = create_maker()
+    log = SlowQueryLog(threshold=0, sample_rate=0)
+    log.attach(maker)
+
+    ScheduleRepository(maker).get_schedules()
+
+    assert_that(log.records).is_empty()
+
+
+def test_slow_query_logged(caplog):
+    """
+    Tests slow queries are written to the log with the structured record.
+    """
+    maker = create_maker()
+    log = SlowQueryLog(threshold=0)
+    log.attach(maker)
+
+    with caplog.at_level(logging.WARNING, logger='football_data.slowlog'):
+        ScheduleRepository(maker).get_schedules(week=3)
+    log.detach()
+    ScheduleRepository(maker).get_schedules(week=3)
+
+    assert_that(caplog.records).is_length(1)
+    assert_that(caplog.records[0].slow_query).contains_key('statement', 'parameters',
+                                                           'duration', 'plan')
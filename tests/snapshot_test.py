@@ -0,0 +1,79 @@
+"""
+Tests for the Reference Snapshot.
+"""
+
+from assertpy import assert_that
+
+from football_data.generator import LeagueDataGenerator
+from football_data.models import Player, Position, Team
+from football_data.repositories import TeamRepository
+from football_data.snapshot import ReferenceSnapshot, database_version
+from football_data.testing import TemplateDatabase
+
+TEMPLATE = TemplateDatabase(
+    seed=lambda maker: LeagueDataGenerator(seed=1, teams=2, weeks=1).load(maker))
+
+
+def test_write_and_load(tmp_path):
+    """
+    Tests the snapshot holds the reference tables of the database.
+    """
+    maker = TEMPLATE.clone()
+    snapshot = ReferenceSnapshot(tmp_path / 'reference.snapshot')
+
+    version = snapshot.write(maker)
+    data = snapshot.load(maker, refresh=False)
+
+    assert_that(version).is_equal_to(database_version(maker))
+    assert_that(version['team'][:2]).is_equal_to((2, 2))
+    assert_that(data).is_not_none()
+    assert_that(data.all(Team)).is_length(2)
+    assert_that(data.all(Player)).is_length(2 * 53)
+    assert_that(data.index(Position, 'code')).contains_key('QB', 'K')
+    assert_that(data.index(Team)[1]).is_equal_to(TeamRepository(maker).get_team(id=1))
+
+
+def test_load_out_of_date(tmp_path):
+    """
+    Tests a snapshot is not trusted after the reference tables change.
+    """
+    maker = TEMPLATE.clone()
+    snapshot = ReferenceSnapshot(tmp_path / 'reference.snapshot')
+    snapshot.write(maker)
+    TeamRepository(maker).save(Team(url='www.new.com', code='NEW', name='New'))
+
+    assert_that(snapshot.load(maker, refresh=False)).is_none()
+    assert_that(snapshot.load(maker).index(Team, 'code')).contains_key('NEW')
+    assert_that(snapshot.load(maker, refresh=False)).is_not_none()
+
+
+def test_load_after_update(tmp_path):
+    """
+    Tests a snapshot is not trusted after a reference row is updated in place.
+    """
+    maker = TEMPLATE.clone()
+    snapshot = ReferenceSnapshot(tmp_path / 'reference.snapshot')
+    snapshot.write(maker)
+    repo = TeamRepository(maker)
+    team = repo.get_team(id=1)
+    team.name = 'Renamed'
+    repo.save(team)
+
+    assert_that(snapshot.load(maker, refresh=False)).is_none()
+    assert_that(snapshot.load(maker).index(Team)[1]).has_name('Renamed')
+
+
+def test_load_missing_or_invalid(tmp_path):
+    """
+    Tests a missing or unreadable snapshot file is written again.
+    """
+    maker = TEMPLATE.clone()
+    path = tmp_path / 'reference.snapshot'
+    snapshot = ReferenceSnapshot(path)
+
+    assert_that(snapshot.read()).is_none()
+    path.write_bytes(b'not a snapshot')
+    assert_that(snapshot.read()).is_none()
+    assert_that(snapshot.load(maker).all(Team)).is_length(2)
+    assert_that([item.name for item in tmp_path.iterdir()]).contains_only(
+        'reference.snapshot', 'reference.snapshot.lock')
@@ -3,20 +3,21 @@ Tests for the Statistic Category Code Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import StatisticCategory
 from football_data.repositories import StatisticCategoryRepository
+from football_data.testing import TemplateDatabase
 
 
-def create_maker():
+TEMPLATE = TemplateDatabase()
+
+
+def create_maker() -> sessionmaker:
     """
     Creates the In Memory Database.
     """
-    engine = create_engine('sqlite://')
-    StatisticCategory.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_get_statistic_category_code():
@@ -3,11 +3,14 @@ Statistic Code Repository Tests.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import (StatisticCode)
 from football_data.repositories import StatisticCodeRepository
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
@@ -15,10 +18,7 @@ def create_maker() -> sessionmaker:
     Creates the session maker.
     :return: sessionmaker
     """
-
-    engine = create_engine('sqlite://')
-    StatisticCode.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_statistic_code_exists():
@@ -3,11 +3,16 @@ Tests for the Statistics Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
-from football_data.models import Statistic
-from football_data.repositories import StatisticRepository
+from football_data.models import Statistic, Schedule
+from football_data.repositories import BaseRepository, StatisticRepository, StatisticValue
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
@@ -15,9 +20,7 @@ def create_maker() -> sessionmaker:
     Creates the Sqlite Database Engine
     :return: sessionmaker
     """
-    engine = create_engine('sqlite://')
-    Statistic.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_player_statistic_exists():
@@ -60,6 +63,34 @@ def test_statistic_does_not_exist():
     assert_that(result).is_false()
 
 
+def test_statistic_exists_compares_statistic_code():
+    """
+    Tests a statistic with a different statistic code does not exist.
+    """
+    maker = create_maker()
+    stat = Statistic(id=1, statistic_code_id=1, team_id=1, schedule_id=1, value=20, category_id=1)
+    stat2 = Statistic(id=2, statistic_code_id=2, team_id=1, schedule_id=1, value=20, category_id=1)
+    repo = StatisticRepository(maker)
+    repo.save(stat)
+
+    assert_that(repo.statistic_exists(stat2)).is_false()
+
+
+def test_statistic_exists_code_differs_from_category():
+    """
+    Tests a stored statistic is found when its statistic code differs from its category. Before
+    the fix the check compared the statistic code with the category id, so the duplicate was
+    reported as absent.
+    """
+    maker = create_maker()
+    stat = Statistic(id=1, statistic_code_id=7, team_id=1, schedule_id=1, value=20, category_id=3)
+    repo = StatisticRepository(maker)
+    repo.save(stat)
+
+    duplicate = Statistic(statistic_code_id=7, team_id=1, schedule_id=1, value=20, category_id=3)
+    assert_that(repo.statistic_exists(duplicate)).is_true()
+
+
 def test_get_statistic():
     """
     Tests retrieving a Statistic by the ID Value.
@@ -195,3 +226,278 @@ def test_get_statistics_by_team_schedule():
 
     result = repo.get_statistics(team_id=2, schdule_id=1)
     assert_that(result).contains_only(stat2)
+
+
+def test_get_statistics_by_schedule():
+    """
+    Tests retrieving the statistics for a list of schedules.
+    """
+    maker = create_maker()
+    stat = Statistic(id=1, statistic_code_id=1, player_id=1, schedule_id=1, value=20, category_id=1)
+    stat2 = Statistic(id=2, statistic_code_id=1, team_id=2, schedule_id=1, value=20, category_id=1)
+    stat3 = Statistic(id=3, statistic_code_id=1, team_id=2, schedule_id=2, value=20, category_id=1)
+    stat4 = Statistic(id=4, statistic_code_id=1, team_id=2, schedule_id=3, value=20, category_id=1)
+    schedule = Schedule(id=2, team_id=2, opponent_id=1, year_value=2020, week_number=3,
+                        game_id=665566, url='www.google.com', type_id=1, is_home=False)
+    repo = StatisticRepository(maker)
+    repo.save_all([stat, stat2, stat3, stat4])
+
+    result = repo.get_statistics_by_schedule([1, schedule, 5], chunk_size=2)
+    assert_that(result).is_equal_to({1: [stat, stat2], 2: [stat3], 5: []})
+
+
+def test_save_sets_year_from_schedule():
+    """
+    Tests saved statistics take the year of their schedule.
+    """
+    maker = create_maker()
+    schedule = Schedule(id=1, team_id=2, opponent_id=1, year_value=2021, week_number=3,
+                        game_id=665566, url='www.google.com', type_id=1, is_home=False)
+    with maker() as session:
+        session.add(schedule)
+        session.commit()
+    stat = Statistic(id=1, statistic_code_id=1, team_id=2, schedule_id=1, value=20, category_id=1)
+    stat2 = Statistic(id=2, statistic_code_id=1, team_id=2, schedule_id=1, value=20, category_id=2,
+                      year_value=2020)
+    repo = StatisticRepository(maker)
+    repo.save_all([stat, stat2])
+
+    assert_that(repo.get_statistic(1)).has_year_value(2021)
+    assert_that(repo.get_statistic(2)).has_year_value(2020)
+    assert_that(repo.get_statistic(1, year=2020)).is_none()
+    assert_that(repo.get_statistics(schedule_id=1, year=2021)).contains_only(stat)
+
+
+def test_get_statistics_by_schedule_year():
+    """
+    Tests the years of the schedules are included when only schedules are given, still matching
+    statistics stored without a year.
+    """
+    maker = create_maker()
+    stat = Statistic(id=1, statistic_code_id=1, team_id=2, schedule_id=2, value=20, category_id=1,
+                     year_value=2020)
+    stat2 = Statistic(id=2, statistic_code_id=1, team_id=2, schedule_id=2, value=20,
+                      category_id=1, year_value=2019)
+    stat3 = Statistic(id=3, statistic_code_id=2, team_id=2, schedule_id=2, value=20,
+                      category_id=1)
+    schedule = Schedule(id=2, team_id=2, opponent_id=1, year_value=2020, week_number=3,
+                        game_id=665566, url='www.google.com', type_id=1, is_home=False)
+    repo = StatisticRepository(maker)
+    repo.save_all([stat, stat2, stat3])
+
+    assert_that(stat3.year_value).is_none()
+    assert_that(repo.get_statistics_by_schedule([schedule])).is_equal_to({2: [stat, stat3]})
+    assert_that(repo.get_statistics_by_schedule([2])).is_equal_to({2: [stat, stat2, stat3]})
+    assert_that(repo.get_statistic(3, year=2020)).is_equal_to(stat3)
+
+
+def test_statistic_exists_without_stored_year():
+    """
+    Tests a statistic with a year matches a stored statistic without one.
+    """
+    maker = create_maker()
+    repo = StatisticRepository(maker)
+    repo.save(Statistic(statistic_code_id=1, team_id=2, schedule_id=1, value=20, category_id=1))
+
+    assert_that(repo.statistic_exists(Statistic(statistic_code_id=1, team_id=2, schedule_id=1,
+                                                value=20, category_id=1,
+                                                year_value=2020))).is_true()
+    assert_that(repo.statistic_exists(Statistic(statistic_code_id=2, team_id=2, schedule_id=1,
+                                                value=20, category_id=1,
+                                                year_value=2020))).is_false()
+
+
+def test_any_session_sets_year_from_schedule():
+    """
+    Tests statistics saved outside the statistic repository take the year of their schedule.
+    """
+    maker = create_maker()
+    with maker() as session:
+        session.add_all([
+            Schedule(id=1, team_id=2, opponent_id=1, year_value=2021, week_number=3,
+                     game_id=665566, url='www.google.com', type_id=1, is_home=False),
+            Statistic(id=1, statistic_code_id=1, team_id=2, schedule_id=1, value=20,
+                      category_id=1)])
+        session.commit()
+    BaseRepository(maker).save(Statistic(id=2, statistic_code_id=1, team_id=2, schedule_id=1,
+                                         value=20, category_id=2))
+
+    repo = StatisticRepository(maker)
+    assert_that([repo.get_statistic(id_value).year_value for id_value in (1, 2)]).is_equal_to(
+        [2021, 2021])
+
+
+def test_get_statistic_changes():
+    """
+    Tests the change feed streams batches and resumes after the watermark with updated rows.
+    """
+    maker = create_maker()
+    stats = [Statistic(id=index, statistic_code_id=1, team_id=1, schedule_id=1, value=20,
+                       category_id=index) for index in range(1, 4)]
+    repo = StatisticRepository(maker)
+    repo.save_all(stats)
+
+    batches = list(repo.get_statistic_changes(batch_size=2, lag=0))
+    assert_that(batches).extracting('items').is_equal_to([stats[:2], stats[2:]])
+    assert_that(batches[-1].watermark).has_id(3).has_updated_at(stats[2].updated_at)
+
+    stats[0].value = 30
+    repo.save(stats[0])
+    changes = list(repo.get_statistic_changes(since=batches[-1].watermark, lag=0))
+    assert_that(changes).is_length(1)
+    assert_that(changes[0].items).extracting('id', 'value').contains_only((1, 30.0))
+    assert_that(list(repo.get_statistic_changes(since=changes[0].watermark, lag=0))).is_empty()
+    assert_that(list(repo.get_statistic_changes())).is_empty()
+
+
+def test_sync_statistics():
+    """
+    Tests only the differences with the stored statistics are written.
+    """
+    maker = create_maker()
+    schedule = Schedule(id=1, team_id=2, opponent_id=1, year_value=2021, week_number=3,
+                        game_id=665566, url='www.google.com', type_id=1, is_home=False)
+    with maker() as session:
+        session.add(schedule)
+        session.commit()
+    repo = StatisticRepository(maker)
+    repo.save_all([
+        Statistic(id=1, statistic_code_id=1, player_id=1, schedule_id=1, value=20, category_id=1),
+        Statistic(id=2, statistic_code_id=2, player_id=1, schedule_id=1, value=5, category_id=1),
+        Statistic(id=3, statistic_code_id=1, team_id=2, schedule_id=1, value=300, category_id=2),
+        Statistic(id=4, statistic_code_id=1, team_id=2, schedule_id=2, value=10, category_id=2)])
+
+    delta = repo.sync_statistics(1, [
+        Statistic(statistic_code_id=1, player_id=1, schedule_id=1, value=20, category_id=1),
+        Statistic(statistic_code_id=2, player_id=1, schedule_id=1, value=7, category_id=1),
+        Statistic(statistic_code_id=3, player_id=1, schedule_id=1, value=1, category_id=1)])
+
+    assert_that(delta).has_inserted(1).has_updated(1).has_deleted(1).has_unchanged(1)
+    stats = repo.get_statistics(schedule_id=1)
+    assert_that(stats).extracting('statistic_code_id', 'value', 'year_value').contains_only(
+        (1, 20.0, 2021), (2, 7.0, 2021), (3, 1.0, 2021))
+    assert_that(repo.get_statistics(schedule_id=2)).is_length(1)
+    assert_that(repo.sync_statistics(1, stats)).has_unchanged(3).has_inserted(0)
+
+
+def save_without_year(maker: sessionmaker, year: int, *stats: dict) -> None:
+    """
+    Saves a schedule and statistics stored before they had a year.
+    :param maker: Session Maker
+    :param year: Year of the Schedule
+    :param stats: Statistic rows without a year
+    """
+    with maker() as session:
+        session.add(Schedule(id=1, team_id=2, opponent_id=1, year_value=year, week_number=3,
+                             game_id=665566, url='www.google.com', type_id=1, is_home=False))
+        session.execute(insert(Statistic.__table__), [
+            {'schedule_id': 1, 'category_id': 1, 'team_id': 2, 'year_value': None, **stat}
+            for stat in stats])
+        session.commit()
+
+
+def test_sync_statistics_without_stored_year():
+    """
+    Tests statistics stored without a year are matched, updated and deleted by a sync.
+    """
+    maker = create_maker()
+    save_without_year(maker, 2020, {'statistic_code_id': 1, 'value': 1},
+                      {'statistic_code_id': 2, 'value': 2})
+    repo = StatisticRepository(maker)
+
+    delta = repo.sync_statistics(1, [
+        Statistic(statistic_code_id=1, schedule_id=1, value=3, category_id=1, team_id=2)])
+
+    assert_that(delta).has_inserted(0).has_updated(1).has_deleted(1)
+    assert_that(repo.get_statistics(schedule_id=1)).extracting(
+        'statistic_code_id', 'value').contains_only((1, 3.0))
+
+
+def test_replace_statistics():
+    """
+    Tests all statistics of a schedule are replaced and other schedules are kept.
+    """
+    maker = create_maker()
+    repo = StatisticRepository(maker)
+    repo.save_all([
+        Statistic(id=1, statistic_code_id=1, player_id=1, schedule_id=1, value=20, category_id=1),
+        Statistic(id=2, statistic_code_id=2, player_id=1, schedule_id=1, value=5, category_id=1),
+        Statistic(id=3, statistic_code_id=1, team_id=2, schedule_id=2, value=10, category_id=2)])
+
+    delta = repo.replace_statistics(1, [
+        Statistic(statistic_code_id=3, player_id=1, schedule_id=1, value=1, category_id=1)])
+
+    assert_that(delta).has_inserted(1).has_deleted(2)
+    assert_that(repo.get_statistics(schedule_id=1)).extracting(
+        'statistic_code_id', 'value').contains_only((3, 1.0))
+    assert_that(repo.get_statistics(schedule_id=2)).is_length(1)
+
+
+def test_replace_statistics_without_stored_year():
+    """
+    Tests statistics stored without a year are replaced as well.
+    """
+    maker = create_maker()
+    save_without_year(maker, 2020, {'statistic_code_id': 1, 'value': 1})
+    repo = StatisticRepository(maker)
+
+    delta = repo.replace_statistics(1, [
+        Statistic(statistic_code_id=1, schedule_id=1, value=2, category_id=1, team_id=2)])
+
+    assert_that(delta).has_inserted(1).has_deleted(1)
+    assert_that(repo.get_statistics(schedule_id=1)).extracting(
+        'value', 'year_value').contains_only((2.0, 2020))
+
+
+def test_replace_statistics_rolls_back():
+    """
+    Tests a failed replace leaves the stored statistics in place.
+    """
+    maker = create_maker()
+    repo = StatisticRepository(maker)
+    repo.save(Statistic(id=1, statistic_code_id=1, player_id=1, schedule_id=1, value=20,
+                        category_id=1))
+
+    assert_that(repo.replace_statistics).raises(IntegrityError).when_called_with(1, [
+        Statistic(statistic_code_id=None, player_id=1, schedule_id=1, value=1, category_id=1)])
+    assert_that(repo.get_statistics(schedule_id=1)).extracting('value').contains_only(20.0)
+
+
+def test_update_statistic_values():
+    """
+    Tests values are updated by natural key and unmatched keys are reported.
+    """
+    maker = create_maker()
+    repo = StatisticRepository(maker)
+    repo.save_all([
+        Statistic(id=1, statistic_code_id=1, player_id=1, schedule_id=1, value=20, category_id=1),
+        Statistic(id=2, statistic_code_id=1, team_id=2, schedule_id=1, value=5, category_id=2),
+        Statistic(id=3, statistic_code_id=1, team_id=2, schedule_id=2, value=10, category_id=2)])
+
+    result = repo.update_statistic_values([
+        (1, 1, 1, 1, None, 25),
+        StatisticValue(schedule_id=2, statistic_code_id=1, category_id=2, player_id=None,
+                       team_id=2, value=12),
+        (1, 1, 1, 9, None, 30)], chunk_size=1)
+
+    assert_that(result).has_matched(2)
+    assert_that(result.unmatched).is_equal_to([StatisticValue(1, 1, 1, 9, None, 30)])
+    assert_that([repo.get_statistic(id_value).value for id_value in (1, 2, 3)]).is_equal_to(
+        [25.0, 5.0, 12.0])
+
+
+def test_update_statistic_values_by_year():
+    """
+    Tests values are updated by natural key for statistics with and without a stored year.
+    """
+    maker = create_maker()
+    save_without_year(maker, 2021, {'statistic_code_id': 1, 'value': 20})
+    repo = StatisticRepository(maker)
+    repo.save(Statistic(statistic_code_id=2, team_id=2, schedule_id=1, value=20, category_id=1))
+
+    result = repo.update_statistic_values([(1, 1, 1, None, 2, 25), (1, 2, 1, None, 2, 30)])
+
+    assert_that(result).has_matched(2)
+    assert_that(repo.get_statistics(schedule_id=1)).extracting(
+        'statistic_code_id', 'value', 'year_value').contains_only((1, 25.0, None),
+                                                                  (2, 30.0, 2021))
@@ -3,11 +3,14 @@ Tests for the Team League Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import TeamLeague
 from football_data.repositories import TeamLeagueRepository
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
@@ -15,10 +18,7 @@ def create_maker() -> sessionmaker:
     Creates the Session Maker.
     :return: Session Maker
     """
-
-    engine = create_engine('sqlite://')
-    TeamLeague.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_team_league_exists():
@@ -3,11 +3,14 @@ Tests for the Team Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import Team
 from football_data.repositories import TeamRepository
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
@@ -15,9 +18,7 @@ def create_maker() -> sessionmaker:
     Creates a Session Maker.
     :return: Session Maker
     """
-    engine = create_engine('sqlite://')
-    Team.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_get_team():
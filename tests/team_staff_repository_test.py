@@ -2,11 +2,15 @@
 Team Staff Repository Tests.
 """
 from assertpy import assert_that
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 
-from football_data.models import TeamStaff
-from football_data.repositories import TeamStaffRepository
+from football_data.models import Player, Position, Team, TeamStaff
+from football_data.repositories import TeamStaffRepository, bound_engine
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
@@ -14,10 +18,7 @@ def create_maker() -> sessionmaker:
     Creates the Session Maker.
     :return: Session Maker
     """
-
-    engine = create_engine('sqlite://')
-    TeamStaff.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_team_staff_exists():
@@ -120,3 +121,74 @@ def test_get_team_staff_by_player():
 
     result = repo.get_team_staff_entries(player_id=1)
     assert_that(result).contains_only(staff)
+
+
+def test_get_team_staff_by_year():
+    """
+    Tests retrieving the Team Staff by Team and Year
+    """
+    maker = create_maker()
+    staff = TeamStaff(id=1, player_id=1, team_id=2, year_value=2020)
+    staff2 = TeamStaff(id=2, player_id=1, team_id=2, year_value=2021)
+    repo = TeamStaffRepository(maker)
+    repo.save_all([staff, staff2])
+
+    result = repo.get_team_staff_entries(team_id=2, year=2021)
+    assert_that(result).contains_only(staff2)
+
+
+def create_rosters() -> TeamStaffRepository:
+    """
+    Creates two teams with rosters in 2020 and one player moving team in 2021.
+    :return: Team Staff Repository
+    """
+    maker = create_maker()
+    repo = TeamStaffRepository(maker)
+    repo.save_all([
+        Team(id=1, url='www.team.com/1', code='AAA', name='Team One'),
+        Team(id=2, url='www.team.com/2', code='BBB', name='Team Two'),
+        Position(id=1, code='QB', description='Quarterback'),
+        Player(id=1, url='www.player.com/1', name='Player One', position_id=1),
+        Player(id=2, url='www.player.com/2', name='Player Two'),
+        Player(id=3, url='www.player.com/3', name='Player Three', position_id=1),
+        TeamStaff(player_id=2, team_id=1, year_value=2020),
+        TeamStaff(player_id=1, team_id=1, year_value=2020),
+        TeamStaff(player_id=3, team_id=2, year_value=2020),
+        TeamStaff(player_id=1, team_id=2, year_value=2021)])
+    return repo
+
+
+def test_get_roster():
+    """
+    Tests a roster is read with one query including the players, positions and team.
+    """
+    repo = create_rosters()
+    statements = []
+    event.listen(bound_engine(repo.maker), 'before_cursor_execute',
+                 lambda *args: statements.append(args[2]))
+
+    roster = repo.get_roster(1, 2020)
+
+    assert_that(statements).is_length(1)
+    assert_that([entry.player.name for entry in roster]).is_equal_to(['Player One',
+                                                                      'Player Two'])
+    assert_that(roster[0].position).has_code('QB')
+    assert_that(roster[1].position).is_none()
+    assert_that(roster).extracting('team').extracting('code').contains_only('AAA')
+    assert_that(roster).extracting('year_value').contains_only(2020)
+
+
+def test_get_rosters():
+    """
+    Tests all rosters of a season are grouped by team.
+    """
+    repo = create_rosters()
+
+    rosters = repo.get_rosters(2020)
+
+    assert_that(rosters).contains_only(1, 2)
+    assert_that([entry.player.id for entry in rosters[1]]).is_equal_to([1, 2])
+    assert_that([entry.player.id for entry in rosters[2]]).is_equal_to([3])
+    assert_that(repo.get_rosters(2021)[2]).extracting('team').extracting('name').contains_only(
+        'Team Two')
+    assert_that(repo.get_rosters(2022)).is_empty()
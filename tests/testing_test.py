@@ -0,0 +1,74 @@
+"""
+Tests for the Test Fixture Databases.
+"""
+
+from assertpy import assert_that
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.exc import IntegrityError
+
+from football_data.models import Base, Player, Position
+from football_data.repositories import PlayerRepository, PositionCodeRepository, bound_engine
+from football_data.testing import TemplateDatabase, rolled_back
+
+
+def seed(maker) -> None:
+    """
+    Loads the seed Position Codes.
+    :param maker: Session Maker
+    :return: None
+    """
+    PositionCodeRepository(maker).save_all([Position(id=1, code='QB', description='Quarterback'),
+                                            Position(id=2, code='RB', description='Running Back')])
+
+
+def test_clone_copies_template():
+    """
+    Tests each clone holds the schema and seed data and is independent of the others.
+    """
+    ddl = []
+    template = TemplateDatabase(seed=seed)
+    first = template.clone()
+    event.listen(bound_engine(first), 'before_cursor_execute', lambda *args: ddl.append(args[2]))
+    second = template.clone()
+
+    PlayerRepository(first).save(Player(url='www.player.com', name='Player', position_id=1))
+
+    assert_that(PositionCodeRepository(second).get_position_codes()).extracting('code') \
+        .contains_only('QB', 'RB')
+    assert_that(PlayerRepository(first).get_players(position_code='QB')).is_length(1)
+    assert_that(PlayerRepository(second).get_players()).is_empty()
+    assert_that(ddl).does_not_contain_duplicates()
+    assert_that([statement for statement in ddl if 'CREATE' in statement]).is_empty()
+
+
+def test_transaction_rolls_back():
+    """
+    Tests changes in a transaction fixture are rolled back, including after a failed commit.
+    """
+    template = TemplateDatabase(seed=seed)
+
+    with template.transaction() as maker:
+        repo = PositionCodeRepository(maker)
+        repo.save(Position(code='WR', description='Wide Receiver'))
+        assert_that(repo.save).raises(IntegrityError).when_called_with(
+            Position(id=1, code='QB', description='Quarterback'))
+        assert_that(repo.get_position_codes()).extracting('code').contains_only('QB', 'RB', 'WR')
+
+    with template.transaction() as maker:
+        assert_that(PositionCodeRepository(maker).get_position_codes()).extracting('code') \
+            .contains_only('QB', 'RB')
+
+
+def test_rolled_back_engine(tmp_path):
+    """
+    Tests the savepoint strategy leaves a shared database unchanged.
+    """
+    engine = create_engine(f'sqlite:///{tmp_path / "shared.db"}')
+    Base.metadata.create_all(bind=engine)
+
+    with rolled_back(engine) as maker:
+        PlayerRepository(maker).save(Player(url='www.player.com', name='Player'))
+        assert_that(PlayerRepository(maker).get_players()).is_length(1)
+
+    with engine.connect() as connection:
+        assert_that(connection.execute(select(Player.id)).all()).is_empty()
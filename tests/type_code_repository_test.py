@@ -3,20 +3,21 @@ Tests for the Type Code Repository.
 """
 
 from assertpy import assert_that
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from football_data.models import TypeCode
 from football_data.repositories import TypeCodeRepository
+from football_data.testing import TemplateDatabase
+
+
+TEMPLATE = TemplateDatabase()
 
 
 def create_maker() -> sessionmaker:
     """
     Creates a Session Maker.
     """
-    engine = create_engine('sqlite://')
-    TypeCode.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, expire_on_commit=False)
+    return TEMPLATE.clone()
 
 
 def test_type_code_exists():
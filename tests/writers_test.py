@@ -0,0 +1,181 @@
+"""
+Tests for the Bulk Writer.
+"""
+
+import sqlite3
+
+from assertpy import assert_that
+from sqlalchemy import create_engine, event, select, func
+from sqlalchemy.exc import OperationalError, IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from football_data.models import Schedule
+from football_data.repositories import bound_engine
+from football_data.writers import (BulkWriter, Checkpoint, FileCheckpointStore,
+                                   MemoryCheckpointStore, is_transient)
+
+
+def create_maker() -> sessionmaker:
+    """
+    Creates the Sqlite Database Engine
+    :return: sessionmaker
+    """
+    engine = create_engine('sqlite://')
+    Schedule.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def create_schedules(count: int) -> list[Schedule]:
+    """
+    Creates a list of schedule entries.
+    :param count: Number of entries
+    :return: List of Schedules
+    """
+    return [Schedule(team_id=1, opponent_id=2, year_value=2020, week_number=index,
+                     game_id=1000 + index, url='www.google.com', type_id=1, is_home=True)
+            for index in range(count)]
+
+
+def count_schedules(maker: sessionmaker) -> int:
+    """
+    Counts the schedule rows.
+    :param maker: Session Maker
+    :return: Count
+    """
+    with maker() as session:
+        return session.scalar(select(func.count()).select_from(Schedule))
+
+
+def fail_inserts(maker: sessionmaker, failures: int, message: str = 'database is locked'):
+    """
+    Raises a database error for the first number of insert statements.
+    :param maker: Session Maker
+    :param failures: Number of failures
+    :param message: Error Message
+    """
+    remaining = [failures]
+
+    @event.listens_for(maker.kw['bind'], 'before_cursor_execute')
+    def _fail(_conn, _cursor, statement, *_args):
+        if statement.startswith('INSERT') and remaining[0] > 0:
+            remaining[0] -= 1
+            raise OperationalError(statement, {}, sqlite3.OperationalError(message))
+
+
+def test_write_in_chunks():
+    """
+    Tests writing items in chunks records a checkpoint for each chunk.
+    """
+    maker = create_maker()
+    store = MemoryCheckpointStore()
+    writer = BulkWriter(maker, chunk_size=4, store=store)
+
+    result = writer.write('schedules', create_schedules(10))
+
+    assert_that(count_schedules(maker)).is_equal_to(10)
+    assert_that(result).is_equal_to(Checkpoint(committed=10, chunks=3, last_key=10))
+    assert_that(store.load('schedules')).is_equal_to(result)
+
+
+def test_write_expiring_session_maker():
+    """
+    Tests the checkpoint key is read while the items are attached to their session.
+    """
+    maker = create_maker()
+    expiring = sessionmaker(bind=bound_engine(maker))
+    writer = BulkWriter(expiring, chunk_size=4)
+
+    result = writer.write('schedules', create_schedules(6))
+
+    assert_that(count_schedules(maker)).is_equal_to(6)
+    assert_that(result).is_equal_to(Checkpoint(committed=6, chunks=2, last_key=6))
+
+
+def test_write_retries_transient_error():
+    """
+    Tests a transient error is retried with backoff.
+    """
+    maker = create_maker()
+    fail_inserts(maker, 2)
+    delays = []
+    writer = BulkWriter(maker, chunk_size=5, sleep=delays.append, backoff=0.5)
+
+    writer.write('schedules', create_schedules(5))
+
+    assert_that(count_schedules(maker)).is_equal_to(5)
+    assert_that(delays).is_length(2)
+    assert_that(delays[0]).is_between(0, 0.5)
+    assert_that(delays[1]).is_between(0, 1.0)
+
+
+def test_write_gives_up_after_max_retries():
+    """
+    Tests the error is raised once the retries are exhausted.
+    """
+    maker = create_maker()
+    fail_inserts(maker, 10)
+    writer = BulkWriter(maker, max_retries=2, sleep=lambda _: None)
+
+    assert_that(writer.write).raises(OperationalError).when_called_with(
+        'schedules', create_schedules(3))
+
+
+def test_write_does_not_retry_permanent_error():
+    """
+    Tests a non-transient error is raised without retry.
+    """
+    maker = create_maker()
+    delays = []
+    writer = BulkWriter(maker, sleep=delays.append)
+    items = create_schedules(2)
+    items[1].id = 1
+    items[0].id = 1
+
+    assert_that(writer.write).raises(IntegrityError).when_called_with('schedules', items)
+    assert_that(delays).is_empty()
+
+
+def test_write_resumes_from_checkpoint(tmp_path):
+    """
+    Tests an interrupted write resumes after the last committed chunk.
+    """
+    maker = create_maker()
+    store = FileCheckpointStore(tmp_path / 'checkpoints.json')
+    items = create_schedules(6)
+
+    writer = BulkWriter(maker, chunk_size=2, store=store)
+    writer.write('schedules', items[:2])
+    fail_inserts(maker, 1, 'no such table: schedule')
+    assert_that(writer.write).raises(OperationalError).when_called_with(
+        'schedules', items)
+    assert_that(store.load('schedules')).is_equal_to(
+        Checkpoint(committed=2, chunks=1, last_key=2))
+
+    result = BulkWriter(maker, chunk_size=2, store=store).write(
+        'schedules', create_schedules(6))
+
+    assert_that(count_schedules(maker)).is_equal_to(6)
+    assert_that(result).is_equal_to(Checkpoint(committed=6, chunks=3, last_key=6))
+
+
+def test_file_checkpoint_store_clear(tmp_path):
+    """
+    Tests clearing a stored checkpoint.
+    """
+    store = FileCheckpointStore(tmp_path / 'checkpoints.json')
+    store.store('schedules', Checkpoint(committed=1, chunks=1, last_key=1))
+    store.clear('schedules')
+
+    assert_that(store.load('schedules')).is_none()
+
+
+def test_is_transient():
+    """
+    Tests classification of transient errors.
+    """
+    locked = OperationalError('INSERT', {}, sqlite3.OperationalError('database is locked'))
+    missing = OperationalError('INSERT', {}, sqlite3.OperationalError('no such table: x'))
+
+    assert_that(is_transient(locked)).is_true()
+    assert_that(is_transient(missing)).is_false()
+    assert_that(is_transient(ValueError('x'))).is_false()